@@ -1,10 +1,8 @@
 from rest_framework.authentication import BaseAuthentication
 from rest_framework import exceptions
-from django.contrib.auth import get_user_model
+from account.models import ClaimsUser
 from account.utils.jwt_helper import decode_token
 
-User = get_user_model()
-
 class cookieJWTAuthentication(BaseAuthentication):
     """
         Custom DRF authentication class for cookie-based JWT.
@@ -16,6 +14,11 @@ class cookieJWTAuthentication(BaseAuthentication):
     """
         We are just checking access token here. if access token expired or invalid,
         will recive 403 error from DRF. and frontend will have to call refresh endpoint to get new access token.
+
+        The user is not fetched from the database: request.user is a ClaimsUser built from the token's claims
+        (user_id, email, role), the rest of the row is loaded lazily the first time a view reads it.
+        A deleted user or a role change is therefore seen when the access token is next refreshed,
+        at most JWT_ACCESS_TOKEN_LIFETIME later.
     """
 
     def authenticate(self, request):
@@ -30,16 +33,12 @@ class cookieJWTAuthentication(BaseAuthentication):
             # Decode the JWT Payload
             payload = decode_token(token)
 
-            # Fetch the user from the database
-            user = User.objects.get(id = payload['user_id'])
+            # Build the user from the verified claims, no database round trip
+            user = ClaimsUser.from_claims(payload)
 
             # Return a tuple of (user, token) to set request.user and request.auth by DRF
             return (user, token)
         
-        except User.DoesNotExist:
-            # If user not found, treat as unanonymous
-            return None
-        
         except Exception as e:
             # For any other errors (invalid token, expired, etc), treat as unanonymous
             raise exceptions.AuthenticationFailed({"jwt_payload_error": str(e)})
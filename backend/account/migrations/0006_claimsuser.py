@@ -0,0 +1,24 @@
+# Generated by Django 5.2.3 on 2026-10-18 14:58
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('account', '0005_passwordresettoken_delete_emailverificationtoken'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClaimsUser',
+            fields=[
+            ],
+            options={
+                'proxy': True,
+                'indexes': [],
+                'constraints': [],
+            },
+            bases=('account.customuser',),
+        ),
+    ]
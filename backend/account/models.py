@@ -56,6 +56,50 @@ class CustomUser(AbstractBaseUser, PermissionsMixin) :
 
 
 
+"""
+    request.user of requests authenticated with an access token (see account/authentication.py).
+
+    Built from the verified claims alone (user_id, email, role), without a query:
+    the other columns are deferred, so permission checks (is_authenticated, role) and ORM use as a foreign key
+    (filter(user=request.user), create(user=request.user)) cost nothing.
+    The first access to any other column loads the whole user at once, from the short lived user cache
+    (account/utils/userCache.py) or the database, instead of one query per deferred column.
+
+    A proxy, so it is a CustomUser everywhere (isinstance checks, foreign key assignment) with the same table.
+"""
+
+class ClaimsUser(CustomUser):
+
+    # token claim -> column
+    CLAIMS = {"user_id": "id", "email": "email", "role": "role"}
+
+    class Meta:
+        proxy = True
+
+    @classmethod
+    def from_claims(cls, payload):
+        # user_id is required, email / role missing from the token are simply loaded lazily
+        claims = {"id": payload["user_id"]}
+        claims.update({column: payload[claim] for claim, column in cls.CLAIMS.items() if claim in payload})
+        return cls.from_db(None, list(claims), list(claims.values()))
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        deferred = self.get_deferred_fields()
+
+        if fields is None or not deferred.issuperset(fields):
+            return super().refresh_from_db(using=using, fields=fields, **kwargs)
+
+        from account.utils.userCache import get_cached_user
+
+        user = get_cached_user(self.pk)
+        if user is None:
+            raise CustomUser.DoesNotExist(f"user {self.pk} no longer exists")
+
+        for field in deferred:
+            setattr(self, field, getattr(user, field))
+
+
+
 class PasswordResetToken(models.Model) : 
     user = models.ForeignKey(settings.AUTH_USER_MODEL , on_delete=models.CASCADE)
     token = models.UUIDField(unique=True, editable=False, default=uuid.uuid4)
@@ -0,0 +1,20 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.contrib.auth import get_user_model
+from account.models import ClaimsUser
+from account.utils.userCache import invalidate_user
+
+User = get_user_model()
+
+
+"""
+    Drops the cached copy of a user (account/utils/userCache.py) as soon as the row changes.
+    Connected in AccountConfig.ready, for ClaimsUser too since signals of a proxy are sent with the proxy as sender.
+"""
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+@receiver(post_save, sender=ClaimsUser)
+@receiver(post_delete, sender=ClaimsUser)
+def user_changed(sender, instance, **kwargs):
+    invalidate_user(instance.pk)
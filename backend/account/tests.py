@@ -1,3 +1,74 @@
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase
+from account.authentication import cookieJWTAuthentication
+from account.models import ClaimsUser, CustomUser
+from account.utils.jwt_helper import generate_access_token
+from core.utils.roleRequired import RoleRequired
 
-# Create your tests here.
+
+class ClaimsUserTest(TestCase):
+
+    """
+        request.user comes from the access token claims, the user row is only read when a view needs more than that.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create_user(email="claims@example.com", username="claims", first_name="Ada", role="admin", is_active=True)
+
+    def setUp(self):
+        cache.clear()
+
+    def authenticate(self, user=None):
+        request = RequestFactory().get('/')
+        request.COOKIES['access'] = generate_access_token(user or self.user)
+        return cookieJWTAuthentication().authenticate(request)[0]
+
+    def test_authentication_without_queries(self):
+        with self.assertNumQueries(0):
+            user = self.authenticate()
+            request = RequestFactory().get('/')
+            request.user = user
+
+            self.assertIsInstance(user, ClaimsUser)
+            self.assertTrue(user.is_authenticated)
+            self.assertEqual((user.pk, user.email, user.role), (self.user.pk, "claims@example.com", "admin"))
+            self.assertTrue(RoleRequired(['admin'])().has_permission(request, None))
+
+    def test_built_from_claims(self):
+        token_user = self.authenticate()
+        CustomUser.objects.filter(pk=self.user.pk).update(email="changed@example.com")
+
+        # what the token says, the row is not read for claimed columns
+        with self.assertNumQueries(0):
+            self.assertEqual(token_user.email, "claims@example.com")
+        self.assertEqual(token_user.get_deferred_fields(), {f.attname for f in CustomUser._meta.concrete_fields} - {"id", "email", "role"})
+
+        # a token without the role claim loads it lazily
+        user = ClaimsUser.from_claims({"user_id": self.user.pk, "email": "claims@example.com"})
+        with self.assertNumQueries(1):
+            self.assertEqual(user.role, "admin")
+
+    def test_lazy_load_is_cached(self):
+        user = self.authenticate()
+
+        # every other column comes with the first one read
+        with self.assertNumQueries(1):
+            self.assertEqual((user.username, user.first_name, user.is_active), ("claims", "Ada", True))
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.authenticate().username, "claims")
+
+        # saving drops the cached copy
+        self.user.first_name = "Grace"
+        self.user.save()
+        with self.assertNumQueries(1):
+            self.assertEqual(self.authenticate().first_name, "Grace")
+
+    def test_deleted_user(self):
+        gone = CustomUser.objects.create_user(email="gone@example.com", username="gone", is_active=True)
+        user = self.authenticate(gone)
+        gone.delete()
+
+        with self.assertRaises(CustomUser.DoesNotExist):
+            user.username
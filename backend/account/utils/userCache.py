@@ -0,0 +1,35 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.contrib.auth import get_user_model
+
+User = get_user_model()
+
+
+"""
+    Short lived cache of full user rows, in front of the lazy load of ClaimsUser (account/models.py).
+    Entries are dropped when the user is saved or deleted (account/signals.py)
+    and expire after AUTH_USER_CACHE_TTL seconds whatever happens.
+"""
+
+def _key(user_id):
+    return f"account:user:{user_id}"
+
+
+"""
+    In get_cached_user function, we return the user with the given id, from the cache when it is there,
+    otherwise from the database (and cache it). Returns None if the user does not exist.
+"""
+
+def get_cached_user(user_id):
+    user = cache.get(_key(user_id))
+
+    if user is None:
+        user = User.objects.filter(id=user_id).first()
+        if user is not None:
+            cache.set(_key(user_id), user, settings.AUTH_USER_CACHE_TTL)
+
+    return user
+
+
+def invalidate_user(user_id):
+    cache.delete(_key(user_id))
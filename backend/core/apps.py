@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        from django.conf import settings
+        from core import signals  # noqa: F401
+        from core.utils.referenceCache import require_shared_cache
+
+        require_shared_cache(settings.WEB_CONCURRENCY)
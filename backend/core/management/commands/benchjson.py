@@ -0,0 +1,161 @@
+import io
+import random
+import string
+import timeit
+import tracemalloc
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from core.models import Problem
+from core.serializers.problem import GetProblemSerializer
+from core.utils.fastJson import ORJSONParser, ORJSONRenderer, orjson
+
+
+def text(rng, size):
+    words = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 9))) for _ in range(200)]
+    out, length = [], 0
+    while length < size:
+        word = rng.choice(words)
+        out.append(word)
+        length += len(word) + 1
+    return " ".join(out)[:size]
+
+
+"""
+    Payloads shaped like the largest ones the API handles.
+"""
+
+def problem_detail(rng):
+    return {
+        "message": "problem fetched successfully",
+        "success": True,
+        "data": {
+            "id": 42,
+            "title": "Longest Increasing Path In A Matrix",
+            "description": text(rng, 6000),
+            "difficulty": "Hard",
+            "examples": [{"input": text(rng, 200), "output": text(rng, 50), "explanation": text(rng, 300)} for _ in range(3)],
+            "constraints": text(rng, 500),
+            "hints": [text(rng, 150) for _ in range(4)],
+            "editorial": text(rng, 8000),
+            "code_snippets": [{"language": lang, "code": text(rng, 400)} for lang in ("python", "java", "cpp", "javascript")],
+            "created_at": "2026-10-18T14:51:02.123456Z",
+            "updated_at": "2026-10-18T14:51:02.123456Z",
+            "slug": "longest-increasing-path-in-a-matrix",
+            "fail_fast": False,
+            "tags": ["Graph", "Dynamic Programming", "Memoization"],
+            "user": "admin@example.com",
+        },
+    }
+
+
+def bulk_create(rng, problems=20, testcases=50):
+    return [
+        {
+            "title": f"Problem {i}",
+            "description": text(rng, 3000),
+            "difficulty": "Medium",
+            "tags": ["Array", "Hash Table"],
+            "examples": [{"input": "1 2 3", "output": "6"}],
+            "testcases": [{"input": text(rng, 2000), "expected": text(rng, 200)} for _ in range(testcases)],
+            "reference_solutions": {"python": text(rng, 600)},
+        }
+        for i in range(problems)
+    ]
+
+
+def submission_testcases(rng, testcases=50, stdout=16_000):
+    return {
+        "message": "submission fetched successfully",
+        "success": True,
+        "failedTestCases": [
+            {
+                "id": i,
+                "status": "Wrong Answer",
+                "input_data": text(rng, 2000),
+                "expected_output": text(rng, stdout),
+                "stdout": text(rng, stdout),
+                "actual_output": None,
+                "stderr": None,
+                "compile_output": None,
+                "time": 0.012,
+                "memory": 9876,
+            }
+            for i in range(testcases)
+        ],
+    }
+
+
+class Command(BaseCommand):
+
+    """
+        Compares the stock DRF JSON renderer / parser with the orjson ones (core/utils/fastJson.py)
+        on problem detail, bulk problem creation and submission testcase payloads:
+        time per call (best of --repeat runs of --number calls) and peak memory allocated by one call (tracemalloc).
+
+            python manage.py benchjson --number 200
+            python manage.py benchjson --slug two-sum   # also a problem of the database, as ProblemView.get renders it
+    """
+
+    help = "Benchmark the stock and orjson JSON renderer / parser on problem payloads"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--number', type=int, default=100, help="calls per timing run")
+        parser.add_argument('--repeat', type=int, default=5, help="timing runs, the best one is reported")
+        parser.add_argument('--slug', help="also benchmark this problem from the database")
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            raise CommandError("orjson is not installed, both classes would run the stock implementation")
+
+        rng = random.Random(options['seed'])
+        payloads = {
+            "problem detail": problem_detail(rng),
+            "bulk create": bulk_create(rng),
+            "submission testcases": submission_testcases(rng),
+        }
+
+        if options['slug']:
+            problem = Problem.objects.defer('reference_solutions', 'search_vector').filter(slug=options['slug']).first()
+            if problem is None:
+                raise CommandError(f"no problem with slug {options['slug']}")
+            payloads[f"problem {problem.slug}"] = {"message": "", "success": True, "data": GetProblemSerializer(problem).data}
+
+        self.stdout.write(f"{'payload':<24}{'size':>10}  {'op':<7}{'stock':>11}{'orjson':>11}{'speedup':>9}{'stock peak':>12}{'orjson peak':>12}")
+
+        for name, payload in payloads.items():
+            body = JSONRenderer().render(payload)
+
+            if ORJSONRenderer().render(payload) != body:
+                raise CommandError(f"{name}: orjson output differs from the stock renderer")
+
+            self.report(name, len(body), "render", options,
+                        lambda: JSONRenderer().render(payload),
+                        lambda: ORJSONRenderer().render(payload))
+
+            self.report(name, len(body), "parse", options,
+                        lambda: JSONParser().parse(io.BytesIO(body)),
+                        lambda: ORJSONParser().parse(io.BytesIO(body)))
+
+    def report(self, name, size, op, options, stock, fast):
+        stock_time, stock_peak = self.measure(stock, options)
+        fast_time, fast_peak = self.measure(fast, options)
+
+        self.stdout.write(
+            f"{name:<24}{size / 1024:>8.0f}KB  {op:<7}"
+            f"{stock_time * 1e3:>9.3f}ms{fast_time * 1e3:>9.3f}ms{stock_time / fast_time:>8.1f}x"
+            f"{stock_peak / 1024:>10.0f}KB{fast_peak / 1024:>10.0f}KB"
+        )
+
+    def measure(self, func, options):
+        best = min(timeit.repeat(func, number=options['number'], repeat=options['repeat'])) / options['number']
+
+        tracemalloc.start()
+        try:
+            func()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        return best, peak
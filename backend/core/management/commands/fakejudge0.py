@@ -0,0 +1,51 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from core.utils.fakeJudge0 import FakeJudge0Server, parse_verdicts
+
+
+class Command(BaseCommand):
+
+    """
+        Runs the offline Judge0 stand-in (core/utils/fakeJudge0.py) until interrupted.
+        Point JUDGE0_URL at it to develop or load test without a Judge0 cluster:
+
+            python manage.py fakejudge0 --port 2358 --latency 0.5 --workers 8 --verdicts "Accepted=9,Wrong Answer=1"
+    """
+
+    help = "Run a fake Judge0 server with configurable latency, queueing and verdicts"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1')
+        parser.add_argument('--port', type=int, default=2358)
+        parser.add_argument('--latency', type=float, default=0.1, help="seconds each submission takes to run")
+        parser.add_argument('--jitter', type=float, default=0.0, help="random +/- seconds added to latency")
+        parser.add_argument('--workers', type=int, default=4, help="submissions run at the same time, the rest waits in the queue")
+        parser.add_argument('--verdicts', default='Accepted=1', help='weighted verdicts, e.g. "Accepted=8,Wrong Answer=2"')
+        parser.add_argument('--seed', type=int, default=None)
+
+
+    def handle(self, *args, **options):
+        try:
+            server = FakeJudge0Server(
+                host=options['host'],
+                port=options['port'],
+                latency=options['latency'],
+                jitter=options['jitter'],
+                workers=options['workers'],
+                verdicts=parse_verdicts(options['verdicts']),
+                seed=options['seed'],
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        server.start()
+        self.stdout.write(f"Fake Judge0 listening on {server.url}")
+
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.stop()
+            self.stdout.write(f"Stopped, requests served: {server.requests}")
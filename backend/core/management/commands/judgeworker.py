@@ -0,0 +1,230 @@
+import time
+from datetime import timedelta
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+from django.core.management.base import BaseCommand
+from core.models import Submission, SubmissionTestCase
+from core.utils.executor import PENDING_STATUS_IDS, get_executor
+from core.utils.judging import PENDING_TESTCASE_STATUSES, ingest_harness_result, ingest_results, refresh_submission_status
+from core.utils.referenceCache import cache_is_shared
+
+
+CALLBACK_SWEEP_INTERVAL = 15  # seconds between fallback sweeps when Judge0 callbacks are enabled
+CALLBACK_GRACE_PERIOD = 30  # seconds after dispatch a testcase may wait for its callback before it is polled
+STALLED_AFTER = 10  # seconds before a fail fast submission with no wave in flight is resumed
+CLAIM_TIMEOUT = 120  # seconds before a fail fast wave claimed but never sent (see dispatch_wave) is handed back
+
+
+class Command(BaseCommand):
+
+    """
+        Background judging worker.
+        Owns polling Judge0 for every in-flight SubmissionTestCase so web requests never have to wait for a verdict.
+
+        Every sweep:
+        1. load the testcases that have a token and are still In Queue / Processing, batch_size at a time
+        2. ask Judge0 for their current state with a single batch GET per batch
+        3. copy the results onto the rows
+        4. recompute the status of every submission that was touched
+
+        Each token has its own poll schedule (see BaseExecutor.initial_poll_delay / next_poll_delay in core/utils/executor.py):
+        a token that is still running is asked about again after an exponentially growing, capped delay,
+        finished tokens drop out of the pending set, so a sweep only asks Judge0 about tokens that are due.
+
+        When Judge0 callbacks are enabled (see Judge0CallbackView) verdicts are pushed to us and the worker
+        becomes a slow fallback: it sweeps every CALLBACK_SWEEP_INTERVAL seconds and only polls testcases
+        that have not heard back for CALLBACK_GRACE_PERIOD seconds.
+
+        Run it next to the web server:
+            python manage.py judgeworker
+    """
+
+    help = "Poll Judge0 for in-flight submission testcases and store their verdicts"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=float, default=None, help="seconds to sleep between sweeps")
+        parser.add_argument('--batch-size', type=int, default=100, help="max tokens polled per Judge0 request")
+        parser.add_argument('--once', action='store_true', help="run a single sweep and exit")
+
+
+    def handle(self, *args, **options):
+        if not cache_is_shared():
+            self.stderr.write(
+                "Warning: the cache is process-local, listings read solved problems from the database instead of "
+                "a shared version. Set REDIS_URL before running more than one web process."
+            )
+
+        interval = options['interval']
+        if interval is None:
+            interval = CALLBACK_SWEEP_INTERVAL if get_executor().uses_callbacks() else 1.0
+
+        # token -> (next poll at, current delay)
+        self.schedule = {}
+
+        self.stdout.write(f"Judge worker started (sweep every {interval}s, callbacks {'on' if get_executor().uses_callbacks() else 'off'})")
+
+        while True:
+            try:
+                self.sweep(options['batch_size'])
+            except Exception as e:
+                self.stderr.write(f"Judge worker sweep failed: {e}")
+
+            if options['once']:
+                break
+
+            time.sleep(interval)
+
+
+    def sweep(self, batch_size):
+        # harness testcases carry derived tokens Judge0 doesn't know, their submission is polled instead
+        pending = SubmissionTestCase.objects.filter(
+            status__in=PENDING_TESTCASE_STATUSES,
+            token__isnull=False,
+            submission__judge_token__isnull=True
+        )
+
+        if get_executor().uses_callbacks():
+            pending = pending.filter(updated_at__lt=timezone.now() - timedelta(seconds=CALLBACK_GRACE_PERIOD))
+
+        now = time.time()
+        seen = self.sweep_harness(now)
+
+        last_id = 0
+        while True:
+            testcases = list(pending.filter(id__gt=last_id).order_by('id')[:batch_size])
+
+            if not testcases:
+                break
+
+            last_id = testcases[-1].id
+            seen.update(tc.token for tc in testcases)
+
+            due = [tc for tc in testcases if self.is_due(tc.token, tc.created_at, now)]
+
+            if due:
+                self.process(due)
+
+        # forget tokens that finished some other way (callback, another worker)
+        for token in list(self.schedule):
+            if token not in seen:
+                del self.schedule[token]
+
+        self.resume_fail_fast()
+
+
+    """
+        A fail fast submission whose wave is finished but whose next wave never went out
+        (Judge0 was down when dispatch_wave sent it, or the process died before storing its tokens)
+        has nothing left to poll, pick those up here.
+    """
+
+    def resume_fail_fast(self):
+        # the process sending the wave died between the claim's commit and storing the tokens
+        SubmissionTestCase.objects.filter(
+            token__isnull=True,
+            status=SubmissionTestCase.Status.PROCESSING,
+            updated_at__lt=timezone.now() - timedelta(seconds=CLAIM_TIMEOUT)
+        ).update(status=SubmissionTestCase.Status.IN_QUEUE)
+
+        in_flight = SubmissionTestCase.objects.filter(
+            submission=OuterRef('pk'),
+            token__isnull=False,
+            status__in=PENDING_TESTCASE_STATUSES
+        )
+        waiting = SubmissionTestCase.objects.filter(
+            submission=OuterRef('pk'),
+            token__isnull=True,
+            status=SubmissionTestCase.Status.IN_QUEUE
+        )
+
+        stalled = Submission.objects.filter(
+            status=Submission.Status.PENDING,
+            fail_fast=True,
+            updated_at__lt=timezone.now() - timedelta(seconds=STALLED_AFTER)
+        ).filter(Exists(waiting)).exclude(Exists(in_flight)).values_list('id', flat=True)
+
+        for submission_id in stalled:
+            with transaction.atomic():
+                refresh_submission_status(Submission.objects.select_for_update().get(id=submission_id))
+
+
+    def is_due(self, token, created_at, now):
+        if token not in self.schedule:
+            delay = get_executor().initial_poll_delay()
+            self.schedule[token] = (created_at.timestamp() + delay, delay)
+
+        return self.schedule[token][0] <= now
+
+
+    def reschedule(self, token, now, finished, created_at):
+        executor = get_executor()
+
+        if finished:
+            executor.observe_latency(now - created_at.timestamp())
+            self.schedule.pop(token, None)
+        else:
+            delay = executor.next_poll_delay(self.schedule[token][1])
+            self.schedule[token] = (now + delay, delay)
+
+
+    """
+        Compile once harness submissions (see core/utils/harness.py) have one Judge0 token for all their testcases.
+        Returns the harness tokens that are still pending.
+    """
+
+    def sweep_harness(self, now):
+        pending = Submission.objects.filter(
+            status=Submission.Status.PENDING,
+            judge_token__isnull=False
+        )
+
+        if get_executor().uses_callbacks():
+            pending = pending.filter(updated_at__lt=timezone.now() - timedelta(seconds=CALLBACK_GRACE_PERIOD))
+
+        submissions = list(pending.only('id', 'judge_token', 'created_at'))
+        due = {s.judge_token: s for s in submissions if self.is_due(s.judge_token, s.created_at, now)}
+
+        if due:
+            results = get_executor().fetch_batch_results(list(due.keys()))
+            now = time.time()
+
+            for r in results:
+                if not r or r['token'] not in due:
+                    continue
+
+                finished = r['status']['id'] not in PENDING_STATUS_IDS
+                self.reschedule(r['token'], now, finished, due[r['token']].created_at)
+
+                if finished:
+                    ingest_harness_result(due[r['token']].id, r)
+                    get_executor().release([r['token']])
+
+        return {s.judge_token for s in submissions}
+
+
+    """
+        In process function, we fetch the state of the given testcases in one request
+        and store the results per submission, each with one bulk_update (see ingest_results).
+    """
+
+    def process(self, testcases):
+        testcase_mp = {tc.token: tc for tc in testcases}
+        results = get_executor().fetch_batch_results(list(testcase_mp.keys()))
+
+        by_submission = {}
+        for r in results:
+            # nothing new since the last sweep, skip the transaction
+            if r and r.get('token') in testcase_mp and testcase_mp[r['token']].status != r['status']['description']:
+                by_submission.setdefault(testcase_mp[r['token']].submission_id, []).append(r)
+
+        for submission_id, submission_results in by_submission.items():
+            ingest_results(submission_id, submission_results)
+
+        finished = {r['token'] for r in results if r and r['status']['id'] not in PENDING_STATUS_IDS}
+        # stored (ingest_results committed, a failure above leaves them to be fetched again next sweep)
+        get_executor().release(list(finished))
+        now = time.time()
+
+        for token, tc in testcase_mp.items():
+            self.reschedule(token, now, token in finished, tc.created_at)
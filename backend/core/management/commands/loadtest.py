@@ -0,0 +1,267 @@
+import time
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from django.core.management.base import BaseCommand, CommandError
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from account.utils.jwt_helper import generate_access_token
+from core.models import Language, Problem, Submission
+from core.management.commands.judgeworker import Command as JudgeWorker
+from core.utils.executor import set_executor
+from core.utils.fakeJudge0 import FakeJudge0Server, parse_verdicts
+from core.utils.testcaseStore import store_testcases
+from core.utils.judge0 import Judge0Client
+
+User = get_user_model()
+
+SUBMIT_URL = '/api/v1/core/problem/submit/'
+STATUS_URL = '/api/v1/core/problem/submit/{}/'
+
+
+def percentile(values, p):
+    # nearest rank
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, max(0, round(p / 100 * len(values)) - 1))]
+
+
+class PollingJudge0Client(Judge0Client):
+
+    # callbacks would be stored by the web server in the real database, results are polled by the worker thread
+    def submit_batch(self, submissions, callback=True):
+        return super().submit_batch(submissions, callback=False)
+
+    def uses_callbacks(self):
+        return False
+
+
+class Command(BaseCommand):
+
+    """
+        End to end judging load test.
+
+        Creates a throwaway test database, seeds it with --users users and one problem with --testcases testcases,
+        then every user submits --submissions times through SubmitProblemView (one thread per user)
+        and polls SubmitProblemStatusView until the verdict is in.
+        A judgeworker runs in a background thread against the same database.
+
+        By default verdicts come from an in-process fake Judge0 (core/utils/fakeJudge0.py),
+        --judge0-url points the run at a running one instead (fakejudge0 command or a real Judge0).
+
+        Reports throughput, p50 / p95 / p99 latency of submit, status and submit to verdict,
+        and the database queries of every request and of the judge worker.
+        --max-submit-queries / --max-status-queries make the command fail when a request needs more,
+        so it can guard against query regressions in CI.
+
+            python manage.py loadtest --users 20 --submissions 5 --testcases 10 --latency 0.2 --workers 8
+    """
+
+    help = "Load test submit -> verdict against a fake Judge0 and report latency and query counts"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10, help="concurrent users")
+        parser.add_argument('--submissions', type=int, default=5, help="submissions per user")
+        parser.add_argument('--testcases', type=int, default=10, help="testcases of the problem")
+        parser.add_argument('--fail-fast', action='store_true', help="submit with fail fast judging")
+        parser.add_argument('--poll-interval', type=float, default=0.5, help="seconds between status requests")
+        parser.add_argument('--worker-interval', type=float, default=0.2, help="seconds between judge worker sweeps")
+        parser.add_argument('--timeout', type=float, default=120, help="seconds a submission may take before it counts as timed out")
+        parser.add_argument('--judge0-url', default=None, help="use this Judge0 instead of the in-process fake")
+        parser.add_argument('--latency', type=float, default=0.1, help="fake Judge0 seconds per submission")
+        parser.add_argument('--jitter', type=float, default=0.0, help="fake Judge0 random +/- latency")
+        parser.add_argument('--workers', type=int, default=8, help="fake Judge0 submissions run at the same time")
+        parser.add_argument('--verdicts', default='Accepted=1', help='fake Judge0 verdicts, e.g. "Accepted=8,Wrong Answer=2"')
+        parser.add_argument('--max-submit-queries', type=int, default=None)
+        parser.add_argument('--max-status-queries', type=int, default=None)
+
+
+    def handle(self, *args, **options):
+        fake = None
+        if options['judge0_url']:
+            judge0_url = options['judge0_url']
+        else:
+            try:
+                fake = FakeJudge0Server(
+                    latency=options['latency'],
+                    jitter=options['jitter'],
+                    workers=options['workers'],
+                    verdicts=parse_verdicts(options['verdicts']),
+                ).start()
+            except ValueError as e:
+                raise CommandError(str(e))
+            judge0_url = fake.url
+
+        set_executor(PollingJudge0Client(base_url=judge0_url))
+
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+
+        try:
+            self.stdout.write(f"Judging against {judge0_url}, test database {connection.settings_dict['NAME']}")
+            self.run(options, fake)
+        finally:
+            set_executor(None)
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            if fake:
+                fake.stop()
+
+
+    def seed(self, options):
+        users = [
+            User.objects.create_user(email=f"loadtest{i}@example.com", username=f"loadtest{i}", password=None, is_active=True)
+            for i in range(options['users'])
+        ]
+        Language.objects.create(langId=71, name='Python')
+        problem = Problem.objects.create(
+            title="Load test",
+            description="Echo the input",
+            examples=[],
+            user=users[0],
+        )
+        store_testcases(problem, [{"input": str(i), "expected": str(i)} for i in range(options['testcases'])])
+        return users, problem
+
+
+    def run(self, options, fake):
+        users, problem = self.seed(options)
+
+        self.samples = {"submit": [], "status": [], "verdict": []}
+        self.queries = {"submit": [], "status": [], "worker": 0}
+        self.verdicts = Counter()
+        self.errors = Counter()
+        self._lock = threading.Lock()
+
+        stop = threading.Event()
+        worker = threading.Thread(target=self.judge_worker, args=(stop, options['worker_interval']))
+        worker.start()
+
+        started_at = time.monotonic()
+        try:
+            with ThreadPoolExecutor(max_workers=len(users)) as pool:
+                list(pool.map(lambda user: self.user_session(user, problem, options), users))
+        finally:
+            stop.set()
+            worker.join()
+
+        self.report(time.monotonic() - started_at, options, fake)
+
+
+    def judge_worker(self, stop, interval):
+        worker = JudgeWorker()
+        worker.schedule = {}
+
+        try:
+            while not stop.is_set():
+                with CaptureQueriesContext(connection) as queries:
+                    try:
+                        worker.sweep(100)
+                    except Exception as e:
+                        self.record_error(f"worker: {e}")
+
+                with self._lock:
+                    self.queries["worker"] += len(queries)
+
+                stop.wait(interval)
+        finally:
+            connection.close()
+
+
+    def user_session(self, user, problem, options):
+        client = Client()
+
+        try:
+            for _ in range(options['submissions']):
+                self.submit_and_wait(client, user, problem, options)
+        finally:
+            connection.close()
+
+
+    def submit_and_wait(self, client, user, problem, options):
+        client.cookies['access'] = generate_access_token(user)
+        submitted_at = time.monotonic()
+
+        data = {"problem": problem.slug, "language": "python", "source_code": "print(input())"}
+        if options['fail_fast']:
+            data["fail_fast"] = True
+
+        response, elapsed, queries = self.timed(client.post, SUBMIT_URL, data, content_type='application/json')
+        self.record("submit", elapsed, queries)
+
+        if response.status_code != 201:
+            return self.record_error(f"submit {response.status_code}")
+
+        submission_id = response.json()['submission_id']
+        while time.monotonic() - submitted_at < options['timeout']:
+            time.sleep(options['poll_interval'])
+
+            response, elapsed, queries = self.timed(client.get, STATUS_URL.format(submission_id))
+            self.record("status", elapsed, queries)
+
+            if response.status_code != 200:
+                return self.record_error(f"status {response.status_code}")
+
+            verdict = response.json()['status']
+            if verdict != Submission.Status.PENDING:
+                with self._lock:
+                    self.samples["verdict"].append(time.monotonic() - submitted_at)
+                    self.verdicts[verdict] += 1
+                return
+
+        self.record_error("timed out")
+
+
+    def timed(self, method, *args, **kwargs):
+        with CaptureQueriesContext(connection) as queries:
+            start = time.monotonic()
+            response = method(*args, **kwargs)
+            elapsed = time.monotonic() - start
+        return response, elapsed, len(queries)
+
+
+    def record(self, name, elapsed, queries):
+        with self._lock:
+            self.samples[name].append(elapsed)
+            self.queries[name].append(queries)
+
+
+    def record_error(self, error):
+        with self._lock:
+            self.errors[error] += 1
+
+
+    def report(self, duration, options, fake):
+        judged = len(self.samples["verdict"])
+        requests = len(self.samples["submit"]) + len(self.samples["status"])
+
+        self.stdout.write(
+            f"\n{judged} submissions judged in {duration:.2f}s: "
+            f"{judged / duration:.2f} submissions/s, {requests / duration:.2f} requests/s"
+        )
+
+        self.stdout.write(f"\n{'':20}{'count':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}{'queries avg':>13}{'max':>6}")
+        for name, label in [("submit", "submit request"), ("status", "status request"), ("verdict", "submit to verdict")]:
+            values = self.samples[name]
+            line = f"{label:20}{len(values):>8}" + "".join(
+                f"{percentile(values, p) * 1000:>10.1f}" for p in (50, 95, 99, 100)
+            )
+            queries = self.queries.get(name)
+            if queries:
+                line += f"{sum(queries) / len(queries):>13.1f}{max(queries):>6}"
+            self.stdout.write(line)
+
+        self.stdout.write(f"\njudge worker queries: {self.queries['worker']} ({self.queries['worker'] / max(judged, 1):.1f} per submission)")
+        self.stdout.write(f"verdicts: {dict(self.verdicts)}")
+        if fake:
+            self.stdout.write(f"fake Judge0 requests: {fake.requests}")
+
+        if self.errors:
+            self.stdout.write(self.style.ERROR(f"errors: {dict(self.errors)}"))
+
+        for name in ("submit", "status"):
+            limit = options[f'max_{name}_queries']
+            if limit is not None and self.queries[name] and max(self.queries[name]) > limit:
+                raise CommandError(f"{name} request used {max(self.queries[name])} queries, more than --max-{name}-queries {limit}")
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.3 on 2026-10-18 14:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_alter_submissiontestcase_token'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='problem',
+            name='fail_fast',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='submission',
+            name='fail_fast',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AlterField(
+            model_name='submissiontestcase',
+            name='status',
+            field=models.CharField(choices=[('In Queue', 'In Queue'), ('Processing', 'Processing'), ('Accepted', 'Accepted'), ('Wrong Answer', 'Wrong Answer'), ('Runtime Error', 'Runtime Error'), ('Compilation Error', 'Compilation Error'), ('Time Limit Exceeded', 'Time Limit Exceeded'), ('Skipped', 'Skipped')], db_index=True, default='In Queue', max_length=50),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-18 14:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_problem_fail_fast_submission_fail_fast_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='submission',
+            name='judge_token',
+            field=models.CharField(blank=True, max_length=100, null=True, unique=True),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.3 on 2026-10-18 14:44
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def clear_unparsable_time_memory(apps, schema_editor):
+    # the columns become numeric below, values Postgres can't cast would make the migration fail
+    SubmissionTestCase = apps.get_model('core', 'SubmissionTestCase')
+    SubmissionTestCase.objects.exclude(time__regex=r'^\s*[0-9]+(\.[0-9]+)?\s*$').update(time=None)
+    SubmissionTestCase.objects.exclude(memory__regex=r'^\s*[0-9]+\s*$').update(memory=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_submission_judge_token'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='submission',
+            name='max_memory',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='submission',
+            name='max_time',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='submission',
+            name='passed_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='submission',
+            name='total_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(clear_unparsable_time_memory, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='submissiontestcase',
+            name='memory',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='submissiontestcase',
+            name='time',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='submission',
+            index=models.Index(fields=['user', 'problem', '-created_at'], name='submission_user_problem_idx'),
+        ),
+    ]
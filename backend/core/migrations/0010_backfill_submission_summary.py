@@ -0,0 +1,38 @@
+from django.db import migrations
+from django.db.models import Count, Max, Q
+
+
+def backfill_submission_summary(apps, schema_editor):
+    Submission = apps.get_model('core', 'Submission')
+
+    submissions = Submission.objects.annotate(
+        summary_max_time=Max('testcases__time'),
+        summary_max_memory=Max('testcases__memory'),
+        summary_passed=Count('testcases', filter=Q(testcases__status='Accepted')),
+        summary_total=Count('testcases'),
+    ).order_by('id')
+
+    batch = []
+    for submission in submissions.iterator(chunk_size=1000):
+        submission.max_time = submission.summary_max_time
+        submission.max_memory = submission.summary_max_memory
+        submission.passed_count = submission.summary_passed
+        submission.total_count = submission.summary_total
+        batch.append(submission)
+
+        if len(batch) == 1000:
+            Submission.objects.bulk_update(batch, ['max_time', 'max_memory', 'passed_count', 'total_count'])
+            batch = []
+
+    Submission.objects.bulk_update(batch, ['max_time', 'max_memory', 'passed_count', 'total_count'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_submission_summary_numeric_time_memory'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_submission_summary, migrations.RunPython.noop),
+    ]
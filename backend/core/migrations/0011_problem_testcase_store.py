@@ -0,0 +1,84 @@
+# Generated by Django 5.2.3 on 2026-10-18 14:48
+
+import django.db.models.deletion
+import zlib
+import hashlib
+from django.db import migrations, models
+
+
+def move_testcases_to_store(apps, schema_editor):
+    # same encoding as core/utils/testcaseStore.py, copied so the migration does not depend on app code
+    Problem = apps.get_model('core', 'Problem')
+    TestCaseBlob = apps.get_model('core', 'TestCaseBlob')
+    ProblemTestCase = apps.get_model('core', 'ProblemTestCase')
+
+    def blob(text):
+        raw = (text or "").encode('utf-8')
+        return TestCaseBlob(digest=hashlib.sha256(raw).hexdigest(), data=zlib.compress(raw, 6), size=len(raw))
+
+    for problem in Problem.objects.only('id', 'testcases').iterator(chunk_size=100):
+        pairs = [(blob(tc.get('input')), blob(tc.get('expected'))) for tc in problem.testcases or []]
+
+        TestCaseBlob.objects.bulk_create({b.digest: b for pair in pairs for b in pair}.values(), ignore_conflicts=True, batch_size=500)
+        ProblemTestCase.objects.bulk_create(
+            [
+                ProblemTestCase(problem_id=problem.id, position=position, input_id=i.digest, expected_id=e.digest)
+                for position, (i, e) in enumerate(pairs)
+            ],
+            batch_size=500
+        )
+
+
+def move_testcases_back(apps, schema_editor):
+    # reverse: RemoveField has put Problem.testcases back (empty), refill it from the store before its tables are dropped
+    Problem = apps.get_model('core', 'Problem')
+    ProblemTestCase = apps.get_model('core', 'ProblemTestCase')
+
+    testcases = {}
+    rows = ProblemTestCase.objects.select_related('input', 'expected').order_by('problem_id', 'position')
+    for row in rows.iterator(chunk_size=500):
+        testcases.setdefault(row.problem_id, []).append({
+            "input": zlib.decompress(row.input.data).decode('utf-8'),
+            "expected": zlib.decompress(row.expected.data).decode('utf-8'),
+        })
+
+    problems = [Problem(id=problem_id, testcases=pairs) for problem_id, pairs in testcases.items()]
+    Problem.objects.bulk_update(problems, ['testcases'], batch_size=100)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_backfill_submission_summary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TestCaseBlob',
+            fields=[
+                ('digest', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('data', models.BinaryField()),
+                ('size', models.PositiveIntegerField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ProblemTestCase',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('position', models.PositiveIntegerField()),
+                ('problem', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='hidden_testcases', to='core.problem')),
+                ('expected', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='+', to='core.testcaseblob')),
+                ('input', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='+', to='core.testcaseblob')),
+            ],
+            options={
+                'ordering': ['problem', 'position'],
+                'constraints': [models.UniqueConstraint(fields=('problem', 'position'), name='problem_testcase_position_unique')],
+            },
+        ),
+        migrations.RunPython(move_testcases_to_store, move_testcases_back),
+        migrations.RemoveField(
+            model_name='problem',
+            name='testcases',
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.3 on 2026-10-18 14:49
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_solved_problems(apps, schema_editor):
+    Submission = apps.get_model('core', 'Submission')
+    SolvedProblem = apps.get_model('core', 'SolvedProblem')
+
+    passed = Submission.objects.filter(status='Passed').values('user_id', 'problem_id').distinct().order_by()
+
+    batch = []
+    for row in passed.iterator(chunk_size=1000):
+        batch.append(SolvedProblem(user_id=row['user_id'], problem_id=row['problem_id']))
+
+        if len(batch) == 1000:
+            SolvedProblem.objects.bulk_create(batch, ignore_conflicts=True)
+            batch = []
+
+    SolvedProblem.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_problem_testcase_store'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SolvedProblem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('solved_at', models.DateTimeField(auto_now_add=True)),
+                ('problem', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='solved_by', to='core.problem')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='solved_problems', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('user', 'problem'), name='solved_problem_unique')],
+            },
+        ),
+        migrations.RunPython(backfill_solved_problems, migrations.RunPython.noop),
+    ]
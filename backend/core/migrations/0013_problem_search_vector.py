@@ -0,0 +1,65 @@
+# Generated by Django 5.2.3 on 2026-10-18 14:51
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.db import migrations
+from django.db.models import OuterRef, Subquery, TextField, Value
+from django.db.models.functions import Coalesce
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.search import SearchVector
+
+
+def create_title_trigram_index(apps, schema_editor):
+    # pg_trgm is optional, search falls back to full text only when the server does not ship it
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+        if cursor.fetchone() is None:
+            return
+
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS problem_title_trgm_idx ON core_problem USING gin (title gin_trgm_ops)"
+    )
+
+
+def drop_title_trigram_index(apps, schema_editor):
+    schema_editor.execute("DROP INDEX IF EXISTS problem_title_trgm_idx")
+
+
+def backfill_search_vectors(apps, schema_editor):
+    # same expression as core/utils/search.py, copied so the migration does not depend on app code
+    Problem = apps.get_model('core', 'Problem')
+    Tag = apps.get_model('core', 'Tag')
+
+    tag_names = Tag.objects.filter(problems=OuterRef('pk')).values('problems').annotate(
+        names=StringAgg('name', delimiter=' ')
+    ).values('names')
+
+    Problem.objects.update(
+        search_vector=SearchVector('title', weight='A', config='english')
+        + SearchVector(Coalesce(Subquery(tag_names), Value(''), output_field=TextField()), weight='B', config='english')
+        + SearchVector('description', weight='C', config='english')
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_solvedproblem'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='problem',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='problem',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='problem_search_vector_idx'),
+        ),
+        migrations.RunPython(create_title_trigram_index, drop_title_trigram_index),
+        migrations.RunPython(backfill_search_vectors, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.3 on 2026-10-18 14:54
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_problem_search_vector'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='problem',
+            index=models.Index(fields=['difficulty', '-created_at', '-id'], name='problem_difficulty_created_idx'),
+        ),
+        # the auto created problem/tag table only has single column indexes on (problem_id) and (tag_id)
+        # plus the (problem_id, tag_id) unique one, tag filters and tag facet counts read it by tag
+        migrations.RunSQL(
+            "CREATE INDEX IF NOT EXISTS problem_tags_tag_problem_idx ON core_problem_tags (tag_id, problem_id)",
+            "DROP INDEX IF EXISTS problem_tags_tag_problem_idx",
+        ),
+    ]
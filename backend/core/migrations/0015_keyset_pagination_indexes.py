@@ -0,0 +1,27 @@
+# Generated by Django 5.2.3 on 2026-10-18 14:56
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_problem_filter_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='submission',
+            name='submission_user_problem_idx',
+        ),
+        migrations.AddIndex(
+            model_name='problem',
+            index=models.Index(fields=['-created_at', '-id'], name='problem_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='submission',
+            index=models.Index(fields=['user', 'problem', '-created_at', '-id'], name='submission_user_problem_idx'),
+        ),
+    ]
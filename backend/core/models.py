@@ -1,5 +1,7 @@
 from django import db
 from django.db import models
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.contrib.auth import get_user_model
 from django.utils.text import slugify
 
@@ -57,7 +59,21 @@ class Language(models.Model):
 
 
 
+class ProblemQuerySet(models.QuerySet):
+
+    def listing(self):
+        # only the columns list pages render, the large JSON / text payloads stay in Postgres
+        return self.only(*Problem.LISTING_FIELDS)
+
+
+
 class Problem(models.Model):
+
+    # columns list endpoints may load, and the large ones they must not (see GetAllProblemSerializer)
+    LISTING_FIELDS = ['id', 'title', 'difficulty', 'slug', 'created_at']
+    HEAVY_FIELDS = ['description', 'examples', 'constraints', 'hints', 'editorial', 'code_snippets', 'reference_solutions', 'search_vector']
+
+    objects = ProblemQuerySet.as_manager()
     
     title = models.CharField(
         max_length = 200,
@@ -93,12 +109,6 @@ class Problem(models.Model):
     
     editorial = models.TextField(blank=True, null=True)
 
-    testcases = models.JSONField(
-        default = list, 
-        blank = False, 
-        null = False
-    )
-
     code_snippets = models.JSONField(
         default = list, 
         blank = True, 
@@ -129,6 +139,21 @@ class Problem(models.Model):
         null = True
     )
 
+    # judge submissions in waves and stop at the first failing testcase, can be overridden per submission
+    fail_fast = models.BooleanField(default=False)
+
+    # weighted title (A) / tag names (B) / description (C), kept up to date by core/signals.py
+    search_vector = SearchVectorField(null=True, blank=True, editable=False)
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=['search_vector'], name='problem_search_vector_idx'),
+            # problem listings, newest first, keyset paginated on (created_at, id) (core/utils/pagination.py)
+            models.Index(fields=['-created_at', '-id'], name='problem_created_idx'),
+            # problemset filtered by difficulty, newest first (core/utils/problemFilter.py)
+            models.Index(fields=['difficulty', '-created_at', '-id'], name='problem_difficulty_created_idx'),
+        ]
+
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = slugify(self.title)
@@ -139,6 +164,63 @@ class Problem(models.Model):
     
 
 
+"""
+    Hidden testcases live outside the Problem row (see core/utils/testcaseStore.py).
+
+    TestCaseBlob holds one input or expected output, zlib compressed and keyed by the sha256 of its content,
+    so problems that reuse the same data (a shared stress test, the same "1" input) store it once.
+    ProblemTestCase puts blobs in order for a problem.
+    They are only read when a submission is judged or a reference solution is checked.
+"""
+
+class TestCaseBlob(models.Model):
+
+    digest = models.CharField(max_length=64, primary_key=True)  # sha256 of the uncompressed content
+
+    data = models.BinaryField()  # zlib compressed utf-8
+
+    size = models.PositiveIntegerField()  # uncompressed bytes
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.digest[:12]} ({self.size} bytes)"
+
+
+
+class ProblemTestCase(models.Model):
+
+    problem = models.ForeignKey(
+        Problem,
+        on_delete=models.CASCADE,
+        related_name='hidden_testcases'
+    )
+
+    position = models.PositiveIntegerField()
+
+    input = models.ForeignKey(
+        TestCaseBlob,
+        on_delete=models.PROTECT,
+        related_name='+'
+    )
+
+    expected = models.ForeignKey(
+        TestCaseBlob,
+        on_delete=models.PROTECT,
+        related_name='+'
+    )
+
+    class Meta:
+        ordering = ['problem', 'position']
+        constraints = [
+            models.UniqueConstraint(fields=['problem', 'position'], name='problem_testcase_position_unique'),
+        ]
+
+    def __str__(self):
+        return f"Testcase {self.position} of {self.problem_id}"
+
+
+
 class Submission(models.Model):
 
     class Status(models.TextChoices):
@@ -173,17 +255,65 @@ class Submission(models.Model):
         max_length = 10
     )
 
+    # testcases are dispatched in waves and the rest is skipped after the first failure
+    fail_fast = models.BooleanField(default=False)
+
+    # Judge0 token of the compile once harness that judges all testcases together (see core/utils/harness.py)
+    judge_token = models.CharField(max_length=100, unique=True, null=True, blank=True)
+
+    # summary of the testcases, kept up to date by refresh_submission_status so listings don't join testcases
+    max_time = models.FloatField(null=True, blank=True)  # seconds, slowest testcase
+    max_memory = models.IntegerField(null=True, blank=True)  # KB, hungriest testcase
+    passed_count = models.PositiveIntegerField(default=0)
+    total_count = models.PositiveIntegerField(default=0)
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['-created_at']  # Latest submissions first
+        indexes = [
+            # a user's submissions for one problem, newest first, keyset paginated (GetUserProblemSubmissionsView)
+            models.Index(fields=['user', 'problem', '-created_at', '-id'], name='submission_user_problem_idx'),
+        ]
 
     def __str__(self):
         return f"Submission #{self.id} by {self.user.email} for {self.problem.title}"
 
 
 
+"""
+    Problems a user has solved (has at least one Passed submission for), one row per (user, problem).
+    Written by refresh_submission_status when a submission passes, read by the problem listings
+    (see core/utils/solved.py) instead of correlating every listed problem against the submissions table.
+"""
+
+class SolvedProblem(models.Model):
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='solved_problems'
+    )
+
+    problem = models.ForeignKey(
+        Problem,
+        on_delete=models.CASCADE,
+        related_name='solved_by'
+    )
+
+    solved_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'problem'], name='solved_problem_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} solved {self.problem_id}"
+
+
+
 class SubmissionTestCase(models.Model):
 
     class Status(models.TextChoices):
@@ -194,6 +324,7 @@ class SubmissionTestCase(models.Model):
         RUNTIME_ERROR = "Runtime Error", "Runtime Error"
         COMPILATION_ERROR = "Compilation Error", "Compilation Error"
         TIME_LIMIT_EXCEEDED = "Time Limit Exceeded", "Time Limit Exceeded"
+        SKIPPED = "Skipped", "Skipped"  # never sent to Judge0, an earlier testcase already failed (fail fast)
 
     submission = models.ForeignKey(
         Submission,
@@ -220,8 +351,8 @@ class SubmissionTestCase(models.Model):
     stderr = models.TextField(blank=True, null=True)
     compile_output = models.TextField(blank=True, null=True)
 
-    memory = models.CharField(max_length=50, blank=True, null=True)
-    time = models.CharField(max_length=50, blank=True, null=True)
+    memory = models.IntegerField(blank=True, null=True)  # KB
+    time = models.FloatField(blank=True, null=True)  # seconds
     stdout = models.TextField(blank=True, null=True)
 
     created_at = models.DateTimeField(auto_now_add=True)
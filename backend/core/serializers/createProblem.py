@@ -1,5 +1,24 @@
+from django.db import transaction
 from rest_framework import serializers
 from core.models import Problem, Tag
+from core.utils.testcaseStore import store_testcases
+
+
+"""
+    Hidden testcases, a list of {"input": ..., "expected": ...}.
+    They are not a Problem column, create / update put them in the testcase store (core/utils/testcaseStore.py).
+"""
+
+class TestCaseField(serializers.DictField):
+
+    child = serializers.CharField(allow_blank=True, trim_whitespace=False)
+
+    def to_internal_value(self, data):
+        data = super().to_internal_value(data)
+        if 'input' not in data or 'expected' not in data:
+            raise serializers.ValidationError('Every testcase needs "input" and "expected".')
+        return {"input": data['input'], "expected": data['expected']}
+
 
 
 class CreateProblemSerializer(serializers.ModelSerializer):
@@ -19,6 +38,10 @@ class CreateProblemSerializer(serializers.ModelSerializer):
         child=serializers.CharField(), write_only=True
     )
 
+    testcases = serializers.ListField(
+        child=TestCaseField(), write_only=True
+    )
+
 
     class Meta: # Meta class to specify model and fields
 
@@ -36,13 +59,17 @@ class CreateProblemSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
 
         tags_data = validated_data.pop('tags', [])
+        testcases = validated_data.pop('testcases')
 
-        problem = Problem.objects.create(**validated_data) # ** unpacking all validated fields for creation
-        
-        for tag_name in tags_data:
-            
-            tag, created = Tag.objects.get_or_create(name=tag_name)
-            problem.tags.add(tag)
+        with transaction.atomic():
+            problem = Problem.objects.create(**validated_data) # ** unpacking all validated fields for creation
+
+            store_testcases(problem, testcases)
+
+            for tag_name in tags_data:
+
+                tag, created = Tag.objects.get_or_create(name=tag_name)
+                problem.tags.add(tag)
 
         return problem
     
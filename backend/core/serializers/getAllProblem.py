@@ -1,13 +1,33 @@
 from dataclasses import fields
+from django.core.exceptions import ImproperlyConfigured
 from rest_framework import serializers
 from core.models import Problem, Submission, Tag, Language, SubmissionTestCase
 
+"""
+    Problem listings can hold thousands of rows whose testcases / reference solutions are megabytes each.
+    Problems given to GetAllProblemSerializer must come from Problem.objects.listing(),
+    a queryset that loaded the heavy columns fails loudly instead of silently reading them for every row.
+"""
+
+class ProblemListingSerializer(serializers.ListSerializer):
+
+    def to_representation(self, data):
+        for problem in data:
+            loaded = set(Problem.HEAVY_FIELDS) - problem.get_deferred_fields()
+            if loaded:
+                raise ImproperlyConfigured(
+                    f"Problem listing loaded {sorted(loaded)}, use Problem.objects.listing() for list endpoints"
+                )
+        return super().to_representation(data)
+
+
 class GetAllProblemSerializer(serializers.ModelSerializer):
     user_submission_passed = serializers.BooleanField()
 
     class Meta:
         model = Problem
         fields = ['id','title','difficulty','slug','tags','user_submission_passed']
+        list_serializer_class = ProblemListingSerializer
 
 
     def to_representation(self, instance):
@@ -18,8 +38,8 @@ class GetAllProblemSerializer(serializers.ModelSerializer):
 
 
 class GetProblemSubmissionsForUserSerailizer(serializers.ModelSerializer):
-    runtime = serializers.FloatField(read_only=True)
-    memory = serializers.FloatField(read_only=True)
+    runtime = serializers.FloatField(source='max_time', read_only=True)
+    memory = serializers.IntegerField(source='max_memory', read_only=True)
     
     class Meta:
         model = Submission
@@ -47,7 +67,7 @@ class GetUserProblemSubmissionDetailSerializer(serializers.ModelSerializer):
 class GetUserProblemSubmissionTestCasesSerializer(serializers.ModelSerializer):
     class Meta:
         model = SubmissionTestCase
-        exclude = ['token', 'submission']
+        fields = ['id', 'status', 'input_data', 'expected_output', 'stdout', 'actual_output', 'stderr', 'compile_output', 'time', 'memory']
 
 
 class GetAllTagsSerializer(serializers.ModelSerializer):
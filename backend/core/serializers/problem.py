@@ -1,13 +1,16 @@
 from os import read
 from rest_framework import serializers
 from core.models import Problem, Tag
+from core.serializers.createProblem import TestCaseField
+from core.utils.testcaseStore import store_testcases
 
 
 """
     Serializer for retrieving Problem instances with custom representation.
 
-    This serializer returns all fields of the Problem model and overrides
-    the `to_representation` method to:
+    This serializer returns the fields of the Problem model except reference_solutions and the search_vector index column
+    (hidden testcases are not a Problem field at all, see core/utils/testcaseStore.py)
+    and overrides the `to_representation` method to:
       - Represent the related tags as a list of tag names instead of tag objects.
       - Represent the user as the user's email instead of the user object.
 
@@ -22,7 +25,7 @@ class GetProblemSerializer(serializers.ModelSerializer):
         
         model = Problem
         
-        fields = '__all__' 
+        exclude = ['reference_solutions', 'search_vector']
 
     
     def to_representation(self, instance):
@@ -61,6 +64,10 @@ class PatchProblemSerializer(serializers.ModelSerializer):
     tags = serializers.ListField(
         child=serializers.CharField(), required=False, write_only=True
     )
+
+    testcases = serializers.ListField(
+        child=TestCaseField(), required=False, write_only=True
+    )
     
     class Meta:
         model = Problem
@@ -72,6 +79,7 @@ class PatchProblemSerializer(serializers.ModelSerializer):
 
     def update(self, instance, validated_data):
         tags_data = validated_data.pop('tags', None)
+        testcases = validated_data.pop('testcases', None)
 
         if 'title' in validated_data:
             instance.title = validated_data.get('title')
@@ -94,9 +102,6 @@ class PatchProblemSerializer(serializers.ModelSerializer):
         if 'editorial' in validated_data:
             instance.editorial = validated_data.get('editorial')
         
-        if 'testcases' in validated_data:
-            instance.testcases = validated_data.get('testcases')
-        
         if 'code_snippets' in validated_data:
             instance.code_snippets = validated_data.get('code_snippets')
         
@@ -105,6 +110,9 @@ class PatchProblemSerializer(serializers.ModelSerializer):
         
         instance.save()
 
+        if testcases is not None:
+            store_testcases(instance, testcases)
+
         if tags_data is not None:
             instance.tags.clear()
             for tag_name in tags_data:
@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from core.models import Submission
+from core.models import Submission, SubmissionTestCase
 
 class SubmitProblemSerializer(serializers.ModelSerializer):
     
@@ -9,4 +9,18 @@ class SubmitProblemSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Submission
-        fields = ['problem','source_code', 'language']
\ No newline at end of file
+        fields = ['problem','source_code', 'language', 'fail_fast']
+
+
+"""
+    Shape of a single testcase verdict, shared by SubmitProblemStatusView and the verdict stream.
+"""
+
+class SubmissionTestCaseResultSerializer(serializers.ModelSerializer):
+
+    input = serializers.CharField(source='input_data')
+    expected = serializers.CharField(source='expected_output')
+
+    class Meta:
+        model = SubmissionTestCase
+        fields = ['id', 'input', 'expected', 'stdout', 'stderr', 'status']
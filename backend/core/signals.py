@@ -0,0 +1,96 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+from core.models import Language, Problem, Tag
+from core.utils.search import update_search_vectors
+from core.utils.referenceCache import languages_cache, problems_cache, tags_cache
+from core.utils.renderedCache import problem_pages
+
+
+"""
+    Keeps Problem.search_vector in step with what it is built from (title, description and tag names).
+    Connected in CoreConfig.ready.
+"""
+
+SEARCH_SOURCE_FIELDS = {'title', 'description'}
+
+
+@receiver(post_save, sender=Problem)
+def problem_saved(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not SEARCH_SOURCE_FIELDS & set(update_fields):
+        return
+    update_search_vectors([instance.pk])
+
+
+@receiver(m2m_changed, sender=Problem.tags.through)
+def problem_tags_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    if not reverse:
+        tags_changed([instance.pk])
+    elif pk_set:
+        # tag.problems.add(...) / remove(...)
+        tags_changed(pk_set)
+    else:
+        # tag.problems.clear(), the cleared problems are gone from the relation already
+        tags_changed(None)
+
+
+@receiver(post_save, sender=Tag)
+def tag_saved(sender, instance, created, **kwargs):
+    if not created:
+        tags_changed(instance.problems.values_list('id', flat=True))
+
+
+@receiver(pre_delete, sender=Tag)
+def tag_deleted(sender, instance, **kwargs):
+    # the cascade drops the problem_tags rows without m2m_changed, read the problems while they are still linked
+    # and rebuild them once the rows are gone
+    problem_ids = list(instance.problems.values_list('id', flat=True))
+    if problem_ids:
+        transaction.on_commit(lambda: tags_changed(problem_ids))
+
+
+"""
+    The tags of the given problems (all when None) changed or were renamed: they are part of the search vector,
+    of the problem page (updated_at is its ETag, see core/utils/conditionalGet.py) and of every listing.
+"""
+
+def tags_changed(problem_ids):
+    problem_ids = None if problem_ids is None else list(problem_ids)
+    problems = Problem.objects.all() if problem_ids is None else Problem.objects.filter(id__in=problem_ids)
+
+    update_search_vectors(problem_ids)
+    problems.update(updated_at=timezone.now())
+    problems_cache.bump_on_commit()
+
+    for problem_id in problem_ids if problem_ids is not None else problems.values_list('id', flat=True):
+        problem_pages.invalidate(problem_id)
+
+
+
+"""
+    Reference data cache invalidation (core/utils/referenceCache.py):
+    any write to a language, tag or problem moves its namespace to a new version.
+"""
+
+@receiver(post_save, sender=Language)
+@receiver(post_delete, sender=Language)
+def language_changed(sender, **kwargs):
+    languages_cache.bump_on_commit()
+
+
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+def tag_changed(sender, **kwargs):
+    tags_cache.bump_on_commit()
+
+
+@receiver(post_save, sender=Problem)
+@receiver(post_delete, sender=Problem)
+def problem_changed(sender, instance, **kwargs):
+    problems_cache.bump_on_commit()
+    # PATCH / DELETE of the problem page, its cached body is also versioned by updated_at if this is missed
+    problem_pages.invalidate(instance.pk)
@@ -1,3 +1,1017 @@
+import io
+import json
+import base64
+import os
+import time
+import tempfile
+import zipfile
+import subprocess
+import threading
+from datetime import timedelta
+from unittest import mock
+from decimal import Decimal
+from django.utils import timezone
+from django.db import connection, transaction
+from django.db.models import Value
 from django.test import TestCase
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.core.exceptions import ImproperlyConfigured
+from django.contrib.auth import get_user_model
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from account.utils.jwt_helper import generate_access_token
+from core.models import Language, Problem, SolvedProblem, Submission, SubmissionTestCase, Tag, TestCaseBlob
+from core.serializers.getAllProblem import GetAllProblemSerializer
+from core.serializers.problem import PatchProblemSerializer
+from core.management.commands.judgeworker import Command as JudgeWorker
+from core.management.commands.loadtest import PollingJudge0Client
+from core.utils.executor import BaseExecutor, set_executor
+from core.utils.fakeJudge0 import FakeJudge0Server, parse_verdicts
+from core.utils.judging import PENDING_TESTCASE_STATUSES, dispatch_testcases, refresh_submission_status
+from core.utils.fastJson import ORJSONParser, ORJSONRenderer
+from core.utils.harness import HARNESS_LANGUAGES, build_harness_submission, parse_harness_output
+from core.utils import localExecutor
+from core.utils.referenceCache import VersionedCache, all_languages, get_language, languages_cache, require_shared_cache, submission_problem
+from core.utils.renderedCache import CoalescingCache
+from core.utils.search import search_problems, trigram_available
+from core.utils.solved import record_solved
+from core.utils.testcaseStore import load_testcases, store_testcases
 
-# Create your tests here.
+User = get_user_model()
+
+
+def use_shared_cache(test):
+    # pinned counts are for a shared cache (Redis), where the solved set version costs no query, see solved_version
+    patcher = mock.patch('core.utils.solved.cache_is_shared', return_value=True)
+    patcher.start()
+    test.addCleanup(patcher.stop)
+
+
+class FakeJudge0Test(TestCase):
+
+    def test_batch_round_trip(self):
+        with FakeJudge0Server(latency=0.01, verdicts={"Wrong Answer": 1}) as server:
+            client = PollingJudge0Client(base_url=server.url)
+            tokens = client.submit_batch([{"language_id": 71, "source_code": "", "stdin": "1", "expected_output": "1"}] * 3)
+            results = client.poll_batch_results(tokens)
+
+        self.assertEqual([r['token'] for r in results], tokens)
+        self.assertEqual({r['status']['description'] for r in results}, {"Wrong Answer"})
+        self.assertEqual(server.requests["POST"], 1)
+
+    def test_parse_verdicts(self):
+        self.assertEqual(parse_verdicts("Accepted=8, Wrong Answer=2"), {"Accepted": 8.0, "Wrong Answer": 2.0})
+
+        with self.assertRaises(ValueError):
+            FakeJudge0Server(verdicts={"Maybe": 1})
+
+
+class FastJsonTest(TestCase):
+
+    def test_renderer_matches_stock(self):
+        payloads = [
+            {"message": "ok", "success": True, "data": {"created_at": timezone.now(), "date": timezone.now().date(), "runtime": Decimal("0.25")}},
+            {"text": "line\u2028separator\u2029é中", "nested": [1, 2.5, None, {"a": []}], 1: "int key"},
+            {"big": 2 ** 70, "duration": timedelta(seconds=3)},
+            [],
+        ]
+
+        for payload in payloads:
+            self.assertEqual(ORJSONRenderer().render(payload), JSONRenderer().render(payload))
+
+        self.assertEqual(ORJSONRenderer().render(None), b'')
+
+        # the one difference: non finite floats become null instead of failing the response
+        self.assertEqual(ORJSONRenderer().render({"a": float('nan'), "b": float('inf')}), b'{"a":null,"b":null}')
+        with self.assertRaises(ValueError):
+            JSONRenderer().render({"a": float('nan')})
+        self.assertEqual(ORJSONRenderer().render({"a": 1}, "application/json; indent=2"), JSONRenderer().render({"a": 1}, "application/json; indent=2"))
+
+    def test_parser_matches_stock(self):
+        body = '{"title": "Two Sum", "tags": ["Array"], "testcases": [{"input": "1 2", "expected": "3"}], "text": "é中"}'.encode()
+
+        self.assertEqual(ORJSONParser().parse(io.BytesIO(body)), JSONParser().parse(io.BytesIO(body)))
+
+        for invalid in (b'{"a": ', b'{"a": NaN}'):
+            with self.assertRaises(ParseError):
+                ORJSONParser().parse(io.BytesIO(invalid))
+
+    def test_api_round_trip(self):
+        user = User.objects.create_user(email="json@example.com", username="json", is_active=True)
+        problem = Problem.objects.create(title="Json", description="a\u2028b", examples=[], reference_solutions={"python": "x"}, user=user)
+        self.client.cookies['access'] = generate_access_token(user)
+
+        response = self.client.get(f'/api/v1/core/problem/{problem.slug}/')
+
+        self.assertIn(b'a\\u2028b', response.content)
+        self.assertEqual(response.json()['data']['description'], "a\u2028b")
+
+
+class LocalExecutorSpoolTest(TestCase):
+
+    """
+        LOCAL_EXECUTOR_DIR only holds tokens somebody may still fetch.
+    """
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        patcher = mock.patch.object(localExecutor, 'LOCAL_EXECUTOR_DIR', self.dir.name)
+        patcher.start()
+        self.executor = localExecutor.LocalExecutor(workers=1)
+
+        self.addCleanup(self.dir.cleanup)
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.executor._pool.shutdown)
+
+    def age(self, token, seconds):
+        path = localExecutor._result_path(token)
+        os.utime(path, (time.time() - seconds, time.time() - seconds))
+
+    def test_results_are_kept_until_released(self):
+        localExecutor._write_result('done', localExecutor.ACCEPTED, stdout="1")
+        localExecutor._write_result('running', localExecutor.PROCESSING)
+        open(localExecutor._cancel_path('done'), 'w').close()
+
+        # a poller that died before storing the result reads it again
+        for _ in range(2):
+            results = self.executor.fetch_batch_results(['done', 'running'])
+            self.assertEqual([r['status']['id'] for r in results], [3, 2])
+
+        self.executor.release(['done'])
+
+        self.assertEqual(os.listdir(self.dir.name), ['running.json'])
+        self.assertEqual(self.executor.fetch_batch_results(['done']), [None])
+
+    def test_sweep_fails_stale_tokens_and_drops_old_files(self):
+        localExecutor._write_result('stale', localExecutor.IN_QUEUE)
+        localExecutor._write_result('queued', localExecutor.IN_QUEUE)
+        localExecutor._write_result('forgotten', localExecutor.ACCEPTED)
+        self.age('stale', localExecutor.LOCAL_STALE_AFTER + 1)
+        self.age('forgotten', localExecutor.LOCAL_SPOOL_RETENTION + 1)
+
+        results = self.executor.fetch_batch_results(['stale', 'queued'])
+
+        self.assertEqual([r['status']['description'] for r in results], ["Internal Error", "In Queue"])
+        self.assertEqual(sorted(os.listdir(self.dir.name)), ['queued.json', 'stale.json'])
+
+    def test_cancelled_tokens_are_removed_by_the_pool(self):
+        localExecutor._write_result('skipped', localExecutor.IN_QUEUE)
+        self.assertEqual(self.executor.cancel(['skipped']), ['skipped'])
+
+        localExecutor._judge_group(71, "print(1)", [('skipped', "", "1")])
+
+        self.assertEqual(os.listdir(self.dir.name), [])
+        self.assertEqual(self.executor.cancel(['skipped']), ['skipped'])
+
+
+class RecordingExecutor(BaseExecutor):
+
+    def __init__(self, fail=False):
+        super().__init__()
+        self.fail = fail
+        self.submitted, self.cancelled = [], []
+
+    def submit_batch(self, submissions, callback=True):
+        if self.fail:
+            raise RuntimeError("Judge0 is down")
+        self.submitted.append(submissions)
+        return [f"token-{len(self.submitted)}-{i}" for i in range(len(submissions))]
+
+    def cancel(self, tokens):
+        self.cancelled.extend(tokens)
+        return tokens
+
+
+class FailFastDispatchTest(TestCase):
+
+    """
+        Fail fast decisions are taken under the submission lock, the executor is only called after commit.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email="wave@example.com", username="wave", is_active=True)
+        cls.language = Language.objects.create(langId=71, name='Python')
+        cls.problem = Problem.objects.create(title="Waves", description="", examples=[], user=cls.user)
+
+    def setUp(self):
+        self.executor = RecordingExecutor()
+        set_executor(self.executor)
+        self.addCleanup(set_executor, None)
+
+        self.submission = Submission.objects.create(user=self.user, problem=self.problem, language=self.language, source_code="", fail_fast=True)
+        self.testcases = SubmissionTestCase.objects.bulk_create([
+            SubmissionTestCase(submission=self.submission, input_data=str(i), expected_output=str(i),
+                               token="first" if i == 0 else None,
+                               status=SubmissionTestCase.Status.ACCEPTED if i == 0 else SubmissionTestCase.Status.IN_QUEUE)
+            for i in range(4)
+        ])
+
+    def refresh(self):
+        with self.captureOnCommitCallbacks() as callbacks, transaction.atomic():
+            refresh_submission_status(Submission.objects.select_for_update().get(id=self.submission.id))
+        return callbacks
+
+    def statuses(self):
+        return list(self.submission.testcases.order_by('id').values_list('status', 'token'))
+
+    def test_wave_is_claimed_then_sent_after_commit(self):
+        callbacks = self.refresh()
+
+        # claimed under the lock, nothing sent, a second refresh does not pick it again
+        self.assertEqual(self.executor.submitted, [])
+        self.assertEqual(self.statuses()[1], (SubmissionTestCase.Status.PROCESSING, None))
+        self.assertEqual(len(self.refresh()), 0)
+
+        callbacks[0]()
+
+        self.assertEqual(len(self.executor.submitted[0]), 1)
+        self.assertEqual(self.statuses()[1], (SubmissionTestCase.Status.IN_QUEUE, "token-1-0"))
+
+    def test_failure_skips_the_claimed_wave(self):
+        callbacks = self.refresh()
+        SubmissionTestCase.objects.filter(id=self.testcases[0].id).update(status="Wrong Answer")
+        self.refresh()
+
+        callbacks[0]()
+
+        # sent before it knew, cancelled once the claim turned out lost
+        self.assertEqual(self.executor.cancelled, ["token-1-0"])
+        self.assertEqual({status for status, _ in self.statuses()[1:]}, {SubmissionTestCase.Status.SKIPPED})
+
+    def test_failed_dispatch_hands_the_wave_back(self):
+        self.executor.fail = True
+        with mock.patch('builtins.print'):
+            self.refresh()[0]()
+
+        self.assertEqual(self.statuses()[1], (SubmissionTestCase.Status.IN_QUEUE, None))
+
+
+class HarnessTest(TestCase):
+
+    """
+        The compile once harness: the zip sent to Judge0, its run script, and the split of its output per testcase.
+    """
+
+    def run_harness(self, language, program, inputs):
+        # runs the harness' run script with bash like Judge0 does, ./main stands in for the compiled program
+        payload = build_harness_submission(language, "", inputs)
+
+        with tempfile.TemporaryDirectory() as workdir:
+            with zipfile.ZipFile(io.BytesIO(base64.b64decode(payload['additional_files']))) as archive:
+                archive.extractall(workdir)
+
+            main = os.path.join(workdir, 'main')
+            with open(main, 'w') as f:
+                f.write(f"#!/bin/bash\n{program}\n")
+            os.chmod(main, 0o755)
+
+            run = subprocess.run(['bash', 'run'], cwd=workdir, capture_output=True, text=True, timeout=30)
+
+        return {"status": {"id": 3, "description": "Accepted"}, "stdout": run.stdout, "compile_output": None, "memory": 2048}
+
+    def test_submission_zip(self):
+        payload = build_harness_submission('C++', "int main() {}", ["1 2", ""])
+
+        with zipfile.ZipFile(io.BytesIO(base64.b64decode(payload['additional_files']))) as archive:
+            self.assertEqual(sorted(archive.namelist()), ['compile', 'main.cpp', 'run', 'tests/1.in', 'tests/2.in'])
+            self.assertEqual(archive.read('tests/1.in'), b"1 2")
+            self.assertIn(HARNESS_LANGUAGES['C++']['compile'], archive.read('compile').decode())
+
+        self.assertEqual(payload['language_id'], 89)
+        self.assertLessEqual(payload['cpu_time_limit'], 15)
+
+    def test_run_script_for_every_language(self):
+        for language in HARNESS_LANGUAGES:
+            if language == 'Java':
+                continue  # its run command is an absolute path to the JVM of the Judge0 image
+
+            with self.subTest(language=language):
+                results = parse_harness_output(
+                    self.run_harness(language, "read a b; echo $((a + b))", ["1 2", "3 4"]),
+                    ["3", "8"],
+                    ["t-1", "t-2"]
+                )
+
+                self.assertEqual([r['status']['description'] for r in results], ["Accepted", "Wrong Answer"])
+                self.assertEqual([r['stdout'] for r in results], ["3\n", "7\n"])
+                self.assertEqual([r['token'] for r in results], ["t-1", "t-2"])
+
+    def test_verdicts(self):
+        stdout = "\n".join([
+            "@@CASE 1 1 1000", base64.b64encode(b"").decode(), base64.b64encode(b"boom").decode(),
+            "@@CASE 2 124 2000000", "", "",
+        ])
+        result = {"status": {"id": 3, "description": "Accepted"}, "stdout": stdout, "compile_output": None, "memory": 1}
+
+        results = parse_harness_output(result, ["1", "2", "3"], ["a", "b", "c"])
+
+        # the third never ran, the harness as a whole ran out of time
+        self.assertEqual([r['status']['description'] for r in results], ["Runtime Error (NZEC)", "Time Limit Exceeded", "Time Limit Exceeded"])
+        self.assertEqual((results[0]['stderr'], results[0]['time']), ("boom", "0.001"))
+        self.assertIsNone(results[2]['stdout'])
+
+    def test_compilation_error(self):
+        result = {"status": {"id": 6, "description": "Compilation Error"}, "stdout": None, "compile_output": "error: x"}
+
+        results = parse_harness_output(result, ["1", "2"], ["a", "b"])
+
+        self.assertEqual([r['status']['id'] for r in results], [6, 6])
+        self.assertEqual({r['compile_output'] for r in results}, {"error: x"})
+
+
+def b64(value):
+    return base64.b64encode(value.encode()).decode()
+
+
+@mock.patch('core.views.judge0Callback.JUDGE0_CALLBACK_SECRET', 's3')
+class Judge0CallbackTest(TestCase):
+
+    """
+        Judge0 callbacks are unauthenticated apart from the secret in the query string, and they write verdicts.
+    """
+
+    url = '/api/v1/core/judge0/callback/'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email="callback@example.com", username="callback", is_active=True)
+        cls.language = Language.objects.create(langId=71, name='Python')
+        cls.problem = Problem.objects.create(title="Callbacks", description="", examples=[], user=cls.user)
+
+    def setUp(self):
+        self.submission = Submission.objects.create(user=self.user, problem=self.problem, language=self.language, source_code="")
+        self.testcases = SubmissionTestCase.objects.bulk_create([
+            SubmissionTestCase(submission=self.submission, input_data=str(i), expected_output=str(i), token=f"tc-{i}")
+            for i in range(2)
+        ])
+
+    def callback(self, payload, secret='s3'):
+        url = f'{self.url}?secret={secret}' if secret is not None else self.url
+        return self.client.put(url, payload, content_type='application/json')
+
+    def accepted(self, token, stdout):
+        return {"token": token, "status": {"id": 3, "description": "Accepted"}, "stdout": b64(stdout),
+                "stderr": None, "compile_output": None, "time": "0.012", "memory": 2048}
+
+    def statuses(self):
+        return list(self.submission.testcases.order_by('id').values_list('status', flat=True))
+
+    def test_wrong_or_missing_secret(self):
+        for secret in ['nope', '', None]:
+            with self.subTest(secret=secret):
+                self.assertEqual(self.callback(self.accepted("tc-0", "0\n"), secret=secret).status_code, 403)
+
+        self.assertEqual(self.statuses(), [SubmissionTestCase.Status.IN_QUEUE] * 2)
+
+    def test_missing_token_or_status(self):
+        payload = self.accepted("tc-0", "0\n")
+
+        for field in ['token', 'status']:
+            with self.subTest(field=field):
+                self.assertEqual(self.callback({k: v for k, v in payload.items() if k != field}).status_code, 400)
+
+        self.assertEqual(self.statuses(), [SubmissionTestCase.Status.IN_QUEUE] * 2)
+
+    def test_unknown_token_writes_nothing(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.callback(self.accepted("stranger", "0\n"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse([q for q in queries.captured_queries if not q['sql'].startswith('SELECT')])
+
+    def test_base64_payload_is_ingested(self):
+        response = self.callback(self.accepted("tc-0", "0\n"))
+
+        self.assertEqual(response.status_code, 200)
+        testcase = SubmissionTestCase.objects.get(token="tc-0")
+        self.assertEqual((testcase.status, testcase.stdout), (SubmissionTestCase.Status.ACCEPTED, "0\n"))
+
+        self.callback({**self.accepted("tc-1", "2\n"), "status": {"id": 4, "description": "Wrong Answer"}})
+        self.submission.refresh_from_db()
+        self.assertEqual(self.submission.status, Submission.Status.FAILED)
+
+    def test_harness_callback(self):
+        Submission.objects.filter(id=self.submission.id).update(judge_token="harness")
+        stdout = "\n".join(["@@CASE 1 0 1000", b64("0\n"), "", "@@CASE 2 0 1000", b64("1\n"), ""])
+
+        response = self.callback(self.accepted("harness", stdout))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.statuses(), [SubmissionTestCase.Status.ACCEPTED] * 2)
+        self.submission.refresh_from_db()
+        self.assertEqual(self.submission.status, Submission.Status.PASSED)
+
+
+class TestCaseStoreTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email="store@example.com", username="store", is_active=True)
+
+    def problem(self, title):
+        return Problem.objects.create(title=title, description="", examples=[], reference_solutions={"python": "x"}, user=self.user)
+
+    def test_blobs_are_shared_and_pruned(self):
+        stress = "9" * 100_000
+        first, second = self.problem("First"), self.problem("Second")
+
+        store_testcases(first, [{"input": stress, "expected": "1"}, {"input": "2", "expected": "2"}])
+        store_testcases(second, [{"input": stress, "expected": "1"}])
+
+        # stress, "1" and "2", stored once each and compressed
+        self.assertEqual(TestCaseBlob.objects.count(), 3)
+        self.assertLess(len(bytes(TestCaseBlob.objects.get(size=100_000).data)), 1000)
+        self.assertEqual(load_testcases(first.id), [{"input": stress, "expected": "1"}, {"input": "2", "expected": "2"}])
+
+        # "2" is only used by the replaced testcases, stress is still used by the second problem
+        store_testcases(first, [{"input": "3", "expected": "3"}])
+        self.assertEqual(set(TestCaseBlob.objects.values_list('size', flat=True)), {100_000, 1})
+        self.assertEqual(load_testcases(second.id), [{"input": stress, "expected": "1"}])
+
+    def test_problem_detail_hides_testcases_and_solutions(self):
+        problem = self.problem("Hidden")
+        store_testcases(problem, [{"input": "secret", "expected": "secret"}])
+        self.client.cookies['access'] = generate_access_token(self.user)
+
+        data = self.client.get(f'/api/v1/core/problem/{problem.slug}/').json()['data']
+
+        self.assertNotIn('reference_solutions', data)
+        self.assertNotIn('testcases', data)
+
+
+class ReferenceCacheTest(TestCase):
+
+    """
+        Reference data served from the two tier versioned cache, never stale after a write.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.python = Language.objects.create(langId=71, name='Python')
+
+    def test_hot_lookups_skip_the_database(self):
+        self.assertEqual(get_language('PYTHON'), self.python)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(get_language('python').langId, 71)
+            self.assertIsNone(get_language('cobol'))
+
+    def test_writes_bump_the_version(self):
+        self.assertEqual([language['name'] for language in all_languages()], ['Python'])
+
+        # another process (the local tier of this one is gone) reads the shared tier, then a write invalidates both
+        languages_cache.clear_local()
+        with self.assertNumQueries(0):
+            all_languages()
+
+        Language.objects.create(langId=62, name='java')
+        self.python.isActive = False
+        self.python.save()
+
+        self.assertEqual(sorted(language['name'] for language in all_languages()), ['Java', 'Python'])
+        self.assertIsNone(get_language('python'))
+        self.assertEqual(get_language('java').langId, 62)
+
+    def test_local_tier_is_bounded(self):
+        cache = VersionedCache('test-lru', local_size=2)
+        for key in 'abc':
+            cache.get(key, lambda: key.upper())
+
+        self.assertEqual([key for _, key in cache._local], ['b', 'c'])
+        self.assertEqual(cache.get('a', lambda: 'reloaded'), 'A')  # still in the shared tier
+
+    def test_version_is_kept_locally(self):
+        cache = VersionedCache('test-version')
+        cache.get('a', lambda: 'A')
+
+        # another process bumps the version, this one sees it once its copy is older than the TTL
+        cache.shared.incr(cache.version_key)
+
+        with override_settings(REFERENCE_CACHE_VERSION_TTL=60):
+            self.assertEqual(cache.get('a', lambda: 'reloaded'), 'A')
+
+        with override_settings(REFERENCE_CACHE_VERSION_TTL=0):
+            self.assertEqual(cache.get('a', lambda: 'reloaded'), 'reloaded')
+
+        # its own bumps right away
+        with override_settings(REFERENCE_CACHE_VERSION_TTL=60):
+            cache.bump()
+            self.assertEqual(cache.get('a', lambda: 'bumped'), 'bumped')
+
+    def test_process_local_backend_needs_a_single_process(self):
+        require_shared_cache(1)
+
+        with self.assertRaises(ImproperlyConfigured):
+            require_shared_cache(2)
+
+        with override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': 'redis://cache:6379'}}):
+            require_shared_cache(4)
+
+
+class ProblemListingTest(TestCase):
+
+    """
+        Listings must cost the same number of queries whatever the page size (tags are prefetched, not fetched per problem).
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email="lister@example.com", username="lister", is_active=True)
+        cls.tags = [Tag.objects.create(name="Array"), Tag.objects.create(name="Graph")]
+
+    def setUp(self):
+        use_shared_cache(self)
+        self.client.cookies['access'] = generate_access_token(self.user)
+        trigram_available()  # checked once per process, keep that query out of the counts
+
+    def add_problems(self, count):
+        for _ in range(count):
+            problem = Problem.objects.create(
+                title=f"Problem {Problem.objects.count()}",
+                description="",
+                examples=[],
+                user=self.user,
+            )
+            problem.tags.set(self.tags)
+
+    def query_count(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_constant_query_count(self):
+        urls = [
+            '/api/v1/core/problem/problemset/?limit=50',
+            '/api/v1/core/problem/tags/array/',
+            '/api/v1/core/problem/problemset/search/?query=Problem',
+        ]
+
+        self.add_problems(2)
+        small = [self.query_count(url) for url in urls]
+
+        self.add_problems(20)
+        large = [self.query_count(url) for url in urls]
+
+        self.assertEqual(small, large)
+        self.assertEqual(large, [3, 3, 3])
+
+        response = self.client.get(urls[0])
+        self.assertEqual(response.json()['data'][0]['tags'], ['array', 'graph'])
+
+    def test_keyset_pagination(self):
+        self.add_problems(6)
+        # ties on created_at are broken by id
+        Problem.objects.filter(id__in=Problem.objects.order_by('id').values('id')[:3]).update(created_at=timezone.now())
+
+        seen, pages, cursor = [], 0, ""
+        while cursor is not None:
+            page = self.client.get('/api/v1/core/problem/problemset/', {"limit": 3, "cursor": cursor}).json()
+            seen += [p['id'] for p in page['data']]
+            pages, cursor = pages + 1, page['next_cursor']
+
+        # 6 problems in pages of 3: the second page is the last one, no empty third page
+        self.assertEqual(pages, 2)
+        self.assertEqual(seen, list(Problem.objects.order_by('-created_at', '-id').values_list('id', flat=True)))
+
+        self.assertFalse(page['has_more'])
+
+        self.assertEqual(len(self.client.get('/api/v1/core/problem/problemset/', {"limit": 500}).json()['data']), 6)
+        self.assertEqual(self.client.get('/api/v1/core/problem/problemset/', {"cursor": "bm9wZQ"}).status_code, 400)
+        # well formed, wrong types
+        for values in ([1, 2], [[], "x"], ["2026-01-01T00:00:00", "x"]):
+            cursor = base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+            self.assertEqual(self.client.get('/api/v1/core/problem/problemset/', {"cursor": cursor}).status_code, 400)
+
+    def test_listing_skips_heavy_columns(self):
+        self.add_problems(1)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get('/api/v1/core/problem/problemset/')
+
+        problem_sql = next(q['sql'] for q in queries if 'FROM "core_problem"' in q['sql'])
+        for field in Problem.HEAVY_FIELDS:
+            self.assertNotIn(f'"core_problem"."{field}"', problem_sql)
+
+        with self.assertRaisesMessage(ImproperlyConfigured, "Problem listing loaded"):
+            GetAllProblemSerializer(Problem.objects.annotate(user_submission_passed=Value(False)), many=True).data
+
+
+class ConditionalGetTest(TestCase):
+
+    """
+        ETag / Last-Modified on the problem page and listings, 304 before the view runs.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email="etag@example.com", username="etag", is_active=True)
+        cls.problem = Problem.objects.create(title="Cached", description="", examples=[], user=cls.user)
+
+    def setUp(self):
+        use_shared_cache(self)
+        self.client.cookies['access'] = generate_access_token(self.user)
+
+    def revalidate(self, url, response):
+        return self.client.get(url, headers={"if-none-match": response['ETag']})
+
+    def test_problem_detail(self):
+        url = f'/api/v1/core/problem/{self.problem.slug}/'
+        first = self.client.get(url)
+        self.assertEqual(first.status_code, 200)
+        self.assertIn('private', first['Cache-Control'])
+        self.assertNotIn('search_vector', first.json()['data'])
+
+        # one indexed lookup, no body
+        with self.assertNumQueries(1):
+            repeat = self.revalidate(url, first)
+        self.assertEqual(repeat.status_code, 304)
+        self.assertEqual(repeat.content, b"")
+
+        self.problem.tags.add(Tag.objects.create(name="Cache"))
+        changed = self.revalidate(url, first)
+        self.assertEqual(changed.status_code, 200)
+        self.assertEqual(changed.json()['data']['tags'], ["Cache"])
+        self.assertNotEqual(changed['ETag'], first['ETag'])
+
+        self.assertEqual(self.client.get('/api/v1/core/problem/missing/', headers={"if-none-match": "*"}).status_code, 404)
+
+    def test_deleted_tag(self):
+        url = f'/api/v1/core/problem/{self.problem.slug}/'
+        tag = Tag.objects.create(name="Doomed")
+        self.problem.tags.add(tag)
+        first = self.client.get(url)
+        self.assertEqual(first.json()['data']['tags'], ["Doomed"])
+
+        # the cascade sends no m2m_changed
+        with self.captureOnCommitCallbacks(execute=True):
+            tag.delete()
+
+        changed = self.revalidate(url, first)
+        self.assertEqual(changed.status_code, 200)
+        self.assertEqual(changed.json()['data']['tags'], [])
+        self.assertFalse(search_problems("doomed").exists())
+
+    def test_listing(self):
+        url = '/api/v1/core/problem/problemset/'
+        first = self.client.get(url)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.revalidate(url, first).status_code, 304)
+
+        # another page, another user or a solved problem is another version
+        self.assertEqual(self.revalidate(url + '?limit=1', first).status_code, 200)
+
+        record_solved(Submission(user=self.user, problem=self.problem, status=Submission.Status.PASSED))
+        solved = self.revalidate(url, first)
+        self.assertEqual(solved.status_code, 200)
+        self.assertTrue(solved.json()['data'][0]['user_submission_passed'])
+
+        Problem.objects.create(title="Newer", description="", examples=[], user=self.user)
+        self.assertEqual(len(self.revalidate(url, solved).json()['data']), 2)
+
+    def test_listing_on_process_local_cache(self):
+        url = '/api/v1/core/problem/problemset/'
+
+        # solved by the judge worker in another process, whose cache bump never reaches this one
+        with mock.patch('core.utils.solved.cache_is_shared', return_value=False):
+            first = self.client.get(url)
+            self.assertEqual(self.revalidate(url, first).status_code, 304)
+            SolvedProblem.objects.create(user=self.user, problem=self.problem)
+            self.assertEqual(self.revalidate(url, first).status_code, 200)
+
+
+class RenderedProblemPageTest(TestCase):
+
+    """
+        Problem page bodies rendered once per version of the problem, rebuilt by a single request on a miss.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email="page@example.com", username="page", role="admin", is_active=True)
+        cls.problem = Problem.objects.create(title="Stampede", description="", examples=[], user=cls.user)
+
+    def setUp(self):
+        self.client.cookies['access'] = generate_access_token(self.user)
+        self.url = f'/api/v1/core/problem/{self.problem.slug}/'
+
+    def test_cached_body_and_invalidation(self):
+        first = self.client.get(self.url)
+
+        # the (id, updated_at) lookup only
+        with self.assertNumQueries(1):
+            repeat = self.client.get(self.url)
+        self.assertEqual(repeat.content, first.content)
+        self.assertEqual(repeat.json()['data']['title'], "Stampede")
+
+        serializer = PatchProblemSerializer(self.problem, data={"tags": ["Stampede"], "hints": ["go first"]}, partial=True)
+        self.assertTrue(serializer.is_valid())
+        serializer.save()
+        self.assertEqual(self.client.get(self.url).json()['data']['tags'], ["Stampede"])
+        self.assertEqual(self.client.get(self.url).json()['data']['hints'], ["go first"])
+
+        self.client.delete(self.url)
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+    def test_one_rebuild_per_miss(self):
+        cache = CoalescingCache('test-stampede', wait=5)
+        builds, results = [], []
+
+        def build():
+            builds.append(1)
+            time.sleep(0.1)
+            return b"body"
+
+        threads = [threading.Thread(target=lambda: results.append(cache.get(1, "v1", build))) for _ in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(builds), 1)
+        self.assertEqual(results, [b"body"] * 20)
+
+        # a new version is a miss, an old one is never served
+        self.assertEqual(cache.get(1, "v2", lambda: b"new"), b"new")
+        self.assertEqual(cache.get(1, "v2", lambda: b"unused"), b"new")
+
+
+class ProblemFilterTest(TestCase):
+
+    """
+        Combined tag / difficulty / solved filters with disjunctive facet counts, see core/utils/problemFilter.py.
+    """
+
+    url = '/api/v1/core/problem/problemset/filter/'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email="filter@example.com", username="filter", is_active=True)
+        array, graph, dp = Tag.objects.create(name="Array"), Tag.objects.create(name="Graph"), Tag.objects.create(name="DP")
+
+        def problem(title, difficulty, *tags):
+            problem = Problem.objects.create(title=title, difficulty=difficulty, description="", examples=[], user=cls.user)
+            problem.tags.set(tags)
+            return problem
+
+        solved = problem("Islands", "Medium", array, graph)
+        problem("Flood Fill", "Easy", array, graph)
+        problem("Knapsack", "Hard", array, dp)
+        problem("Paths", "Medium", graph, dp)
+        problem("Two Sum", "Easy", array)
+        SolvedProblem.objects.create(user=cls.user, problem=solved)
+
+    def setUp(self):
+        use_shared_cache(self)
+        self.client.cookies['access'] = generate_access_token(self.user)
+
+    def get(self, query=""):
+        response = self.client.get(f"{self.url}?{query}")
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_combined_filters(self):
+        titles = lambda query: sorted(p['title'] for p in self.get(query)['data'])
+
+        self.assertEqual(titles("tags=array,graph"), ["Flood Fill", "Islands"])
+        self.assertEqual(titles("tags=array&tags=graph&difficulty=medium"), ["Islands"])
+        self.assertEqual(titles("tags=array&status=unsolved"), ["Flood Fill", "Knapsack", "Two Sum"])
+        self.assertEqual(titles("difficulty=easy,hard&status=solved"), [])
+        self.assertEqual(titles("tags=unknown"), [])
+
+    def test_facet_counts(self):
+        facets = self.get("tags=array&difficulty=easy")['facets']
+
+        # difficulty ignores its own filter, status and tags count the current results
+        self.assertEqual(facets['difficulty'], {"Easy": 2, "Medium": 1, "Hard": 1})
+        self.assertEqual(facets['status'], {"solved": 0, "unsolved": 2})
+        self.assertEqual(facets['tags'], {"array": 2, "graph": 1})
+
+    def test_pagination_and_query_count(self):
+        with CaptureQueriesContext(connection) as queries:
+            first = self.get("tags=array&limit=2")
+
+        # page, tags, solved set, difficulty / status counts, tag counts
+        self.assertEqual(len(queries), 5)
+        self.assertTrue(first['has_more'])
+
+        second = self.get(f"tags=array&limit=2&cursor={first['next_cursor']}")
+        self.assertIsNone(second['facets'])
+        self.assertEqual(len({p['id'] for p in first['data'] + second['data']}), 4)
+
+    def test_bad_input(self):
+        self.assertEqual(self.client.get(f"{self.url}?difficulty=impossible").status_code, 400)
+        self.assertEqual(self.client.get(f"{self.url}?status=maybe").status_code, 400)
+
+
+class ProblemSearchTest(TestCase):
+
+    """
+        Full text search over title, tags and description, ranked and paginated with an opaque cursor.
+    """
+
+    url = '/api/v1/core/problem/problemset/search/'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email="searcher@example.com", username="searcher", is_active=True)
+        cls.graph = Tag.objects.create(name="Graph")
+
+        def problem(title, description=""):
+            return Problem.objects.create(title=title, description=description, examples=[], user=cls.user)
+
+        cls.title_match = problem("Binary Search")
+        cls.description_match = problem("Find Peak", "Use binary search on the slope")
+        cls.tag_match = problem("Course Schedule")
+        cls.tag_match.tags.add(cls.graph)
+        problem("Two Sum")
+
+    def setUp(self):
+        self.client.cookies['access'] = generate_access_token(self.user)
+
+    def search(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def titles(self, **params):
+        return [p['title'] for p in self.search(**params)['data']]
+
+    def test_title_ranks_above_description(self):
+        self.assertEqual(self.titles(query="binary search"), ["Binary Search", "Find Peak"])
+
+    def test_prefix_and_tag_match(self):
+        self.assertEqual(self.titles(query="bin sea"), ["Binary Search", "Find Peak"])
+        self.assertEqual(self.titles(query="graph"), ["Course Schedule"])
+
+        # renaming the tag re-indexes its problems
+        self.graph.name = "Topological"
+        self.graph.save()
+        self.assertEqual(self.titles(query="topo"), ["Course Schedule"])
+        self.assertEqual(self.titles(query="graph"), [])
+
+    def test_cursor_pagination(self):
+        for i in range(5):
+            Problem.objects.create(title=f"Binary Tree {i}", description="", examples=[], user=self.user)
+
+        seen, cursor = [], None
+        while True:
+            page = self.search(query="binary", limit=2, **({"cursor": cursor} if cursor else {}))
+            seen += [p['title'] for p in page['data']]
+            self.assertLessEqual(len(page['data']), 2)
+            if not page['has_more']:
+                self.assertIsNone(page['next_cursor'])
+                break
+            cursor = page['next_cursor']
+
+        self.assertEqual(len(seen), 7)
+        self.assertEqual(len(set(seen)), 7)
+        self.assertEqual(seen[-1], "Find Peak")
+
+    def test_bad_input(self):
+        self.assertEqual(self.search(query="  ")['data'], [])
+        self.assertEqual(self.client.get(self.url, {"query": "binary", "cursor": "nope"}).status_code, 400)
+        for rank in ("high", True, None):
+            cursor = base64.urlsafe_b64encode(json.dumps([rank, 1]).encode()).decode()
+            self.assertEqual(self.client.get(self.url, {"query": "binary", "cursor": cursor}).status_code, 400)
+
+
+class SubmissionJudgingTest(TestCase):
+
+    """
+        Submit -> judge worker -> status against the fake Judge0, with the query count of each request pinned,
+        so a change that adds queries to the hot path fails here (the loadtest command measures the same under load).
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email="judge@example.com", username="judge", is_active=True)
+        Language.objects.create(langId=71, name='Python')
+        cls.problem = Problem.objects.create(
+            title="Echo",
+            description="Echo the input",
+            examples=[],
+            user=cls.user,
+        )
+        store_testcases(cls.problem, [{"input": str(i), "expected": str(i)} for i in range(5)])
+
+    def setUp(self):
+        self.server = FakeJudge0Server(latency=0.01, workers=5).start()
+        self.addCleanup(self.server.stop)
+
+        set_executor(PollingJudge0Client(base_url=self.server.url))
+        self.addCleanup(set_executor, None)
+
+        self.client.cookies['access'] = generate_access_token(self.user)
+
+        # pinned counts are for the hot path, language and problem served by the reference data cache
+        get_language('python'), submission_problem(self.problem.slug)
+
+    def judge(self, submission_id):
+        worker = JudgeWorker()
+        worker.schedule = {}
+        deadline = time.monotonic() + 10
+
+        # a submission is Failed as soon as one testcase fails, wait for the verdicts of the others too
+        while (Submission.objects.get(id=submission_id).status == Submission.Status.PENDING
+               or SubmissionTestCase.objects.filter(submission_id=submission_id, status__in=PENDING_TESTCASE_STATUSES).exists()):
+            self.assertLess(time.monotonic(), deadline, "submission was not judged in time")
+            # next waves and cancels go out after the commit of the verdicts that triggered them
+            with self.captureOnCommitCallbacks(execute=True):
+                worker.sweep(100)
+            time.sleep(0.05)
+
+    def submit(self, **data):
+        with self.assertNumQueries(4):
+            response = self.client.post(
+                '/api/v1/core/problem/submit/',
+                {"problem": self.problem.slug, "language": "python", "source_code": "print(input())", **data},
+                content_type='application/json'
+            )
+
+        self.assertEqual(response.status_code, 201)
+        return response.json()['submission_id']
+
+    def test_submit_and_status(self):
+        submission_id = self.submit()
+        self.judge(submission_id)
+
+        with self.assertNumQueries(2):
+            response = self.client.get(f'/api/v1/core/problem/submit/{submission_id}/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['status'], Submission.Status.PASSED)
+        self.assertEqual(
+            [tc['status'] for tc in response.json()['testcases']],
+            [SubmissionTestCase.Status.ACCEPTED] * 5
+        )
+
+        submission = Submission.objects.get(id=submission_id)
+        self.assertEqual((submission.passed_count, submission.total_count), (5, 5))
+        self.assertEqual((submission.max_time, submission.max_memory), (0.01, 1024))
+
+        problemset = self.client.get('/api/v1/core/problem/problemset/').json()['data']
+        self.assertEqual([p['user_submission_passed'] for p in problemset], [True])
+
+        with self.assertNumQueries(2):
+            response = self.client.get(f'/api/v1/core/problem/{self.problem.slug}/submissions/')
+
+        self.assertEqual(
+            response.json()['data'],
+            [{"id": submission_id, "problem": "Echo", "status": "Passed", "created_at": response.json()['data'][0]['created_at'],
+              "runtime": 0.01, "memory": 1024, "language": "Python", "slug": "echo"}]
+        )
+
+    def test_dispatch_starts_the_grace_period(self):
+        # the judge worker's callback grace period runs from when the token was saved, not from row creation
+        submission = Submission.objects.create(user=self.user, problem=self.problem, language=get_language('python'), source_code="print(input())")
+        testcase = SubmissionTestCase.objects.create(submission=submission, input_data="1", expected_output="1")
+        SubmissionTestCase.objects.filter(id=testcase.id).update(updated_at=timezone.now() - timedelta(minutes=5))
+        testcase.refresh_from_db()
+
+        dispatch_testcases(submission, [testcase])
+
+        stored = SubmissionTestCase.objects.get(id=testcase.id)
+        self.assertIsNotNone(stored.token)
+        self.assertGreater(stored.updated_at, timezone.now() - timedelta(seconds=5))
+
+    def test_fail_fast_skips_after_failure(self):
+        self.server.verdicts = {"Wrong Answer": 1}
+
+        submission_id = self.submit(fail_fast=True)
+        self.judge(submission_id)
+
+        statuses = list(SubmissionTestCase.objects.filter(submission_id=submission_id).order_by('id').values_list('status', flat=True))
+        self.assertEqual(Submission.objects.get(id=submission_id).status, Submission.Status.FAILED)
+        self.assertEqual(statuses[0], "Wrong Answer")
+        self.assertEqual(set(statuses[1:]), {SubmissionTestCase.Status.SKIPPED})
+
+    def test_submission_detail(self):
+        self.server.verdicts = {"Accepted": 1, "Wrong Answer": 1}
+        self.server.random.seed(1)
+
+        submission_id = self.submit()
+        self.judge(submission_id)
+        submission = Submission.objects.get(id=submission_id)
+
+        with self.assertNumQueries(2):
+            response = self.client.get(f'/api/v1/core/problem/{self.problem.slug}/submissions/{submission_id}/')
+
+        data = response.json()
+        self.assertEqual(data['data']['language'], 'Python')
+        self.assertEqual(data['totalTestCases'], 5)
+        self.assertEqual(data['totalPassedTestCases'], submission.passed_count)
+        self.assertEqual(len(data['failedTestCases']), 5 - submission.passed_count)
+        self.assertEqual({tc['status'] for tc in data['failedTestCases']}, {"Wrong Answer"})
+
+        # someone else's submission, or the right submission under another problem
+        other = User.objects.create_user(email="other@example.com", username="other", is_active=True)
+        self.client.cookies['access'] = generate_access_token(other)
+        self.assertEqual(self.client.get(f'/api/v1/core/problem/{self.problem.slug}/submissions/{submission_id}/').status_code, 404)
+
+        self.client.cookies['access'] = generate_access_token(self.user)
+        self.assertEqual(self.client.get(f'/api/v1/core/problem/other-problem/submissions/{submission_id}/').status_code, 404)
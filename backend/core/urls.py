@@ -2,13 +2,18 @@ from django.urls import path
 from core.views.createProblem import CreateProblemView
 from core.views.problem import ProblemView
 from core.views.submission import SubmitProblemView, SubmitProblemStatusView
-from core.views.getAllProblem import GetAllProblemView, GetUserProblemSubmissionsView, GetUserProblemSubmissionDetailView, GetTagProblemsView, GetAllLanguages, GetSearchResultView
+from core.views.submissionStream import SubmissionStreamView
+from core.views.judge0Callback import Judge0CallbackView
+from core.views.getAllProblem import GetAllProblemView, GetUserProblemSubmissionsView, GetUserProblemSubmissionDetailView, GetTagProblemsView, GetAllLanguages, GetSearchResultView, GetFilteredProblemsView
 
 urlpatterns = [
     path('problem/create-problem/', CreateProblemView.as_view(), name='create-problem'),
     path('problem/problemset/', GetAllProblemView.as_view(), name='problemset'),
+    path('problem/problemset/filter/', GetFilteredProblemsView.as_view(), name='problemset-filter'),
     path('problem/submit/', SubmitProblemView.as_view(), name='submit'),
     path('problem/submit/<int:id>/', SubmitProblemStatusView.as_view(), name='submit-status'),
+    path('problem/submit/<int:id>/stream/', SubmissionStreamView.as_view(), name='submit-stream'),
+    path('judge0/callback/', Judge0CallbackView.as_view(), name='judge0-callback'),
     path('problem/tags/', GetTagProblemsView.as_view(), name='tags'),
     path('problem/tags/<slug:slug>/', GetTagProblemsView.as_view(), name='tags'),
     path('problem/languages/', GetAllLanguages.as_view(), name='language'),
@@ -0,0 +1,100 @@
+import hashlib
+from functools import wraps
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+from core.models import Problem
+from core.utils.referenceCache import problems_cache, tags_cache
+from core.utils.solved import solved_version
+
+
+"""
+    HTTP conditional GET (ETag / Last-Modified) for problem pages and listings.
+
+    The validators are computed before the view runs, from data much cheaper than the response:
+        - a problem: one indexed lookup of (id, updated_at) by slug
+        - a listing: the versions of the problems and tags namespaces of the reference data cache
+          (core/utils/referenceCache.py) and of the user's solved set, no query at all
+    A client sending back a matching If-None-Match / If-Modified-Since gets a 304 without the view running,
+    nothing is read or serialized.
+
+    Responses are private (they depend on the logged-in user) and must be revalidated before reuse (no-cache),
+    so the browser keeps the body and asks with If-None-Match every time.
+"""
+
+
+def conditional_get(etag_func, last_modified_func=None):
+    def decorator(method):
+
+        @wraps(method)
+        def wrapper(view, request, *args, **kwargs):
+            etag = etag_func(request, *args, **kwargs)
+            etag = quote_etag(etag) if etag else None
+
+            last_modified = last_modified_func(request, *args, **kwargs) if last_modified_func else None
+            last_modified = int(last_modified.timestamp()) if last_modified else None
+
+            response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+
+            if response is None:
+                response = method(view, request, *args, **kwargs)
+
+                # errors are never validated, a later If-None-Match must not turn them into a 304
+                if response.status_code != 200:
+                    return response
+
+            if etag:
+                response.headers.setdefault('ETag', etag)
+            if last_modified:
+                response.headers.setdefault('Last-Modified', http_date(last_modified))
+
+            patch_cache_control(response, private=True, no_cache=True)
+            patch_vary_headers(response, ['Cookie', 'Authorization'])
+
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def _digest(*parts):
+    return hashlib.sha256("|".join(str(part) for part in parts).encode()).hexdigest()[:32]
+
+
+"""
+    Validators of ProblemView.get.
+    updated_at moves on every save of the problem and when its tags change (core/signals.py).
+    The (id, updated_at) row is read once per request and kept on it for both validators (and the view).
+"""
+
+def problem_row(request, slug):
+    if not hasattr(request, '_problem_validators'):
+        request._problem_validators = Problem.objects.filter(slug=slug).values_list('id', 'updated_at').first()
+    return request._problem_validators
+
+
+def problem_etag(request, slug):
+    row = problem_row(request, slug)
+    return _digest('problem', *row) if row else None
+
+
+def problem_last_modified(request, slug):
+    row = problem_row(request, slug)
+    return row[1] if row else None
+
+
+"""
+    Validator of the problem listings (problemset, filter, tags, search).
+    A page depends on the query string, the problems and their tags, and on which of them the user solved.
+"""
+
+def listing_etag(request, *args, **kwargs):
+    return _digest(
+        'listing',
+        request.path,
+        sorted(request.GET.lists()),
+        problems_cache.version(),
+        tags_cache.version(),
+        request.user.pk,
+        solved_version(request.user),
+    )
@@ -0,0 +1,176 @@
+import time
+import threading
+from decouple import config
+
+
+"""
+    Execution backends.
+
+    Everything that runs user code goes through an executor picked by JUDGE_EXECUTOR:
+        judge0 - core.utils.judge0.Judge0Client, a Judge0 server / cluster (default)
+        local  - core.utils.localExecutor.LocalExecutor, resource limited subprocesses on this machine,
+                 for small deployments, CI and load tests without a Judge0 cluster
+
+    Every executor speaks Judge0's vocabulary, so the rest of the code doesn't care which one is running:
+        submit_batch(submissions)   - list of {language_id, source_code, stdin, expected_output}, returns one token each
+        fetch_batch_results(tokens) - current state of each token, same shape as Judge0's GET /submissions/batch
+                                      (None for unknown tokens)
+        cancel(tokens)              - stop tokens that have not started yet, returns the tokens that were cancelled
+        release(tokens)             - the final results of tokens are stored, the executor may forget them
+"""
+
+JUDGE_EXECUTOR = config('JUDGE_EXECUTOR', default='judge0')
+
+TIMEOUT = 120  # seconds
+POLL_MIN_DELAY = 0.25  # seconds
+POLL_MAX_DELAY = 5  # seconds
+LATENCY_SMOOTHING = 0.2  # weight of the newest sample in queue_latency
+
+# 1 - In Queue, 2 - Processing
+PENDING_STATUS_IDS = [1, 2]
+
+
+class BaseExecutor:
+
+    """
+        Base class of the execution backends.
+        Subclasses implement submit_batch, fetch_batch_results and cancel, polling is shared.
+    """
+
+    batch_size = 20  # how many testcases are worth sending in one go
+
+    def __init__(self):
+        self.queue_latency = 1.0  # seconds, see observe_latency
+        self._latency_lock = threading.Lock()
+
+
+    def submit_batch(self, submissions, callback=True):
+        raise NotImplementedError
+
+
+    def fetch_batch_results(self, tokens):
+        raise NotImplementedError
+
+
+    def cancel(self, tokens):
+        raise NotImplementedError
+
+
+    def release(self, tokens):
+        # Judge0 keeps results on its side, executors that hold them for us (the local one) override this
+        pass
+
+
+    def uses_callbacks(self):
+        # True when results are pushed to Judge0CallbackView and polling is only a fallback
+        return False
+
+
+    """
+        Queue latency bookkeeping.
+        queue_latency is a moving average of how long tokens take from submission until they are finished.
+        The first poll for new tokens waits about half of it, so on an idle backend we ask again quickly
+        and on a busy one we don't spend requests on tokens that can't be done yet.
+    """
+
+    def observe_latency(self, seconds):
+        with self._latency_lock:
+            self.queue_latency += LATENCY_SMOOTHING * (seconds - self.queue_latency)
+
+
+    def initial_poll_delay(self):
+        return min(POLL_MAX_DELAY, max(POLL_MIN_DELAY, self.queue_latency / 2))
+
+
+    def next_poll_delay(self, delay, progressed=False):
+        # tokens are finishing, keep the pace, otherwise back off exponentially up to POLL_MAX_DELAY
+        if progressed:
+            return delay
+        return min(POLL_MAX_DELAY, delay * 2)
+
+
+    """
+        In iter_batch_results function, we poll for the given tokens and yield every result as soon as it is final.
+        Finished tokens are dropped from the following requests, so each poll only asks for what is still running.
+        The wait between polls follows initial_poll_delay / next_poll_delay.
+        If the polling exceeds the TIMEOUT, we raise a TimeoutError.
+    """
+
+    def iter_batch_results(self, tokens):
+        pending = list(dict.fromkeys(tokens))
+        start_time = time.time()
+        delay = self.initial_poll_delay()
+
+        while pending:
+            if time.time() - start_time > TIMEOUT:
+                raise TimeoutError("Judge0 batch polling timed out")
+
+            time.sleep(delay)
+
+            try:
+                submissions = self.fetch_batch_results(pending)
+            except RuntimeError as e:
+                print(f"Error fetching results: {e}")
+                delay = self.next_poll_delay(delay)
+                continue
+
+            finished = [sub for sub in submissions if sub and sub['status']['id'] not in PENDING_STATUS_IDS]
+
+            for sub in finished:
+                self.observe_latency(time.time() - start_time)
+                yield sub
+
+            finished_tokens = {sub['token'] for sub in finished}
+            pending = [token for token in pending if token not in finished_tokens]
+            delay = self.next_poll_delay(delay, progressed=bool(finished))
+
+
+    """
+        In poll_batch_results function, we wait until every token is finished and return the results in the same order as tokens.
+    """
+
+    def poll_batch_results(self, tokens):
+        results = {sub['token']: sub for sub in self.iter_batch_results(tokens)}
+        # the caller gets them in memory, nothing else will ask for these tokens
+        self.release(tokens)
+        return [results[token] for token in tokens]
+
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+"""
+    Returns the process wide executor selected by JUDGE_EXECUTOR, creating it on first use.
+    All views and the judge worker go through this so they share one connection / process pool.
+"""
+
+def get_executor():
+    global _executor
+
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                if JUDGE_EXECUTOR == 'local':
+                    from core.utils.localExecutor import LocalExecutor
+                    _executor = LocalExecutor()
+                elif JUDGE_EXECUTOR == 'judge0':
+                    from core.utils.judge0 import get_judge0_client
+                    _executor = get_judge0_client()
+                else:
+                    raise ValueError(f"Unknown JUDGE_EXECUTOR {JUDGE_EXECUTOR}")
+
+    return _executor
+
+
+"""
+    Replaces the process wide executor, used by tests and the loadtest command to judge against a fake Judge0.
+    Passing None makes the next get_executor() call build the configured one again.
+"""
+
+def set_executor(executor):
+    global _executor
+
+    with _executor_lock:
+        _executor = executor
@@ -0,0 +1,240 @@
+import json
+import time
+import uuid
+import queue
+import base64
+import random
+import threading
+import requests
+from urllib.parse import urlparse, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+
+"""
+    Offline stand-in for a Judge0 server, for tests and load tests (see the fakejudge0 and loadtest commands).
+
+    It speaks the part of the Judge0 API Judge0Client uses:
+        POST /submissions/batch          - queue submissions, returns [{"token"}, ...]
+        GET  /submissions/batch?tokens=  - {"submissions": [...]} with the current state of every token
+        GET  /submissions/<token>        - the current state of one token
+    and sends a PUT to callback_url like Judge0 does when a submission carries one.
+
+    Nothing is executed. A pool of `workers` threads takes submissions off a FIFO queue
+    (In Queue -> Processing), holds each one for `latency` seconds (+/- `jitter`)
+    and gives it a verdict drawn from `verdicts`, a {status description: weight} dict.
+    Accepted submissions echo expected_output as stdout, so they look like a real run.
+    With few workers and many submissions the queue grows, like a busy Judge0 does.
+"""
+
+STATUSES = {
+    "In Queue": 1,
+    "Processing": 2,
+    "Accepted": 3,
+    "Wrong Answer": 4,
+    "Time Limit Exceeded": 5,
+    "Compilation Error": 6,
+    "Runtime Error (SIGSEGV)": 7,
+    "Runtime Error (NZEC)": 11,
+    "Internal Error": 13,
+}
+
+
+class FakeJudge0Server:
+
+    def __init__(self, host='127.0.0.1', port=0, latency=0.1, jitter=0.0, workers=4, verdicts=None, seed=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.verdicts = verdicts or {"Accepted": 1}
+        self.random = random.Random(seed)
+
+        for description in self.verdicts:
+            if description not in STATUSES:
+                raise ValueError(f"Unknown Judge0 status {description}")
+
+        self.submissions = {}  # token -> Judge0 shaped result
+        self.requests = {"POST": 0, "GET": 0, "callbacks": 0}
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._stopped = threading.Event()
+
+        self.httpd = ThreadingHTTPServer((host, port), self._handler())
+        self.httpd.daemon_threads = True
+        self._threads = [threading.Thread(target=self.httpd.serve_forever, daemon=True)]
+        self._threads += [threading.Thread(target=self._work, daemon=True) for _ in range(workers)]
+
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+    def start(self):
+        for thread in self._threads:
+            thread.start()
+        return self
+
+
+    def stop(self):
+        self._stopped.set()
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+    def __enter__(self):
+        return self.start()
+
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+    def submit(self, submissions):
+        tokens = []
+
+        for sub in submissions:
+            token = str(uuid.uuid4())
+            with self._lock:
+                self.submissions[token] = {
+                    "token": token,
+                    "status": {"id": STATUSES["In Queue"], "description": "In Queue"},
+                    "stdout": None,
+                    "stderr": None,
+                    "compile_output": None,
+                    "message": None,
+                    "time": None,
+                    "memory": None,
+                }
+            self._queue.put((token, sub))
+            tokens.append({"token": token})
+
+        return tokens
+
+
+    def get(self, token):
+        with self._lock:
+            result = self.submissions.get(token)
+            return dict(result) if result else None
+
+
+    def _set(self, token, **fields):
+        with self._lock:
+            self.submissions[token].update(fields)
+            return dict(self.submissions[token])
+
+
+    def _work(self):
+        while not self._stopped.is_set():
+            try:
+                token, sub = self._queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+
+            self._set(token, status={"id": STATUSES["Processing"], "description": "Processing"})
+            time.sleep(max(0, self.latency + self.random.uniform(-self.jitter, self.jitter)))
+
+            description = self.random.choices(list(self.verdicts), weights=list(self.verdicts.values()))[0]
+            fields = {
+                "status": {"id": STATUSES[description], "description": description},
+                "time": f"{self.latency:.3f}",
+                "memory": 1024,
+            }
+            if description == "Accepted":
+                fields["stdout"] = sub.get('expected_output')
+            elif description == "Compilation Error":
+                fields["compile_output"] = "main: error"
+            elif description.startswith("Runtime Error"):
+                fields["stderr"] = "Segmentation fault"
+
+            result = self._set(token, **fields)
+
+            if sub.get('callback_url'):
+                self._callback(sub['callback_url'], result)
+
+
+    def _callback(self, url, result):
+        # Judge0 always base64 encodes callbacks
+        payload = dict(result)
+        for field in ['stdout', 'stderr', 'compile_output', 'message']:
+            if payload.get(field):
+                payload[field] = base64.b64encode(payload[field].encode()).decode()
+
+        try:
+            requests.put(url, json=payload, timeout=5)
+            with self._lock:
+                self.requests["callbacks"] += 1
+        except requests.RequestException:
+            pass  # Judge0 gives up on failed callbacks too
+
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, like Judge0 behind a proxy
+
+            def log_message(self, *args):
+                pass
+
+            def send_json(self, code, data):
+                body = json.dumps(data).encode()
+                self.send_response(code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                path = urlparse(self.path).path.rstrip('/')
+                length = int(self.headers.get('Content-Length') or 0)
+
+                with server._lock:
+                    server.requests["POST"] += 1
+
+                if path != '/submissions/batch':
+                    return self.send_json(404, {"error": "Not found"})
+
+                try:
+                    submissions = json.loads(self.rfile.read(length))['submissions']
+                except (ValueError, KeyError):
+                    return self.send_json(422, {"error": "submissions is required"})
+
+                self.send_json(201, server.submit(submissions))
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                path = url.path.rstrip('/')
+
+                with server._lock:
+                    server.requests["GET"] += 1
+
+                if path == '/submissions/batch':
+                    tokens = parse_qs(url.query).get('tokens', [''])[0].split(',')
+                    return self.send_json(200, {"submissions": [server.get(token) for token in tokens]})
+
+                if path.startswith('/submissions/'):
+                    result = server.get(path.rsplit('/', 1)[1])
+                    if result is None:
+                        return self.send_json(404, {"error": "Not found"})
+                    return self.send_json(200, result)
+
+                self.send_json(404, {"error": "Not found"})
+
+        return Handler
+
+
+
+"""
+    Parses a verdict distribution like "Accepted=8,Wrong Answer=2" into {"Accepted": 8.0, "Wrong Answer": 2.0}.
+"""
+
+def parse_verdicts(value):
+    verdicts = {}
+
+    for part in value.split(','):
+        if not part.strip():
+            continue
+        description, _, weight = part.partition('=')
+        verdicts[description.strip()] = float(weight) if weight else 1.0
+
+    return verdicts
@@ -0,0 +1,77 @@
+from rest_framework import renderers, parsers
+from rest_framework.utils import encoders
+from rest_framework.exceptions import ParseError
+
+try:
+    import orjson
+except ImportError:  # optional, the stock DRF classes are used without it
+    orjson = None
+
+
+"""
+    orjson based JSON renderer and parser for DRF (settings.REST_FRAMEWORK), in place of
+    rest_framework.renderers.JSONRenderer / rest_framework.parsers.JSONParser.
+
+    orjson builds the UTF-8 bytes directly in Rust instead of str chunks joined and encoded by json.dumps,
+    see the benchjson command for numbers on problem payloads.
+
+    The output is the one JSONRenderer produces (compact, unicode, datetimes through DRF's encoder,
+    U+2028 / U+2029 escaped). Whatever orjson can not do the same way is handed to the stock class:
+        - orjson is not installed
+        - an indented response (?format / Accept "application/json; indent=4")
+        - UNICODE_JSON / COMPACT_JSON / STRICT_JSON turned off
+        - a payload orjson refuses (an int over 64 bits ...)
+        - a request body in another charset than UTF-8
+
+    One difference is kept on purpose: a NaN / Infinity float is rendered as null, where the stock renderer
+    (STRICT_JSON) raises ValueError and the request fails with a 500. Spotting them beforehand would mean
+    walking every payload in Python, which costs most of what orjson saves.
+"""
+
+# datetimes / dates / times go to DRF's encoder like with the stock renderer (milliseconds, "Z" for UTC)
+ORJSON_OPTIONS = (orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS) if orjson else 0
+
+_encoder = encoders.JSONEncoder()
+
+
+class ORJSONRenderer(renderers.JSONRenderer):
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or not (self.ensure_ascii is False and self.compact):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        if data is None:
+            return b''
+
+        renderer_context = renderer_context or {}
+        if self.get_indent(accepted_media_type or '', renderer_context):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=_encoder.default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # same as JSONRenderer: valid JSON but not valid JavaScript
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+
+        return ret
+
+
+class ORJSONParser(parsers.JSONParser):
+
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', 'utf-8')
+
+        if orjson is None or not self.strict or encoding.lower().replace('_', '-') not in ('utf-8', 'utf8'):
+            return super().parse(stream, media_type, parser_context)
+
+        try:
+            # NaN / Infinity are rejected like with STRICT_JSON
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
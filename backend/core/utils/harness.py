@@ -0,0 +1,179 @@
+import io
+import base64
+import zipfile
+from decouple import config
+from core.utils.executor import JUDGE_EXECUTOR
+
+
+"""
+    Compile once, run many.
+
+    A normal submission sends every testcase to Judge0 with the full source code, so a compiled
+    language is compiled once per testcase. The harness instead builds a single Judge0
+    "Multi-file program" submission whose zip holds:
+        - the user's source file
+        - every testcase input as tests/<n>.in
+        - a compile script, run once by Judge0
+        - a run script that runs the compiled program against every input in turn
+
+    The run script prints one block per testcase:
+        @@CASE <n> <exit code> <elapsed microseconds>
+        <stdout, base64>
+        <stderr, base64>
+    parse_harness_output turns those blocks back into one Judge0-shaped result per testcase,
+    so the rest of the judging code doesn't need to know the harness exists.
+
+    Compiler paths follow the official Judge0 image.
+"""
+
+JUDGE0_COMPILE_ONCE = config('JUDGE0_COMPILE_ONCE', default=False, cast=bool)
+HARNESS_TIME_LIMIT = config('HARNESS_TIME_LIMIT', default=2, cast=float)  # seconds per testcase
+HARNESS_MAX_CPU_TIME_LIMIT = config('HARNESS_MAX_CPU_TIME_LIMIT', default=15, cast=float)  # Judge0 MAX_CPU_TIME_LIMIT
+HARNESS_MAX_WALL_TIME_LIMIT = config('HARNESS_MAX_WALL_TIME_LIMIT', default=20, cast=float)  # Judge0 MAX_WALL_TIME_LIMIT
+
+MULTI_FILE_LANGUAGE_ID = 89
+
+HARNESS_LANGUAGES = {
+    'C': {
+        'source': 'main.c',
+        'compile': '/usr/local/gcc-9.2.0/bin/gcc -O2 main.c -o main -lm',
+        'run': './main',
+    },
+    'C++': {
+        'source': 'main.cpp',
+        'compile': '/usr/local/gcc-9.2.0/bin/g++ -O2 -std=c++17 main.cpp -o main',
+        # through env, timeout(1) would take a leading VAR=value for the program to run
+        'run': 'env LD_LIBRARY_PATH=/usr/local/gcc-9.2.0/lib64 ./main',
+    },
+    'Java': {
+        'source': 'Main.java',
+        'compile': '/usr/local/openjdk13/bin/javac Main.java',
+        'run': '/usr/local/openjdk13/bin/java Main',
+    },
+}
+
+CASE_MARKER = '@@CASE'
+
+# Judge0 status ids / descriptions used for the per testcase verdicts
+ACCEPTED = {"id": 3, "description": "Accepted"}
+WRONG_ANSWER = {"id": 4, "description": "Wrong Answer"}
+TIME_LIMIT_EXCEEDED = {"id": 5, "description": "Time Limit Exceeded"}
+RUNTIME_ERROR = {"id": 11, "description": "Runtime Error (NZEC)"}
+COMPILATION_ERROR_ID = 6
+
+
+def harness_supported(language_name, testcase_count):
+    # the local executor compiles once on its own
+    return JUDGE0_COMPILE_ONCE and JUDGE_EXECUTOR == 'judge0' and language_name in HARNESS_LANGUAGES and testcase_count > 1
+
+
+def _run_script(command, testcase_count):
+    return f"""#!/bin/bash
+for i in $(seq 1 {testcase_count}); do
+    start=$(date +%s%N)
+    timeout {HARNESS_TIME_LIMIT} {command} < tests/$i.in > out.txt 2> err.txt
+    code=$?
+    end=$(date +%s%N)
+    echo "{CASE_MARKER} $i $code $(( (end - start) / 1000 ))"
+    base64 -w0 out.txt; echo
+    base64 -w0 err.txt; echo
+done
+"""
+
+
+"""
+    In build_harness_submission function, we build the single Judge0 submission that judges all testcases.
+    testcases is a list of input strings, in testcase order.
+"""
+
+def build_harness_submission(language_name, source_code, testcases):
+    language = HARNESS_LANGUAGES[language_name]
+
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr(language['source'], source_code)
+        archive.writestr('compile', f"#!/bin/bash\n{language['compile']}\n")
+        archive.writestr('run', _run_script(language['run'], len(testcases)))
+
+        for index, stdin in enumerate(testcases, start=1):
+            archive.writestr(f"tests/{index}.in", stdin or "")
+
+    total_time = HARNESS_TIME_LIMIT * len(testcases)
+
+    return {
+        "language_id": MULTI_FILE_LANGUAGE_ID,
+        "additional_files": base64.b64encode(buffer.getvalue()).decode(),
+        "cpu_time_limit": min(HARNESS_MAX_CPU_TIME_LIMIT, total_time),
+        "wall_time_limit": min(HARNESS_MAX_WALL_TIME_LIMIT, total_time * 1.5 + 1),
+    }
+
+
+def _decode(value):
+    return base64.b64decode(value).decode('utf-8', errors='replace') if value else ""
+
+
+"""
+    In parse_harness_output function, we split the result of a harness submission into one result per testcase.
+    expected is the list of expected outputs in testcase order, tokens the SubmissionTestCase token of each testcase.
+    Every returned dict has the same keys as a Judge0 batch result.
+"""
+
+def parse_harness_output(result, expected, tokens):
+    if result['status']['id'] == COMPILATION_ERROR_ID:
+        return [
+            {
+                "token": token,
+                "status": result['status'],
+                "compile_output": result.get('compile_output'),
+                "stdout": None,
+                "stderr": None,
+                "time": None,
+                "memory": None,
+            }
+            for token in tokens
+        ]
+
+    cases = {}
+    lines = (result.get('stdout') or "").split("\n")
+
+    for i, line in enumerate(lines):
+        if not line.startswith(CASE_MARKER + " "):
+            continue
+
+        _, index, code, micros = line.split()
+        cases[int(index)] = {
+            "code": int(code),
+            "time": f"{int(micros) / 1_000_000:.3f}",
+            "stdout": _decode(lines[i + 1] if i + 1 < len(lines) else ""),
+            "stderr": _decode(lines[i + 2] if i + 2 < len(lines) else ""),
+        }
+
+    results = []
+    for index, (token, expected_output) in enumerate(zip(tokens, expected), start=1):
+        case = cases.get(index)
+
+        if case is None:
+            # the run script never got here, the harness as a whole ran out of time
+            status = TIME_LIMIT_EXCEEDED
+        elif case['code'] == 124:  # exit code of timeout(1)
+            status = TIME_LIMIT_EXCEEDED
+        elif case['code'] != 0:
+            status = RUNTIME_ERROR
+        elif case['stdout'].strip() == (expected_output or "").strip():
+            status = ACCEPTED
+        else:
+            status = WRONG_ANSWER
+
+        results.append(
+            {
+                "token": token,
+                "status": status,
+                "compile_output": result.get('compile_output'),
+                "stdout": case['stdout'] if case else None,
+                "stderr": case['stderr'] if case else None,
+                "time": case['time'] if case else None,
+                "memory": result.get('memory'),
+            }
+        )
+
+    return results
@@ -1,76 +1,236 @@
 import time
+import base64
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import requests
-from decouple import config 
+from urllib.parse import urlencode
+from requests.adapters import HTTPAdapter
+from decouple import config
+from core.utils.executor import BaseExecutor
 
 
 JUDGE0_URL = config('JUDGE0_URL')
 HEADERS = {"content-type": "application/json"}
-TIMEOUT = 120  # seconds
-RETRY_INTERVAL = 3  # seconds
+
+JUDGE0_POOL_SIZE = config('JUDGE0_POOL_SIZE', default=10, cast=int)  # keep-alive connections kept open
+JUDGE0_MAX_IN_FLIGHT = config('JUDGE0_MAX_IN_FLIGHT', default=10, cast=int)  # concurrent requests per process
+JUDGE0_CONNECT_TIMEOUT = config('JUDGE0_CONNECT_TIMEOUT', default=3.05, cast=float)  # seconds
+JUDGE0_READ_TIMEOUT = config('JUDGE0_READ_TIMEOUT', default=10, cast=float)  # seconds
+JUDGE0_MAX_RETRIES = config('JUDGE0_MAX_RETRIES', default=3, cast=int)
+JUDGE0_BATCH_SIZE = config('JUDGE0_BATCH_SIZE', default=20, cast=int)  # Judge0's MAX_SUBMISSION_BATCH_SIZE
+JUDGE0_CALLBACK_URL = config('JUDGE0_CALLBACK_URL', default='')  # public URL of Judge0CallbackView
+JUDGE0_CALLBACK_SECRET = config('JUDGE0_CALLBACK_SECRET', default='')
+JUDGE0_BACKOFF_BASE = 0.25  # seconds
+JUDGE0_BACKOFF_CAP = 4  # seconds
+# Judge0 (or the proxy in front of it) is overloaded or restarting, worth trying again
+RETRYABLE_STATUS_CODES = [429, 502, 503, 504]
+
+
+class Judge0Client(BaseExecutor):
+
+    """
+        Reusable client for the Judge0 API, the default execution backend (see core/utils/executor.py).
+
+        - One requests.Session with a pooled HTTPAdapter, so connections to JUDGE0_URL are kept alive
+          and reused instead of paying a new TCP/TLS handshake on every call.
+        - Every call has a (connect, read) timeout, a hung Judge0 can no longer hang the caller forever.
+        - A semaphore bounds how many requests this process has in flight at once.
+        - Failed calls are retried with capped exponential backoff and full jitter, so many workers
+          retrying at the same time do not hit Judge0 in lockstep.
+        - Batches bigger than Judge0's batch size limit are split into chunks that are sent concurrently,
+          results always come back in the same order as the input.
+
+        Use get_judge0_client() instead of creating instances, so the whole process shares one pool.
+    """
+
+    def __init__(
+        self,
+        base_url=JUDGE0_URL,
+        pool_size=JUDGE0_POOL_SIZE,
+        max_in_flight=JUDGE0_MAX_IN_FLIGHT,
+        connect_timeout=JUDGE0_CONNECT_TIMEOUT,
+        read_timeout=JUDGE0_READ_TIMEOUT,
+        max_retries=JUDGE0_MAX_RETRIES,
+        batch_size=JUDGE0_BATCH_SIZE,
+    ):
+        super().__init__()
+        self.base_url = base_url.rstrip('/')
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.batch_size = batch_size
+
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session = requests.Session()
+        self.session.headers.update(HEADERS)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._pool = ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix='judge0')
+
+
+    def _backoff(self, attempt):
+        return random.uniform(0, min(JUDGE0_BACKOFF_CAP, JUDGE0_BACKOFF_BASE * (2 ** attempt)))
+
+
+    """
+        In _request function, we send one HTTP request to Judge0 and return the decoded JSON body.
+        Connection errors and RETRYABLE_STATUS_CODES are retried, read timeouts only for GET requests
+        because a POST that timed out may already have created submissions on Judge0.
+    """
+
+    def _request(self, method, path, **kwargs):
+        url = f"{self.base_url}{path}"
+        attempt = 0
+
+        while True:
+            try:
+                with self._slots:
+                    response = self.session.request(method, url, timeout=self.timeout, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt >= self.max_retries or (isinstance(e, requests.ReadTimeout) and method != 'GET'):
+                    raise
+            else:
+                if response.status_code not in RETRYABLE_STATUS_CODES or attempt >= self.max_retries:
+                    response.raise_for_status()
+                    return response.json()
+
+            time.sleep(self._backoff(attempt))
+            attempt += 1
+
+
+    """
+        In _map_chunks function, we split items into chunks of batch_size, call fn once per chunk
+        and concatenate what the calls return in chunk order.
+        A single chunk is sent from the calling thread, more are sent concurrently through the pool
+        (and still limited by the in-flight semaphore).
+    """
+
+    def _map_chunks(self, fn, items):
+        chunks = [items[i:i + self.batch_size] for i in range(0, len(items), self.batch_size)]
+
+        if len(chunks) <= 1:
+            return fn(items)
+
+        results = []
+        for chunk_result in self._pool.map(fn, chunks):
+            results.extend(chunk_result)
+
+        return results
+
+
+    """
+        In sumbit_batch function, we send a POST request to the Judge0 API with a list of submissions.
+        Each submission contains the refrence code, language ID, and optional input.
+        api returns a list of tokens, one for each submission.
+        We extract these tokens and return them for later polling.
+        When callbacks are configured every submission also carries a callback_url,
+        so Judge0 pushes the verdict to Judge0CallbackView instead of waiting to be polled.
+    """
+
+    def submit_batch(self, submissions, callback=True):
+        if callback and callbacks_enabled():
+            submissions = [{**sub, "callback_url": callback_url()} for sub in submissions]
+
+        return self._map_chunks(self._submit_chunk, submissions)
+
+
+    def _submit_chunk(self, submissions):
+        try:
+            data = self._request(
+                'POST',
+                "/submissions/batch?base64_encoded=false",
+                json={"submissions": submissions}
+            )
+        except requests.RequestException as e:
+            raise RuntimeError(f"Failed to submit batch: {e}")
+
+        if not data:
+            raise ValueError("No tokens received from Judge0")
+
+        # Callers map tokens back to testcases by position, so one rejected item fails the whole batch
+        for item in data:
+            if "token" not in item:
+                raise ValueError(f"Judge0 rejected a submission: {item}")
+
+        return [item["token"] for item in data]
+
+
+    """
+        In fetch_batch_results function, we make a single GET request for the given tokens and return whatever Judge0 has right now.
+        Unlike BaseExecutor.poll_batch_results (core/utils/executor.py) it never sleeps or loops, so it is safe to call from the judge worker on every sweep.
+    """
+
+    def fetch_batch_results(self, tokens):
+        return self._map_chunks(self._fetch_chunk, list(tokens))
+
+
+    def _fetch_chunk(self, tokens):
+        try:
+            data = self._request(
+                'GET',
+                f"/submissions/batch?tokens={','.join(tokens)}&base64_encoded=false"
+            )
+        except requests.RequestException as e:
+            raise RuntimeError(f"Failed to fetch batch results: {e}")
+
+        return data.get('submissions', [])
+
+
+    """
+        Stock Judge0 can not stop a submission once it is queued, so nothing is ever cancelled.
+        The tokens simply finish and their verdicts are stored as usual.
+    """
+
+    def cancel(self, tokens):
+        return []
+
+
+    def uses_callbacks(self):
+        return callbacks_enabled()
+
+
+
+_client = None
+_client_lock = threading.Lock()
 
 
 """
-    In sumbit_batch function, we send a POST request to the Judge0 API with a list of submissions.
-    Each submission contains the refrence code, language ID, and optional input.
-    api returns a list of tokens, one for each submission.
-    We extract these tokens and return them for later polling.
+    Returns the process wide Judge0Client, creating it on first use.
+    Used by get_executor() when JUDGE_EXECUTOR is judge0, so the process shares one connection pool and one in-flight limit.
 """
 
-def submit_batch(submissions):
-    url = f"{JUDGE0_URL}/submissions/batch?base64_encoded=false"
-    
-    try:
-        response = requests.post(url, json={"submissions": submissions}, headers=HEADERS)
-        response.raise_for_status()
-    except requests.RequestException as e:
-        raise RuntimeError(f"Failed to submit batch: {e}")
-
-    data = response.json()
-    
-    tokens = [item["token"] for item in data if "token" in item]
-    
-    if not tokens:
-        raise ValueError("No tokens received from Judge0")
-
-    return tokens
-
-
-""" 
-    In poll_batch_results function, we continuously poll the Judge0 API for the results of the submissions using their tokens.
-    We check if all submissions are complete (status ID not in [1, 2]) and return the results.
-    If the polling exceeds the TIMEOUT, we raise a TimeoutError.
+def get_judge0_client():
+    global _client
+
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = Judge0Client()
+
+    return _client
+
+
+
+def callbacks_enabled():
+    return bool(JUDGE0_CALLBACK_URL and JUDGE0_CALLBACK_SECRET)
+
+
+def callback_url():
+    return f"{JUDGE0_CALLBACK_URL}?{urlencode({'secret': JUDGE0_CALLBACK_SECRET})}"
+
+
+"""
+    Judge0 always sends callbacks base64 encoded, whatever base64_encoded was when submitting.
+    decode_callback returns the payload in the same shape fetch_batch_results returns results.
 """
 
-def poll_batch_results(tokens):
-    url = f"{config('JUDGE0_URL')}/submissions/batch?tokens={','.join(tokens)}&base64_encoded=false"
-    
-    start_time = time.time()
+def decode_callback(payload):
+    result = dict(payload)
 
-    while True:
-        try:
-            response = requests.get(url, headers=HEADERS)
-            response.raise_for_status()
-            data = response.json()
-        except requests.RequestException as e:
-            print(f"Error fetching results: {e}")
-            time.sleep(RETRY_INTERVAL)
-            continue
-        
-        
-        submissions = data.get('submissions', [])
-        if not submissions:
-            print("No submissions found, retrying...")
-            time.sleep(RETRY_INTERVAL)
-            continue
-        
-
-        if all(sub['status']['id']not in [1,2] for sub in submissions):
-            # print("all_done :", submissions)
-            return submissions
-
-
-        if time.time() - start_time > TIMEOUT:
-            raise TimeoutError("Judge0 batch polling timed out")  
-        
-        time.sleep(1)
-            
+    for field in ['stdout', 'stderr', 'compile_output', 'message']:
+        if result.get(field):
+            result[field] = base64.b64decode(result[field]).decode('utf-8', errors='replace')
+
+    return result
@@ -0,0 +1,361 @@
+from django.db import transaction
+from django.utils import timezone
+from core.models import Submission, SubmissionTestCase
+from core.utils.executor import get_executor
+from core.utils.harness import build_harness_submission, parse_harness_output
+from core.utils.solved import record_solved
+
+
+"""
+    Helpers shared by everything that turns Judge0 results into database rows.
+
+    Judge0 status ids:
+        1 - In Queue, 2 - Processing, 3 - Accepted,
+        anything above 3 is a final, non accepted verdict (Wrong Answer, Time Limit Exceeded,
+        Compilation Error, the different Runtime Error variants, Internal Error ...)
+"""
+
+PENDING_TESTCASE_STATUSES = [
+    SubmissionTestCase.Status.IN_QUEUE,
+    SubmissionTestCase.Status.PROCESSING,
+]
+
+# columns a Judge0 result writes, updated_at too because bulk_update skips auto_now
+RESULT_FIELDS = ["stdout", "stderr", "memory", "time", "status", "compile_output", "updated_at"]
+
+# columns dispatch writes, updated_at is when the callback grace period of the judge worker starts
+DISPATCH_FIELDS = ["token", "updated_at"]
+
+
+"""
+    In apply_results function, we copy every Judge0 result onto the SubmissionTestCase that owns its token.
+    testcase_mp maps token -> SubmissionTestCase, results is the list returned by Judge0.
+    Only the objects are changed, ingest_results writes them.
+    Returns the list of testcases that were updated.
+"""
+
+def apply_results(testcase_mp, results):
+    updated = []
+
+    for r in results:
+        # Judge0 returns null for tokens it does not know about
+        if not r or r.get('token') not in testcase_mp:
+            continue
+
+        tc = testcase_mp[r['token']]
+
+        # nothing new since the last sweep
+        if tc.status == r['status']['description']:
+            continue
+
+        tc.stdout = r.get("stdout")
+        tc.stderr = r.get("stderr")
+        tc.memory = _number(r.get("memory"), int)
+        tc.time = _number(r.get("time"), float)
+        tc.status = r['status']['description']
+        tc.compile_output = r.get('compile_output')
+        tc.updated_at = timezone.now()
+
+        updated.append(tc)
+
+    return updated
+
+
+# Judge0 sends time as a string ("0.012") and memory as an int, both can be null
+def _number(value, cast):
+    try:
+        return cast(float(value)) if value not in (None, "") else None
+    except (TypeError, ValueError):
+        return None
+
+
+"""
+    Result ingestion.
+    Every verdict that reaches us (judge worker poll, Judge0 callback, harness result) goes through
+    ingest_results / ingest_harness_result, which in one transaction:
+        1. lock the submission and load its testcases once
+        2. copy the results onto them and write every changed row with a single bulk_update
+        3. push fail fast forward and derive Submission.status from the same in-memory testcases
+    Both return (submission, testcases) as they are after the update.
+"""
+
+def ingest_results(submission_id, results):
+    with transaction.atomic():
+        submission, testcases = _lock_submission(submission_id)
+        _store_results(submission, testcases, results)
+
+    return submission, testcases
+
+
+def ingest_harness_result(submission_id, result):
+    with transaction.atomic():
+        submission, testcases = _lock_submission(submission_id)
+
+        # a late duplicate (callback after the worker already polled it) has nothing to add
+        if submission.status == Submission.Status.PENDING:
+            results = parse_harness_output(
+                result,
+                [tc.expected_output for tc in testcases],
+                [tc.token for tc in testcases]
+            )
+            _store_results(submission, testcases, results)
+
+    return submission, testcases
+
+
+def _lock_submission(submission_id):
+    submission = Submission.objects.select_for_update().select_related('language').get(id=submission_id)
+    return submission, list(submission.testcases.order_by('id'))
+
+
+def _store_results(submission, testcases, results):
+    updated = apply_results({tc.token: tc for tc in testcases if tc.token}, results)
+
+    if updated:
+        SubmissionTestCase.objects.bulk_update(updated, RESULT_FIELDS)
+        refresh_submission_status(submission, testcases)
+
+    return updated
+
+
+"""
+    In submission_status_for function, we derive the overall Submission status from its testcase statuses.
+        - every testcase Accepted -> Passed
+        - any testcase finished with another verdict -> Failed
+        - otherwise the submission is still being judged -> Pending
+"""
+
+def submission_status_for(statuses):
+    if statuses and all(s == SubmissionTestCase.Status.ACCEPTED for s in statuses):
+        return Submission.Status.PASSED
+
+    if any(s not in PENDING_TESTCASE_STATUSES and s != SubmissionTestCase.Status.ACCEPTED for s in statuses):
+        return Submission.Status.FAILED
+
+    return Submission.Status.PENDING
+
+
+"""
+    In dispatch_testcases function, we send the given testcases of a submission to Judge0
+    and store the returned token on each of them.
+"""
+
+def dispatch_testcases(submission, testcases):
+    if not testcases:
+        return
+
+    tokens = get_executor().submit_batch(_batch(submission, testcases))  # returns ["tok1", "tok2", ...]
+    now = timezone.now()
+
+    for tc, token in zip(testcases, tokens):
+        tc.token = token
+        tc.updated_at = now
+
+    SubmissionTestCase.objects.bulk_update(testcases, DISPATCH_FIELDS)
+
+
+def _batch(submission, testcases):
+    return [
+        {
+            "language_id": submission.language.langId,
+            "source_code": submission.source_code,
+            "stdin": tc.input_data,
+            "expected_output": tc.expected_output,
+        }
+        for tc in testcases
+    ]
+
+
+"""
+    In dispatch_harness function, we judge all testcases of a submission with a single compile once harness submission.
+    Testcases get a token derived from the harness token, so they still look dispatched everywhere else.
+"""
+
+def dispatch_harness(submission, testcases):
+    payload = build_harness_submission(
+        submission.language.name,
+        submission.source_code,
+        [tc.input_data for tc in testcases]
+    )
+
+    token = get_executor().submit_batch([payload])[0]
+
+    submission.judge_token = token
+    submission.save(update_fields=["judge_token", "updated_at"])
+
+    for index, tc in enumerate(testcases, start=1):
+        tc.token = f"{token}-{index}"
+        tc.updated_at = submission.updated_at
+
+    SubmissionTestCase.objects.bulk_update(testcases, DISPATCH_FIELDS)
+
+
+"""
+    In next_wave function, we pick the testcases that should be sent to Judge0 next.
+    testcases is every testcase of the submission in order.
+
+    Normal submissions send everything at once.
+    Fail fast submissions send waves that double in size (1, 1, 2, 4, ... capped at the Judge0 batch size),
+    the first wave is a single testcase so a compilation error costs exactly one Judge0 run.
+"""
+
+def next_wave(submission, testcases):
+    waiting = [tc for tc in testcases if tc.token is None and tc.status == SubmissionTestCase.Status.IN_QUEUE]
+
+    if not submission.fail_fast:
+        return waiting
+
+    dispatched = len(testcases) - len(waiting)
+    size = min(max(1, dispatched), get_executor().batch_size)
+
+    return waiting[:size]
+
+
+"""
+    In advance_fail_fast function, we move a fail fast submission forward after new verdicts came in.
+        - a dispatched testcase failed -> mark every testcase that was never sent as Skipped,
+          and after commit ask the executor to cancel the current wave (the local one can, see cancel_in_flight)
+        - every dispatched testcase is Accepted -> claim the next wave, it is sent after commit (see dispatch_wave)
+        - otherwise the current wave is still running, nothing to do
+    testcases is every testcase of the submission in order, they are updated in place.
+    Must be called with the submission row locked, see refresh_submission_status.
+    Only the decisions are taken under that lock, the executor calls wait for the commit:
+    callbacks for the same submission would otherwise queue on the lock for a whole HTTP timeout and its retries.
+
+    A claimed wave is Processing without a token. Nobody else picks it while it is claimed, and its shared
+    updated_at (claimed_at) tells dispatch_wave whether the claim still holds when the tokens come back.
+"""
+
+def advance_fail_fast(submission, testcases):
+    if not submission.fail_fast:
+        return
+
+    waiting = [tc for tc in testcases if tc.token is None and tc.status == SubmissionTestCase.Status.IN_QUEUE]
+    claimed = [tc for tc in testcases if tc.token is None and tc.status == SubmissionTestCase.Status.PROCESSING]
+    in_flight = [tc for tc in testcases if tc.token is not None and tc.status in PENDING_TESTCASE_STATUSES]
+
+    if not waiting and not claimed and not in_flight:
+        return
+
+    statuses = [tc.status for tc in testcases if tc.token is not None]
+
+    if submission_status_for(statuses) == Submission.Status.FAILED:
+        # a claimed wave that is still being sent is skipped too, dispatch_wave then cancels what it sent
+        skipped = waiting + claimed
+        for tc in skipped:
+            tc.status = SubmissionTestCase.Status.SKIPPED
+
+        SubmissionTestCase.objects.filter(id__in=[tc.id for tc in skipped]).update(status=SubmissionTestCase.Status.SKIPPED)
+
+        if in_flight:
+            tokens = [tc.token for tc in in_flight]
+            transaction.on_commit(lambda: cancel_in_flight(tokens))
+
+    elif waiting and not claimed and all(s == SubmissionTestCase.Status.ACCEPTED for s in statuses):
+        wave = next_wave(submission, testcases)
+        claimed_at = timezone.now()
+
+        for tc in wave:
+            tc.status = SubmissionTestCase.Status.PROCESSING
+            tc.updated_at = claimed_at
+
+        SubmissionTestCase.objects.bulk_update(wave, ["status", "updated_at"])
+        transaction.on_commit(lambda: dispatch_wave(submission, wave, claimed_at))
+
+
+"""
+    In dispatch_wave function, which runs after the commit that claimed the wave, we send it to the executor
+    and store the tokens if the wave is still claimed by this call.
+    A failure hands the wave back (In Queue without a token) for the judge worker to resume,
+    a wave skipped or claimed again meanwhile gets what was sent cancelled.
+"""
+
+def dispatch_wave(submission, wave, claimed_at):
+    ids = [tc.id for tc in wave]
+    still_claimed = SubmissionTestCase.objects.filter(
+        id__in=ids,
+        token__isnull=True,
+        status=SubmissionTestCase.Status.PROCESSING,
+        updated_at=claimed_at
+    )
+
+    try:
+        tokens = get_executor().submit_batch(_batch(submission, wave))
+    except Exception as e:
+        print(f"Error dispatching wave of submission {submission.id}: {e}")
+        still_claimed.update(status=SubmissionTestCase.Status.IN_QUEUE)
+        return
+
+    with transaction.atomic():
+        Submission.objects.select_for_update().filter(id=submission.id).values_list('id', flat=True).get()
+        claim_held = still_claimed.count() == len(wave)
+
+        if claim_held:
+            now = timezone.now()
+            for tc, token in zip(wave, tokens):
+                tc.token = token
+                tc.status = SubmissionTestCase.Status.IN_QUEUE
+                tc.updated_at = now
+
+            SubmissionTestCase.objects.bulk_update(wave, ["status"] + DISPATCH_FIELDS)
+
+    if not claim_held:
+        cancel_in_flight(tokens)
+
+
+"""
+    In cancel_in_flight function, which runs after commit, we ask the executor to stop tokens of a failed
+    fail fast submission and mark the ones it could stop as Skipped.
+    The submission is Failed already, skipping more of its testcases does not change its summary.
+"""
+
+def cancel_in_flight(tokens):
+    try:
+        cancelled = get_executor().cancel(tokens)
+    except Exception as e:
+        print(f"Error cancelling tokens: {e}")
+        return
+
+    if cancelled:
+        SubmissionTestCase.objects.filter(token__in=cancelled, status__in=PENDING_TESTCASE_STATUSES).update(
+            status=SubmissionTestCase.Status.SKIPPED,
+            updated_at=timezone.now()
+        )
+
+
+"""
+    In refresh_submission_status function, we push fail fast submissions forward,
+    recompute Submission.status from the verdicts and store the testcase summary
+    (max_time, max_memory, passed_count, total_count) next to it.
+    testcases are the submission's testcases in order when the caller already has them, otherwise they are loaded.
+    Callers hold a select_for_update lock on the submission so concurrent updates see each other's verdicts.
+"""
+
+def refresh_submission_status(submission, testcases=None):
+    if testcases is None:
+        testcases = list(submission.testcases.order_by('id'))
+
+    advance_fail_fast(submission, testcases)
+
+    times = [tc.time for tc in testcases if tc.time is not None]
+    memories = [tc.memory for tc in testcases if tc.memory is not None]
+
+    summary = {
+        "status": submission_status_for([tc.status for tc in testcases]),
+        "max_time": max(times, default=None),
+        "max_memory": max(memories, default=None),
+        "passed_count": sum(tc.status == SubmissionTestCase.Status.ACCEPTED for tc in testcases),
+        "total_count": len(testcases),
+    }
+
+    changed = [field for field, value in summary.items() if getattr(submission, field) != value]
+
+    if changed:
+        for field in changed:
+            setattr(submission, field, summary[field])
+        submission.save(update_fields=changed + ["updated_at"])
+
+        if "status" in changed:
+            record_solved(submission)
+
+    return submission.status
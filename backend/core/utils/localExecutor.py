@@ -0,0 +1,327 @@
+import os
+import json
+import time
+import uuid
+import shutil
+import signal
+import resource
+import tempfile
+import threading
+import subprocess
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from decouple import config
+from core.utils.executor import PENDING_STATUS_IDS, BaseExecutor
+
+
+"""
+    Local execution backend (JUDGE_EXECUTOR=local).
+
+    Runs submissions on this machine in subprocesses limited with rlimits (CPU time, address space,
+    output size, no core dumps) plus a wall clock timeout, through a process pool.
+    It is meant for small deployments, CI and load tests where running a Judge0 cluster is not worth it.
+    rlimits are not a security sandbox, only use it for code you are fine running on the host.
+
+    Each call to submit_batch groups submissions that share language and source code, compiles them once
+    and runs the binary against every input, like the compile once harness does on Judge0.
+
+    State lives in LOCAL_EXECUTOR_DIR as one <token>.json per submission, written atomically, so the web
+    process that submitted and the judge worker that polls can be different processes on the same machine.
+    A token's files are deleted once the caller stored its final result and released it (or the pool skipped it
+    after a cancel), never on read: a poller that dies before its commit fetches the same result again. A sweep fails tokens that got no news for LOCAL_STALE_AFTER seconds (the process judging
+    them died) and deletes whatever nobody collected within LOCAL_SPOOL_RETENTION seconds.
+"""
+
+LOCAL_EXECUTOR_DIR = config('LOCAL_EXECUTOR_DIR', default=os.path.join(tempfile.gettempdir(), 'levelupcode-judge'))
+LOCAL_EXECUTOR_WORKERS = config('LOCAL_EXECUTOR_WORKERS', default=2, cast=int)
+LOCAL_TIME_LIMIT = config('LOCAL_TIME_LIMIT', default=2, cast=float)  # cpu seconds per testcase
+LOCAL_MEMORY_LIMIT = config('LOCAL_MEMORY_LIMIT', default=256, cast=int)  # MB per testcase
+LOCAL_OUTPUT_LIMIT = 16 * 1024 * 1024  # bytes a program may write
+LOCAL_COMPILE_TIME_LIMIT = 30  # seconds
+LOCAL_STALE_AFTER = config('LOCAL_STALE_AFTER', default=600, cast=int)  # seconds a queued / running token may go without news
+LOCAL_SPOOL_RETENTION = 24 * 60 * 60  # seconds before files nobody fetched are deleted
+LOCAL_SWEEP_INTERVAL = 60  # seconds between sweeps of LOCAL_EXECUTOR_DIR
+
+# keyed by Judge0 language id (Language.langId), so the same Language rows work with both executors
+LOCAL_LANGUAGES = {
+    50: {'source': 'main.c', 'compile': ['gcc', '-O2', 'main.c', '-o', 'main', '-lm'], 'run': ['./main']},
+    54: {'source': 'main.cpp', 'compile': ['g++', '-O2', '-std=c++17', 'main.cpp', '-o', 'main'], 'run': ['./main']},
+    62: {'source': 'Main.java', 'compile': ['javac', 'Main.java'], 'run': ['java', '-Xss64m', 'Main'], 'limit_memory': False},
+    63: {'source': 'main.js', 'compile': None, 'run': ['node', 'main.js'], 'limit_memory': False},
+    71: {'source': 'main.py', 'compile': None, 'run': ['python3', 'main.py']},
+}
+
+# Judge0 status ids / descriptions, results look exactly like Judge0's
+IN_QUEUE = {"id": 1, "description": "In Queue"}
+PROCESSING = {"id": 2, "description": "Processing"}
+ACCEPTED = {"id": 3, "description": "Accepted"}
+WRONG_ANSWER = {"id": 4, "description": "Wrong Answer"}
+TIME_LIMIT_EXCEEDED = {"id": 5, "description": "Time Limit Exceeded"}
+COMPILATION_ERROR = {"id": 6, "description": "Compilation Error"}
+SIGNALS = {
+    signal.SIGSEGV: {"id": 7, "description": "Runtime Error (SIGSEGV)"},
+    signal.SIGXFSZ: {"id": 8, "description": "Runtime Error (SIGXFSZ)"},
+    signal.SIGFPE: {"id": 9, "description": "Runtime Error (SIGFPE)"},
+    signal.SIGABRT: {"id": 10, "description": "Runtime Error (SIGABRT)"},
+}
+RUNTIME_ERROR = {"id": 11, "description": "Runtime Error (NZEC)"}
+RUNTIME_ERROR_OTHER = {"id": 12, "description": "Runtime Error (Other)"}
+INTERNAL_ERROR = {"id": 13, "description": "Internal Error"}
+
+
+def _result_path(token):
+    return os.path.join(LOCAL_EXECUTOR_DIR, f"{token}.json")
+
+
+def _cancel_path(token):
+    return os.path.join(LOCAL_EXECUTOR_DIR, f"{token}.cancel")
+
+
+def _write_result(token, status, **fields):
+    result = {"token": token, "status": status, "stdout": None, "stderr": None,
+              "compile_output": None, "time": None, "memory": None, **fields}
+
+    tmp_path = f"{_result_path(token)}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(result, f)
+    os.replace(tmp_path, _result_path(token))
+
+
+def _read_result(token):
+    try:
+        with open(_result_path(token)) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def _remove(token):
+    for path in (_result_path(token), _cancel_path(token)):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+"""
+    In _sweep function, we go over LOCAL_EXECUTOR_DIR once:
+        - a token still In Queue / Processing whose file has not changed for LOCAL_STALE_AFTER seconds
+          is failed with Internal Error, its pool process is gone and nobody else will ever write it
+        - any file older than LOCAL_SPOOL_RETENTION is deleted (results of a poller that died, leftover .cancel / .tmp)
+"""
+
+def _sweep():
+    now = time.time()
+
+    for entry in os.scandir(LOCAL_EXECUTOR_DIR):
+        try:
+            age = now - entry.stat().st_mtime
+
+            if age > LOCAL_SPOOL_RETENTION:
+                os.remove(entry.path)
+
+            elif entry.name.endswith('.json') and age > LOCAL_STALE_AFTER:
+                token = entry.name[:-len('.json')]
+                result = _read_result(token)
+                if result and result['status']['id'] in PENDING_STATUS_IDS:
+                    _write_result(token, INTERNAL_ERROR, message=f"No result after {LOCAL_STALE_AFTER}s, the process judging it is gone")
+
+        except FileNotFoundError:  # fetched / swept by another process meanwhile
+            pass
+
+
+def _limits(limit_memory):
+    def apply():
+        cpu = int(LOCAL_TIME_LIMIT) + 1
+        resource.setrlimit(resource.RLIMIT_CPU, (cpu, cpu + 1))
+        resource.setrlimit(resource.RLIMIT_FSIZE, (LOCAL_OUTPUT_LIMIT, LOCAL_OUTPUT_LIMIT))
+        resource.setrlimit(resource.RLIMIT_CORE, (0, 0))
+        if limit_memory:
+            memory = LOCAL_MEMORY_LIMIT * 1024 * 1024
+            resource.setrlimit(resource.RLIMIT_AS, (memory, memory))
+
+    return apply
+
+
+"""
+    In _run function, we run one command with the testcase input on stdin and wait for it with os.wait4,
+    which gives us the CPU time and peak memory of exactly that child.
+    The peak memory includes the few MB of the forked pool process image the child starts from.
+    Returns (exit status from wait4, cpu seconds, peak memory in KB, timed out, stdout, stderr).
+"""
+
+def _run(command, workdir, stdin, limit_memory):
+    with tempfile.TemporaryFile() as stdin_file, tempfile.TemporaryFile() as stdout_file, tempfile.TemporaryFile() as stderr_file:
+        stdin_file.write((stdin or "").encode())
+        stdin_file.seek(0)
+
+        process = subprocess.Popen(
+            command,
+            cwd=workdir,
+            stdin=stdin_file,
+            stdout=stdout_file,
+            stderr=stderr_file,
+            env={"PATH": os.environ.get("PATH", "/usr/bin:/bin")},
+            preexec_fn=_limits(limit_memory),
+            start_new_session=True,
+        )
+
+        # rlimit CPU does not catch sleeping / blocked programs, a wall clock timer does
+        timed_out = threading.Event()
+
+        def kill():
+            timed_out.set()
+            try:
+                os.killpg(process.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+
+        timer = threading.Timer(LOCAL_TIME_LIMIT * 3 + 1, kill)
+        timer.start()
+        try:
+            _, exit_status, usage = os.wait4(process.pid, 0)
+        finally:
+            timer.cancel()
+        process.returncode = exit_status  # already reaped, stop Popen from waiting again
+
+        stdout_file.seek(0)
+        stderr_file.seek(0)
+        stdout = stdout_file.read().decode('utf-8', errors='replace')
+        stderr = stderr_file.read().decode('utf-8', errors='replace')
+
+    return exit_status, usage.ru_utime + usage.ru_stime, usage.ru_maxrss, timed_out.is_set(), stdout, stderr
+
+
+def _verdict(exit_status, cpu_time, timed_out, stdout, expected_output):
+    if timed_out or cpu_time > LOCAL_TIME_LIMIT:
+        return TIME_LIMIT_EXCEEDED
+
+    if os.WIFSIGNALED(exit_status):
+        sig = os.WTERMSIG(exit_status)
+        if sig in (signal.SIGXCPU, signal.SIGKILL):
+            return TIME_LIMIT_EXCEEDED
+        return SIGNALS.get(sig, RUNTIME_ERROR_OTHER)
+
+    if os.WEXITSTATUS(exit_status) != 0:
+        return RUNTIME_ERROR
+
+    if expected_output is not None and stdout.strip() != expected_output.strip():
+        return WRONG_ANSWER
+
+    return ACCEPTED
+
+
+"""
+    In _judge_group function, which runs inside a pool process, we compile one source once
+    and run it against every (token, stdin, expected_output) job, writing each result as soon as it is known.
+"""
+
+def _judge_group(language_id, source_code, jobs):
+    language = LOCAL_LANGUAGES.get(language_id)
+
+    if language is None:
+        for token, _, _ in jobs:
+            _write_result(token, INTERNAL_ERROR, message=f"Language {language_id} is not supported by the local executor")
+        return
+
+    workdir = tempfile.mkdtemp(prefix='judge-')
+    try:
+        with open(os.path.join(workdir, language['source']), 'w') as f:
+            f.write(source_code)
+
+        if language['compile']:
+            try:
+                compiled = subprocess.run(language['compile'], cwd=workdir, capture_output=True, text=True, timeout=LOCAL_COMPILE_TIME_LIMIT)
+            except subprocess.TimeoutExpired:
+                compiled = subprocess.CompletedProcess(language['compile'], 1, "", "Compilation timed out")
+
+            if compiled.returncode != 0:
+                for token, _, _ in jobs:
+                    _write_result(token, COMPILATION_ERROR, compile_output=compiled.stderr or compiled.stdout)
+                return
+
+        for token, stdin, expected_output in jobs:
+            if os.path.exists(_cancel_path(token)):
+                # nobody polls a cancelled token, see LocalExecutor.cancel
+                _remove(token)
+                continue
+
+            _write_result(token, PROCESSING)
+
+            exit_status, cpu_time, memory, timed_out, stdout, stderr = _run(
+                language['run'], workdir, stdin, language.get('limit_memory', True)
+            )
+
+            _write_result(
+                token,
+                _verdict(exit_status, cpu_time, timed_out, stdout, expected_output),
+                stdout=stdout,
+                stderr=stderr,
+                time=f"{cpu_time:.3f}",
+                memory=memory,
+            )
+
+    except Exception as e:
+        for token, _, _ in jobs:
+            if (_read_result(token) or {}).get('status', IN_QUEUE)['id'] in (1, 2):
+                _write_result(token, INTERNAL_ERROR, message=str(e))
+
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+class LocalExecutor(BaseExecutor):
+
+    """
+        Executor that runs code in resource limited subprocesses on this machine, see the module docstring.
+    """
+
+    def __init__(self, workers=LOCAL_EXECUTOR_WORKERS):
+        super().__init__()
+        os.makedirs(LOCAL_EXECUTOR_DIR, exist_ok=True)
+
+        # spawn, the web / worker process has threads (Judge0 pool, timers) that fork would copy half-finished
+        self._pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+        self._swept_at = None
+
+
+    def submit_batch(self, submissions, callback=True):
+        tokens = [uuid.uuid4().hex for _ in submissions]
+        groups = {}
+
+        for token, sub in zip(tokens, submissions):
+            _write_result(token, IN_QUEUE)
+            key = (sub['language_id'], sub['source_code'])
+            groups.setdefault(key, []).append((token, sub.get('stdin'), sub.get('expected_output')))
+
+        for (language_id, source_code), jobs in groups.items():
+            self._pool.submit(_judge_group, language_id, source_code, jobs)
+
+        return tokens
+
+
+    def fetch_batch_results(self, tokens):
+        if self._swept_at is None or time.monotonic() - self._swept_at > LOCAL_SWEEP_INTERVAL:
+            self._swept_at = time.monotonic()
+            _sweep()
+
+        return [_read_result(token) for token in tokens]
+
+
+    def release(self, tokens):
+        for token in tokens:
+            _remove(token)
+
+
+    def cancel(self, tokens):
+        cancelled = []
+
+        for token in tokens:
+            open(_cancel_path(token), 'w').close()
+
+            result = _read_result(token)
+            # no file left: the pool already saw the .cancel, skipped the token and removed both
+            if result is None or result['status']['id'] == IN_QUEUE['id']:
+                cancelled.append(token)
+
+        return cancelled
@@ -0,0 +1,106 @@
+import json
+import base64
+import datetime
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+
+
+"""
+    Keyset (cursor) pagination for list endpoints.
+
+    A page is read with WHERE (sort key) < (last sort key of the previous page) ORDER BY sort key LIMIT limit + 1,
+    so every page costs the same however deep the client scrolls (an index on the sort key is enough),
+    and rows inserted meanwhile never shift or repeat items the way OFFSET does.
+
+    The cursor is opaque to clients: urlsafe base64 of the JSON list of the last row's sort key values.
+    The sort key must be unique (end it with the primary key) and its columns non null.
+"""
+
+class KeysetPaginator:
+
+    def __init__(self, ordering, default_limit=10, max_limit=50):
+        self.ordering = list(ordering)  # e.g. ['-created_at', '-id'], model fields or annotations
+        self.default_limit = default_limit
+        self.max_limit = max_limit
+
+    @property
+    def fields(self):
+        return [field.lstrip('-') for field in self.ordering]
+
+    """
+        In paginate function, we return (items, next_cursor, has_more) for the page of queryset
+        the request parameters limit and cursor ask for.
+        One extra row is fetched to know whether another page exists, it is not returned.
+        Raises ValueError for a malformed limit or cursor.
+    """
+
+    def paginate(self, queryset, params):
+        limit = self.limit(params.get('limit'))
+        cursor = params.get('cursor')
+
+        queryset = queryset.order_by(*self.ordering)
+
+        if cursor:
+            queryset = queryset.filter(self.after(queryset.model, self.decode(cursor)))
+
+        items = list(queryset[:limit + 1])
+        has_more = len(items) > limit
+        items = items[:limit]
+
+        next_cursor = self.encode(items[-1]) if has_more else None
+
+        return items, next_cursor, has_more
+
+    def limit(self, value):
+        if value in (None, ""):
+            return self.default_limit
+        try:
+            return min(max(int(value), 1), self.max_limit)
+        except ValueError:
+            raise ValueError("Invalid limit")
+
+    def after(self, model, values):
+        # (a, b) after (x, y) in the ordering: a beyond x, or a = x and b beyond y
+        condition = Q()
+        equal = {}
+
+        for ordering, field, value in zip(self.ordering, self.fields, values):
+            lookup = 'lt' if ordering.startswith('-') else 'gt'
+            condition |= Q(**equal, **{f"{field}__{lookup}": self._to_python(model, field, value)})
+            equal[field] = self._to_python(model, field, value)
+
+        return condition
+
+    def encode(self, item):
+        values = [getattr(item, field) for field in self.fields]
+        return base64.urlsafe_b64encode(json.dumps(values, default=self._to_json).encode()).decode()
+
+    def decode(self, cursor):
+        try:
+            values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        except ValueError:
+            raise ValueError("Invalid cursor")
+
+        if not isinstance(values, list) or len(values) != len(self.fields):
+            raise ValueError("Invalid cursor")
+
+        return values
+
+    @staticmethod
+    def _to_json(value):
+        # full precision, DjangoJSONEncoder drops microseconds and two rows a millisecond apart would collide
+        if isinstance(value, (datetime.datetime, datetime.date)):
+            return value.isoformat()
+        return str(value)
+
+    @staticmethod
+    def _to_python(model, field, value):
+        # annotations (a search rank) come back as plain JSON numbers
+        try:
+            return model._meta.get_field(field).to_python(value)
+        except FieldDoesNotExist:
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                raise ValueError("Invalid cursor")
+            return value
+        except (ValidationError, TypeError):
+            raise ValueError("Invalid cursor")
@@ -0,0 +1,126 @@
+from django.db.models import Count, Q
+from core.models import Problem, SolvedProblem
+
+
+"""
+    Problem filtering and facet counts for the problemset filter endpoint.
+
+    Filters:
+        tags       - tag slugs, a problem must carry every one of them
+        difficulty - Problem.DifficultyLevel values, a problem may have any of them
+        status     - "solved" / "unsolved", from the user's solved problem set (core/utils/solved.py)
+
+    Facet counts are disjunctive: the count next to every option is how many problems the list would have
+    if that option were picked with every other active filter kept,
+    so Easy / Medium / Hard each count with the tag and status filters but without the difficulty filter.
+    Tags are ANDed, so a tag count is how many of the current results also carry that tag.
+"""
+
+STATUSES = ['solved', 'unsolved']
+
+
+def _values(params, name):
+    # ?tags=array,graph and ?tags=array&tags=graph both work
+    values = []
+    for value in params.getlist(name):
+        values += [v.strip() for v in value.split(',') if v.strip()]
+    return list(dict.fromkeys(values))
+
+
+"""
+    In parse_problem_filter function, we read the filters from the query parameters.
+    Raises ValueError for an unknown difficulty or status.
+"""
+
+def parse_problem_filter(params):
+    difficulties = {level.lower(): level for level in Problem.DifficultyLevel.values}
+
+    difficulty = []
+    for value in _values(params, 'difficulty'):
+        if value.lower() not in difficulties:
+            raise ValueError(f"Invalid difficulty: {value}")
+        difficulty.append(difficulties[value.lower()])
+
+    status = params.get('status') or None
+    if status is not None and status not in STATUSES:
+        raise ValueError(f"Invalid status: {status}")
+
+    return {
+        "tags": [tag.lower() for tag in _values(params, 'tags')],
+        "difficulty": difficulty,
+        "status": status,
+    }
+
+
+def _solved_q(user):
+    # served by the (user, problem) unique index of SolvedProblem
+    return Q(id__in=SolvedProblem.objects.filter(user=user).values('problem_id'))
+
+
+def _status_q(user, status):
+    if status == 'solved':
+        return _solved_q(user)
+    if status == 'unsolved':
+        return ~_solved_q(user)
+    return Q()
+
+
+def _tagged(problems, tags):
+    if not tags:
+        return problems
+
+    # problems carrying every tag: one grouped subquery on the (tag, problem) index whatever the number of tags
+    tagged = Problem.tags.through.objects.filter(tag__slug__in=tags).values('problem_id').annotate(
+        matched=Count('tag_id')
+    ).filter(matched=len(tags)).values('problem_id')
+
+    return problems.filter(id__in=tagged)
+
+
+"""
+    In filter_problems function, we apply the filters to a Problem queryset.
+"""
+
+def filter_problems(problems, user, tags=(), difficulty=(), status=None):
+    problems = _tagged(problems, tags)
+
+    if difficulty:
+        problems = problems.filter(difficulty__in=difficulty)
+
+    return problems.filter(_status_q(user, status))
+
+
+"""
+    In problem_facets function, we count the options of every facet for the given filters with two grouped queries:
+        - difficulty and status counts, one conditional aggregate over the tag filtered problems
+        - tag counts, one GROUP BY over the problem/tag table for the filtered problems
+"""
+
+def problem_facets(user, tags=(), difficulty=(), status=None):
+    tagged = _tagged(Problem.objects.all(), tags)
+
+    status_q = _status_q(user, status)
+    difficulty_q = Q(difficulty__in=difficulty) if difficulty else Q()
+
+    counts = tagged.aggregate(
+        **{
+            f"difficulty_{level}": Count('id', filter=Q(difficulty=level) & status_q)
+            for level in Problem.DifficultyLevel.values
+        },
+        **{
+            f"status_{option}": Count('id', filter=difficulty_q & _status_q(user, option))
+            for option in STATUSES
+        }
+    )
+
+    filtered = filter_problems(Problem.objects.all(), user, tags, difficulty, status)
+
+    tag_counts = Problem.tags.through.objects.filter(problem_id__in=filtered.values('id')).values(
+        'tag__slug'
+    ).annotate(count=Count('problem_id')).order_by('-count', 'tag__slug')
+
+    return {
+        "difficulty": {level: counts[f"difficulty_{level}"] for level in Problem.DifficultyLevel.values},
+        "status": {option: counts[f"status_{option}"] for option in STATUSES},
+        "tags": {row['tag__slug']: row['count'] for row in tag_counts},
+    }
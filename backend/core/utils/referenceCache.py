@@ -0,0 +1,202 @@
+import time
+import threading
+from collections import OrderedDict
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from core.models import Language, Problem, Tag
+
+
+"""
+    Cache for reference data that is read on almost every request and written almost never
+    (languages, tags, problem metadata).
+
+    Two tiers:
+        - a small in-process LRU, a hit costs a dict lookup and returns the very same object
+        - Django's cache framework (settings.REFERENCE_CACHE_ALIAS), shared by every process
+
+    Every namespace has a version number stored in the shared tier and every entry is keyed by it.
+    core/signals.py bumps the version when a Language / Tag / Problem is saved or deleted,
+    so entries of the old version are never read again (the LRU drops them as new ones come in,
+    the shared tier lets them expire).
+    A process keeps the versions it read for REFERENCE_CACHE_VERSION_TTL seconds, so a local hit costs no
+    round trip at all, and sees another process's bump at most that late (its own bumps right away).
+
+    The shared tier must really be shared (Redis / Memcached, see settings.CACHES) as soon as there is more than
+    one web process, otherwise a bump never leaves the process that made it, see require_shared_cache.
+
+    Cached values are shared between requests, callers must not modify them.
+"""
+
+MISSING = object()
+
+# version key -> (version, monotonic time it was read), of every VersionedCache of this process
+_versions = OrderedDict()
+_versions_lock = threading.Lock()
+VERSIONS_SIZE = 4096
+
+
+class VersionedCache:
+
+    def __init__(self, namespace, timeout=None, local_size=256):
+        self.namespace = namespace
+        self.timeout = timeout if timeout is not None else settings.REFERENCE_CACHE_TIMEOUT
+        self.local_size = local_size
+        self._local = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def shared(self):
+        return caches[settings.REFERENCE_CACHE_ALIAS]
+
+    @property
+    def version_key(self):
+        return f"reference:{self.namespace}:version"
+
+    def _remember(self, version):
+        with _versions_lock:
+            _versions[self.version_key] = (version, time.monotonic())
+            _versions.move_to_end(self.version_key)
+            while len(_versions) > VERSIONS_SIZE:
+                _versions.popitem(last=False)
+
+    def version(self):
+        with _versions_lock:
+            entry = _versions.get(self.version_key)
+
+        if entry is not None and time.monotonic() - entry[1] < settings.REFERENCE_CACHE_VERSION_TTL:
+            return entry[0]
+
+        version = self.shared.get(self.version_key)
+
+        if version is None:
+            # starts from the clock, not 1, so a version key evicted from the shared tier
+            # can not come back as a number older entries were stored under
+            self.shared.add(self.version_key, time.time_ns(), None)
+            version = self.shared.get(self.version_key)
+
+        self._remember(version)
+        return version
+
+    def bump(self):
+        try:
+            version = self.shared.incr(self.version_key)
+        except ValueError:
+            self.shared.add(self.version_key, time.time_ns(), None)
+            version = self.shared.get(self.version_key)
+
+        self._remember(version)
+
+    def bump_on_commit(self):
+        # now for reads in this transaction, and again after commit for readers that reloaded the old rows meanwhile
+        self.bump()
+        transaction.on_commit(self.bump)
+
+    """
+        In get function, we return the cached value of key, calling loader() to compute it on a miss of both tiers.
+    """
+
+    def get(self, key, loader):
+        version = self.version()
+        local_key = (version, key)
+
+        with self._lock:
+            value = self._local.get(local_key, MISSING)
+            if value is not MISSING:
+                self._local.move_to_end(local_key)
+                return value
+
+        shared_key = f"reference:{self.namespace}:{version}:{key}"
+        value = self.shared.get(shared_key, MISSING)
+
+        if value is MISSING:
+            value = loader()
+            self.shared.set(shared_key, value, self.timeout)
+
+        with self._lock:
+            self._local[local_key] = value
+            self._local.move_to_end(local_key)
+            while len(self._local) > self.local_size:
+                self._local.popitem(last=False)
+
+        return value
+
+    def clear_local(self):
+        with self._lock:
+            self._local.clear()
+        with _versions_lock:
+            _versions.pop(self.version_key, None)
+
+
+"""
+    In require_shared_cache function, we refuse to run `processes` web processes on a cache backend that lives in
+    one process (locmem), every process would keep its own versions and serve what the others invalidated.
+    Called by CoreConfig.ready with WEB_CONCURRENCY.
+    The judge worker runs next to a single web process on locmem just fine: the only version it bumps is the
+    solved set's, which core/utils/solved.py reads from the database when the cache is not shared.
+"""
+
+PROCESS_LOCAL_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+def cache_is_shared():
+    return settings.CACHES[settings.REFERENCE_CACHE_ALIAS]['BACKEND'] not in PROCESS_LOCAL_BACKENDS
+
+def require_shared_cache(processes):
+    backend = settings.CACHES[settings.REFERENCE_CACHE_ALIAS]['BACKEND']
+
+    if processes > 1 and not cache_is_shared():
+        raise ImproperlyConfigured(
+            f"{backend} is not shared between the {processes} processes, "
+            f"set REDIS_URL (or CACHE_BACKEND / CACHE_LOCATION) to a shared cache"
+        )
+
+
+
+languages_cache = VersionedCache('languages')
+tags_cache = VersionedCache('tags')
+problems_cache = VersionedCache('problems', local_size=1024)
+
+
+"""
+    In get_language function, we return the active Language called name (any case, "python" / "Python"), or None.
+"""
+
+def get_language(name):
+    languages = languages_cache.get(
+        'active',
+        lambda: {language.name: language for language in Language.objects.filter(isActive=True)}
+    )
+
+    return languages.get((name or "").capitalize())
+
+
+"""
+    Every language / tag as GetAllLanguagesSerializer / GetAllTagsSerializer render them.
+"""
+
+def all_languages():
+    from core.serializers.getAllProblem import GetAllLanguagesSerializer
+
+    return languages_cache.get('all', lambda: list(GetAllLanguagesSerializer(Language.objects.all(), many=True).data))
+
+
+def all_tags():
+    from core.serializers.getAllProblem import GetAllTagsSerializer
+
+    return tags_cache.get('all', lambda: list(GetAllTagsSerializer(Tag.objects.all(), many=True).data))
+
+
+"""
+    In submission_problem function, we return the problem with the given slug with the columns a submission needs
+    (id, slug, fail_fast), or None when there is no such problem.
+"""
+
+def submission_problem(slug):
+    return problems_cache.get(
+        f"submission:{slug}",
+        lambda: Problem.objects.only('id', 'slug', 'fail_fast').filter(slug=slug).first()
+    )
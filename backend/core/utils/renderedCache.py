@@ -0,0 +1,86 @@
+import time
+import threading
+from django.conf import settings
+from django.core.cache import caches
+
+
+"""
+    Cache of rendered response bodies with request coalescing.
+
+    An entry is (version, bytes) under one key per object, version is whatever tells the cached body from the
+    current one (a problem's updated_at), so a body that outlived an invalidation is never served.
+
+    On a miss only one request rebuilds the body, the others wait for it instead of all hitting the database at once
+    (a contest starts and thousands of users open the same problem in the same second):
+        - threads of this process queue on a lock picked by the key
+        - processes race for a lock key in the shared tier (cache.add), the losers poll the shared tier for the
+          winner's body and only build it themselves if it does not show up within `wait` seconds
+"""
+
+MISSING = object()
+
+
+class CoalescingCache:
+
+    def __init__(self, namespace, timeout=None, wait=2.0, poll=0.02, stripes=64):
+        self.namespace = namespace
+        self.timeout = timeout if timeout is not None else settings.REFERENCE_CACHE_TIMEOUT
+        self.wait = wait
+        self.poll = poll
+        # a fixed set of locks shared by hash, no per key lock to create and clean up
+        self._locks = [threading.Lock() for _ in range(stripes)]
+
+    @property
+    def shared(self):
+        return caches[settings.REFERENCE_CACHE_ALIAS]
+
+    def _key(self, key):
+        return f"rendered:{self.namespace}:{key}"
+
+    def _cached(self, key, version):
+        entry = self.shared.get(self._key(key))
+        return entry[1] if entry is not None and entry[0] == version else MISSING
+
+    """
+        In get function, we return the body cached for key at version, calling build() (which returns bytes)
+        at most once per miss across every waiting request.
+    """
+
+    def get(self, key, version, build):
+        body = self._cached(key, version)
+        if body is not MISSING:
+            return body
+
+        with self._locks[hash(key) % len(self._locks)]:
+            # the thread that held the lock may have just built it
+            body = self._cached(key, version)
+            if body is not MISSING:
+                return body
+
+            lock_key = f"{self._key(key)}:lock"
+
+            owner = self.shared.add(lock_key, 1, self.wait)
+
+            if not owner:
+                deadline = time.monotonic() + self.wait
+                while time.monotonic() < deadline:
+                    time.sleep(self.poll)
+                    body = self._cached(key, version)
+                    if body is not MISSING:
+                        return body
+
+            try:
+                body = build()
+                self.shared.set(self._key(key), (version, body), self.timeout)
+                return body
+            finally:
+                if owner:
+                    self.shared.delete(lock_key)
+
+    def invalidate(self, key):
+        self.shared.delete(self._key(key))
+
+
+
+# ProblemView.get bodies by problem id, versioned by updated_at, dropped by core/signals.py
+problem_pages = CoalescingCache('problem')
@@ -0,0 +1,91 @@
+import re
+from functools import lru_cache
+from django.db import connection
+from django.db.models import F, FloatField, OuterRef, Q, Subquery, TextField, Value
+from django.db.models.functions import Cast, Coalesce
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector, TrigramSimilarity
+from core.models import Problem, Tag
+
+
+"""
+    Problem search.
+
+    Problem.search_vector is a tsvector of the title (weight A), tag names (B) and description (C)
+    with a GIN index (problem_search_vector_idx), update_search_vectors keeps it current (see core/signals.py).
+
+    A search matches problems whose vector matches every word of the query as a prefix ("bin sea" finds "Binary Search"),
+    and, when the pg_trgm extension is installed, problems whose title is trigram similar to the query
+    so typos still find something ("binray serach"), through the problem_title_trgm_idx GIN index.
+    Results are ranked by ts_rank + title similarity and paginated with a keyset cursor on (rank, id).
+"""
+
+SEARCH_CONFIG = 'english'
+SEARCH_MAX_WORDS = 8
+
+
+def search_vector_expression():
+    tag_names = Tag.objects.filter(problems=OuterRef('pk')).values('problems').annotate(
+        names=StringAgg('name', delimiter=' ')
+    ).values('names')
+
+    return (
+        SearchVector('title', weight='A', config=SEARCH_CONFIG)
+        + SearchVector(Coalesce(Subquery(tag_names), Value(''), output_field=TextField()), weight='B', config=SEARCH_CONFIG)
+        + SearchVector('description', weight='C', config=SEARCH_CONFIG)
+    )
+
+
+"""
+    Recomputes Problem.search_vector in the database for the given problem ids (all problems when None).
+"""
+
+def update_search_vectors(problem_ids=None):
+    problems = Problem.objects.all()
+
+    if problem_ids is not None:
+        problems = problems.filter(id__in=list(problem_ids))
+
+    return problems.update(search_vector=search_vector_expression())
+
+
+@lru_cache(maxsize=None)
+def trigram_available():
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        return cursor.fetchone() is not None
+
+
+def _prefix_query(query):
+    # every word as a prefix, ANDed: "bin sea" -> bin:* & sea:*
+    words = re.findall(r'\w+', query.lower())[:SEARCH_MAX_WORDS]
+    if not words:
+        return None
+    return SearchQuery(' & '.join(f"{word}:*" for word in words), search_type='raw', config=SEARCH_CONFIG)
+
+
+"""
+    In search_problems function, we return the queryset of problems matching query, best match first.
+    Every problem carries a search_rank annotation, SEARCH_ORDERING pages on it (see core/utils/pagination.py).
+"""
+
+SEARCH_ORDERING = ['-search_rank', '-id']
+
+def search_problems(query):
+    query = (query or "").strip()
+    ts_query = _prefix_query(query)
+
+    if ts_query is None:
+        return Problem.objects.none().annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+    match = Q(search_vector=ts_query)
+    rank = SearchRank(F('search_vector'), ts_query)
+
+    if trigram_available():
+        match |= Q(title__trigram_similar=query)
+        rank = rank + TrigramSimilarity('title', query)
+
+    # double precision, so the rank survives the round trip through the cursor exactly
+    problems = Problem.objects.filter(match).annotate(search_rank=Cast(rank, FloatField()))
+
+    return problems.order_by(*SEARCH_ORDERING)
@@ -0,0 +1,60 @@
+from django.db.models import Count, Max
+from core.models import SolvedProblem, Submission
+from core.utils.referenceCache import VersionedCache, cache_is_shared
+
+
+"""
+    Per user solved problem set (SolvedProblem).
+
+    Problem listings show whether the logged-in user solved each problem. Instead of an Exists() subquery
+    against the submissions table for every listed problem, a listing reads the user's solved problem ids
+    once (one index scan on solved_problem_unique, its size depends on problems solved, not submissions made)
+    and marks the page in memory.
+"""
+
+
+def _solved_cache(user_id):
+    # only the version is used, it tells listings (core/utils/conditionalGet.py) the user's solved set changed
+    return VersionedCache(f"solved:{user_id}")
+
+
+def solved_version(user):
+    if not cache_is_shared():
+        # the judge worker records solved problems in its own process, its bumps never reach a process-local cache
+        solved = SolvedProblem.objects.filter(user_id=user.pk).aggregate(count=Count('id'), last=Max('id'))
+        return f"{solved['count']}:{solved['last']}"
+
+    return _solved_cache(user.pk).version()
+
+
+def solved_problem_ids(user):
+    return set(SolvedProblem.objects.filter(user=user).values_list('problem_id', flat=True))
+
+
+"""
+    In mark_solved function, we set user_submission_passed on every problem of a listing page.
+    Returns problems as a list, so it can be given a queryset.
+"""
+
+def mark_solved(problems, user):
+    problems = list(problems)
+    solved = solved_problem_ids(user) if problems else set()
+
+    for problem in problems:
+        problem.user_submission_passed = problem.id in solved
+
+    return problems
+
+
+"""
+    In record_solved function, we add the submission's problem to its user's solved set.
+    Called by refresh_submission_status when a submission becomes Passed, solving the same problem again is a no-op.
+"""
+
+def record_solved(submission):
+    if submission.status == Submission.Status.PASSED:
+        SolvedProblem.objects.bulk_create(
+            [SolvedProblem(user_id=submission.user_id, problem_id=submission.problem_id)],
+            ignore_conflicts=True
+        )
+        _solved_cache(submission.user_id).bump_on_commit()
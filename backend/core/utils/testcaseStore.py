@@ -0,0 +1,96 @@
+import zlib
+import hashlib
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from core.models import ProblemTestCase, TestCaseBlob
+
+
+"""
+    Content addressed store for hidden testcases (TestCaseBlob / ProblemTestCase).
+
+    Every input and expected output is stored once as a zlib compressed blob keyed by its sha256,
+    problems only keep an ordered list of (input digest, expected digest) pairs.
+    Testcases use the same {"input", "expected"} dicts the API accepts.
+"""
+
+COMPRESSION_LEVEL = 6
+
+
+def _digest(raw):
+    return hashlib.sha256(raw).hexdigest()
+
+
+def _blob(text):
+    raw = (text or "").encode('utf-8')
+    return TestCaseBlob(digest=_digest(raw), data=zlib.compress(raw, COMPRESSION_LEVEL), size=len(raw))
+
+
+"""
+    In store_testcases function, we replace the testcases of a problem.
+    Blobs that already exist (same content in this or any other problem) are reused, not written again,
+    blobs only the old testcases used are deleted.
+"""
+
+def store_testcases(problem, testcases):
+    pairs = [(_blob(tc.get('input')), _blob(tc.get('expected'))) for tc in testcases]
+    blobs = {blob.digest: blob for pair in pairs for blob in pair}
+
+    with transaction.atomic():
+        TestCaseBlob.objects.bulk_create(blobs.values(), ignore_conflicts=True, batch_size=500)
+
+        old_digests = problem_digests(problem.id)
+        ProblemTestCase.objects.filter(problem=problem).delete()
+        ProblemTestCase.objects.bulk_create(
+            [
+                ProblemTestCase(problem=problem, position=position, input_id=input_blob.digest, expected_id=expected_blob.digest)
+                for position, (input_blob, expected_blob) in enumerate(pairs)
+            ],
+            batch_size=500
+        )
+
+        prune_blobs(old_digests - set(blobs))
+
+
+"""
+    In load_testcases function, we read the testcases of a problem back, in order, with a single query.
+"""
+
+def load_testcases(problem_id):
+    rows = ProblemTestCase.objects.filter(problem_id=problem_id).select_related('input', 'expected').order_by('position')
+
+    return [
+        {
+            "input": zlib.decompress(row.input.data).decode('utf-8'),
+            "expected": zlib.decompress(row.expected.data).decode('utf-8'),
+        }
+        for row in rows
+    ]
+
+
+"""
+    Returns the digests of every blob a problem uses.
+"""
+
+def problem_digests(problem_id):
+    digests = set()
+    for input_id, expected_id in ProblemTestCase.objects.filter(problem_id=problem_id).values_list('input_id', 'expected_id'):
+        digests.update((input_id, expected_id))
+    return digests
+
+
+"""
+    Deletes the given blobs unless some problem still refers to them.
+    Returns how many were removed.
+"""
+
+def prune_blobs(digests):
+    if not digests:
+        return 0
+
+    deleted, _ = TestCaseBlob.objects.filter(digest__in=digests).exclude(
+        Exists(ProblemTestCase.objects.filter(input=OuterRef('pk')))
+    ).exclude(
+        Exists(ProblemTestCase.objects.filter(expected=OuterRef('pk')))
+    ).delete()
+
+    return deleted
@@ -4,8 +4,8 @@ from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from core.utils.roleRequired import RoleRequired
 from core.serializers.createProblem import CreateProblemSerializer
-from core.models import Language
-from core.utils.judge0 import submit_batch, poll_batch_results
+from core.utils.referenceCache import get_language
+from core.utils.executor import get_executor
 from core.models import Problem
 
 
@@ -63,6 +63,7 @@ class CreateProblemView(APIView):
 
         valid_data = []
         failed_problems = []
+        executor = get_executor()
 
         for data in data_list:
             title = data.get('title')
@@ -84,15 +85,12 @@ class CreateProblemView(APIView):
 
             try:
                 for language, solution_code in reference_solutions.items():
-                    try:
-                        languageId = Language.objects.get(
-                            name=language.capitalize(),
-                            isActive=True
-                        ).langId
-                    except Language.DoesNotExist:
+                    languageObj = get_language(language)
+                    if languageObj is None:
                         problem_failed = True
                         error_detail = f"Language {language} is not supported"
                         break
+                    languageId = languageObj.langId
 
                     submission = [
                         {
@@ -104,8 +102,8 @@ class CreateProblemView(APIView):
                         for tc in testcases
                     ]
 
-                    tokens = submit_batch(submission)
-                    results = poll_batch_results(tokens)
+                    tokens = executor.submit_batch(submission, callback=False)
+                    results = executor.poll_batch_results(tokens)
 
                     for index, res in enumerate(results):
                         if res['status']['id'] != 3:
@@ -1,126 +1,141 @@
-from django.db.models import Q
-from django.forms import FloatField
-from django.utils.dateparse import parse_datetime
-from django.db.models import Max, FloatField
-from django.db.models.functions import Cast
+from django.db.models import Prefetch
 from django.utils.timezone import make_aware
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from core.utils.roleRequired import RoleRequired
-from core.models import Problem, Submission, Tag
-from django.db.models import OuterRef, Exists
-from django.shortcuts import get_object_or_404 , get_list_or_404
+from core.models import Problem, Submission, SubmissionTestCase, Tag
+from core.utils.judging import PENDING_TESTCASE_STATUSES
+from core.utils.solved import mark_solved
+from core.utils.search import search_problems, SEARCH_ORDERING
+from core.utils.pagination import KeysetPaginator
+from core.utils.referenceCache import all_languages, all_tags
+from core.utils.conditionalGet import conditional_get, listing_etag
+from django.http import Http404
+from core.utils.problemFilter import parse_problem_filter, filter_problems, problem_facets
+from django.shortcuts import get_object_or_404
 from core.serializers.getAllProblem import (
     GetAllProblemSerializer, 
     GetProblemSubmissionsForUserSerailizer, 
     GetUserProblemSubmissionDetailSerializer, 
-    GetAllTagsSerializer,
-    GetAllLanguagesSerializer,
     GetUserProblemSubmissionTestCasesSerializer
 )
-from core.models import Language
 
 
+"""
+    Tags of every problem in a listing, loaded with one extra query for the whole page
+    instead of one per problem in GetAllProblemSerializer (which only needs the slug).
+"""
+
+def problem_tags():
+    return Prefetch('tags', queryset=Tag.objects.only('id', 'slug'))
+
+
+
+"""
+    Every list endpoint pages with a KeysetPaginator (core/utils/pagination.py):
+    ?limit=10&cursor=<next_cursor of the previous page>, responses carry "next_cursor" and "has_more".
+    Problem listings walk the (-created_at, -id) index, submissions the (user, problem, -created_at, -id) one.
+
+    Problem listings answer conditional requests (If-None-Match) with a 304 without touching the database,
+    see listing_etag in core/utils/conditionalGet.py.
+"""
+
+PROBLEMSET_PAGINATOR = KeysetPaginator(['-created_at', '-id'])
+SEARCH_PAGINATOR = KeysetPaginator(SEARCH_ORDERING, default_limit=20)
+SUBMISSIONS_PAGINATOR = KeysetPaginator(['-created_at', '-id'], default_limit=20)
+
+
+"""
+    In problem_page function, we read the requested page of a problem listing, tags prefetched and user_submission_passed set.
+    Raises ValueError for a malformed limit or cursor.
+"""
+
+def problem_page(problems, request, paginator=PROBLEMSET_PAGINATOR):
+    problems, next_cursor, has_more = paginator.paginate(problems.prefetch_related(problem_tags()), request.GET)
+    return mark_solved(problems, request.user), next_cursor, has_more
+
+
+def problem_page_response(message, page, **extra):
+    problems, next_cursor, has_more = page
+
+    return Response(
+        {
+            "message": message if problems else "No more problems",
+            "success": True,
+            "data": GetAllProblemSerializer(problems, many=True).data,
+            "next_cursor": next_cursor,
+            "has_more": has_more,
+            **extra
+        },
+        status=status.HTTP_200_OK
+    )
+
 
 
 """
     View to get all problems with an additional field indicating if the logged-in user has a "passed" submission for each problem.
 
-    How Subquery and annotate work here:
-    - A subquery is defined to filter submissions based on the problem, user, and status.
-        OuterRef - used to reference the outer query's fields (in this case, the Problem's primary key).
-    - The main query annotates each Problem with a boolean field user_submission_passed.
-    - The Exists function checks if the subquery returns any results for each problem.
-        - if subquery returns results, user_submission_passed is True
+    user_submission_passed comes from the user's solved problem set (core/utils/solved.py):
+    - the page of problems is fetched on its own, without touching the submissions table
+    - mark_solved reads the ids of the problems the user solved once and sets the flag on each problem in memory
 """
 
 class GetAllProblemView(APIView):
     
     permission_classes = [IsAuthenticated]
    
+    @conditional_get(listing_etag)
     def get(self, request):
         try:
-            limit = int(request.GET.get('limit', 10))  # how many items per batch 
-            cursor_date = request.GET.get('cursor_date')  # cursor for pagination
-            cursor_id = request.GET.get('cursor_id')  # cursor for pagination
-            
-            
-            # Convert cursor_date from string to datetime
-            if cursor_date:
-                # Replace spaces with + to handle unencoded URLs
-                cursor_date = cursor_date.replace(' ', '+')
-                dt = parse_datetime(cursor_date)
-                if dt is None:
-                    return Response({"error": "Invalid cursor_date"}, status=400)
-                cursor_date = dt
-            
-            
-            if cursor_id:
-                try:
-                    cursor_id = int(cursor_id)
-                except ValueError:
-                    return Response({"error": "Invalid cursor_id"}, status=400)
-
-
-            # Define the subquery
-            subquery = Submission.objects.filter(
-                problem=OuterRef('pk'),   # links Problem to Submission
-                user=request.user,        # filters submissions by logged-in user
-                status="Passed"           # filters submissions where status is "passed"
+            try:
+                page = problem_page(Problem.objects.listing(), request)
+            except ValueError as e:
+                return Response({"error": str(e)}, status=400)
+
+            return problem_page_response("Problems fetched successfully", page)
+        
+        except Exception as e:
+            return Response(
+                {
+                    "message" : "Error occured",
+                    "success" : False,
+                    "error" : str(e)
+                },
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
-            
 
-            problems = Problem.objects.annotate(
-                user_submission_passed = Exists(subquery)
-            ).order_by('-created_at', '-id')
 
 
-            # Apply cursor (fetch only items after given cursor)
-            if cursor_date and cursor_id:
-                problems = problems.filter(
-                    Q(created_at__lt=cursor_date) |
-                    Q(created_at=cursor_date, id__lt=cursor_id)
-                )
+"""
+    View to filter the problemset by tags (all of them), difficulty (any of them) and solved / unsolved,
+    see core/utils/problemFilter.py.
 
-            
-            # Fetch one extra to check if more items exist
-            problems = list(problems[:limit])
-            has_more = len(problems) == limit
+    ?tags=array,graph&difficulty=easy,medium&status=unsolved&limit=10&cursor=...
 
+    Paginates like the problemset and returns the facet counts for the current filters next to the page:
+        "facets": {"difficulty": {"Easy": 3, ...}, "status": {"solved": 1, "unsolved": 4}, "tags": {"array": 2, ...}}
+    Facets are only computed for the first page (no cursor), later pages have the same ones.
+"""
 
-            if not problems:
-                return Response({
-                    "message": "No more problems",
-                    "success": True,
-                    "data": [],
-                    "next_cursor_date": None,
-                    "next_cursor_id": None,
-                    "has_more": False
-                }, status=status.HTTP_200_OK)
+class GetFilteredProblemsView(APIView):
 
+    permission_classes = [IsAuthenticated]
 
-            serializer = GetAllProblemSerializer(problems, many=True)
+    @conditional_get(listing_etag)
+    def get(self, request):
+        try:
+            try:
+                filters = parse_problem_filter(request.GET)
+                page = problem_page(filter_problems(Problem.objects.listing(), request.user, **filters), request)
+            except ValueError as e:
+                return Response({"error": str(e)}, status=400)
 
+            facets = None if request.GET.get('cursor') else problem_facets(request.user, **filters)
+
+            return problem_page_response("Filtered problems fetched successfully", page, facets=facets)
 
-            # Set next cursor
-            last_problem = problems[-1]
-            next_cursor_date = last_problem.created_at.isoformat()
-            next_cursor_id = last_problem.id
-            
-            return Response(
-                {
-                    "message": "Problems fetched successfully",
-                    "success": True,
-                    "data": serializer.data,
-                    "next_cursor_date": next_cursor_date,
-                    "next_cursor_id": next_cursor_id,
-                    "has_more": has_more
-                },
-                status=status.HTTP_200_OK
-            )
-        
         except Exception as e:
             return Response(
                 {
@@ -130,7 +145,6 @@ class GetAllProblemView(APIView):
                 },
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
-    
 
 
 """ 
@@ -140,25 +154,10 @@ class GetAllProblemView(APIView):
         - The submissions related to a problem can be accessed using the related manager submissions.
         - This is done through the foreign key relationship defined in the Submission model.
         - it is checking problem pk present in Submission model's problem field.
-    
-        
-    Annotate each Submission with runtime and memory values.
-
-    - `testcases__time` / `testcases__memory`:
-        Follows the reverse FK (Submission → SubmissionTestCase)
-        and gathers all `time` / `memory` values for that submission.
-
-    - `Cast(..., FloatField())`:
-        Converts CharField values (stored as strings in DB) into floats
-        so numeric aggregation can be applied.
-
-    - `Max(...)`:
-        Picks the **largest value** among all testcases for each submission.
-        (runtime = slowest testcase, memory = highest usage testcase)
 
-    - `.annotate(runtime=..., memory=...)`:
-        Adds two new fields to each Submission row in the queryset:
-        `.runtime` and `.memory`.
+    runtime and memory are Submission.max_time / max_memory (slowest / hungriest testcase),
+    stored when the submission is judged, so the listing reads a single table
+    through the (user, problem, -created_at, -id) index instead of aggregating testcases, newest first, a page at a time.
 """
 
 class GetUserProblemSubmissionsView(APIView):
@@ -169,10 +168,14 @@ class GetUserProblemSubmissionsView(APIView):
         problem = get_object_or_404(Problem, slug=slug)
 
         try:
-            submissions = problem.submissions.filter(user=request.user).order_by('-created_at').annotate(
-                runtime = Max(Cast("testcases__time", FloatField())),
-                memory = Max(Cast("testcases__memory", FloatField()))
+            submissions = problem.submissions.filter(user=request.user).select_related('language').only(
+                'id', 'problem', 'status', 'created_at', 'max_time', 'max_memory', 'language__name'
             )
+
+            try:
+                submissions, next_cursor, has_more = SUBMISSIONS_PAGINATOR.paginate(submissions, request.GET)
+            except ValueError as e:
+                return Response({"error": str(e)}, status=400)
             
             serializer = GetProblemSubmissionsForUserSerailizer(submissions, many=True)
 
@@ -180,7 +183,9 @@ class GetUserProblemSubmissionsView(APIView):
                 {
                     "message" : "all submissions by user for problem fetched successfully",
                     "success" : True,
-                    "data" : serializer.data
+                    "data" : serializer.data,
+                    "next_cursor" : next_cursor,
+                    "has_more" : has_more
                 },
                 status=status.HTTP_200_OK
             )
@@ -199,6 +204,11 @@ class GetUserProblemSubmissionsView(APIView):
 
 """
     View to get the details of a specific submission made by the logged-in user for a specific problem identified by its slug and submission ID.
+
+    - The submission must belong to the logged-in user and to the problem in the URL, anything else is a 404.
+    - Language is joined in the same query, the serializer reads instance.language.name.
+    - Testcase totals come from the counters refresh_submission_status keeps on Submission (passed_count / total_count).
+    - Failed testcases are fetched once, with only the columns GetUserProblemSubmissionTestCasesSerializer returns.
 """
 
 class GetUserProblemSubmissionDetailView(APIView):
@@ -207,29 +217,31 @@ class GetUserProblemSubmissionDetailView(APIView):
     
     def get(self, request, slug, id):
 
-        submission = get_object_or_404(Submission, id=id)
+        submission = get_object_or_404(
+            Submission.objects.select_related('language'),
+            id=id,
+            user=request.user,
+            problem__slug=slug
+        )
 
         serializer = GetUserProblemSubmissionDetailSerializer(submission)
 
-        submissionTestcases = submission.testcases.all()
-        
-        totalTestCases = submissionTestcases.count()
-        # print(totalTestCases)
-
-        totalPassedTestCases = submissionTestcases.filter(status="Accepted").count()
-        # print(totalPassedTestCases)
-
-        failedTestCases = submissionTestcases.filter(
-            Q(status="Wrong Answer") | Q(status="Runtime Error") | Q(status="Time Limit Exceeded") | Q(status="Compilation Error")
-        )
+        # finished with a verdict other than Accepted, skipped and still running testcases are not failures
+        failedTestCases = submission.testcases.exclude(
+            status__in=[
+                SubmissionTestCase.Status.ACCEPTED,
+                SubmissionTestCase.Status.SKIPPED,
+                *PENDING_TESTCASE_STATUSES,
+            ]
+        ).only('submission', *GetUserProblemSubmissionTestCasesSerializer.Meta.fields).order_by('id')
     
         return Response(
             {
                 "message" : "submission fetched successfully",
                 "success" : True,
                 "data" : serializer.data,
-                "totalTestCases" : totalTestCases,
-                "totalPassedTestCases" : totalPassedTestCases,
+                "totalTestCases" : submission.total_count,
+                "totalPassedTestCases" : submission.passed_count,
                 "failedTestCases" : GetUserProblemSubmissionTestCasesSerializer(
                     failedTestCases,
                     many=True
@@ -242,81 +254,63 @@ class GetUserProblemSubmissionDetailView(APIView):
 
 """ 
     View to get all tags or problems associated with a specific tag identified by its slug.
+    The tag list is a small lookup table the problemset shows in full, served from the reference data cache (core/utils/referenceCache.py),
+    the problems are paginated.
 """
 
 class GetTagProblemsView(APIView):
 
     permission_classes = [IsAuthenticated]
 
+    @conditional_get(listing_etag)
     def get(self, request, slug=None):
         if not slug:
-            tags = get_list_or_404(Tag)
-            serializer = GetAllTagsSerializer(tags, many=True)
+            tags = all_tags()
+            if not tags:
+                raise Http404("No Tag matches the given query.")
             return Response(
                 {
                     "message" : "all tags fetched successfully",
                     "success" : True,
-                    "data" : serializer.data
+                    "data" : tags
                 },
                 status=status.HTTP_200_OK
             )
 
         else:
 
-            # Define the subquery
-            subquery = Submission.objects.filter(
-                problem=OuterRef('pk'),   # links Problem to Submission
-                user=request.user,        # filters submissions by logged-in user
-                status="Passed"           # filters submissions where status is "passed"
-            )
+            try:
+                page = problem_page(Problem.objects.listing().filter(tags__slug=slug), request)
+            except ValueError as e:
+                return Response({"error": str(e)}, status=400)
+
+            return problem_page_response("Problems for the tag fetched successfully", page)
         
-            problems = Problem.objects.annotate(
-                user_submission_passed = Exists(subquery)
-            ).filter(tags__name=slug).order_by('-created_at')
 
-            serializer = GetAllProblemSerializer(problems, many=True)
 
-            return Response(
-                {
-                    "message" : "Problems for the tag fetched successfully",
-                    "success" : True,
-                    "data" : serializer.data
-                },
-                status=status.HTTP_200_OK
-            )
-        
+"""
+    View to search problems by title, tags and description (see core/utils/search.py).
 
+    - every word of the query matches as a prefix, title matches rank above tag matches, tag matches above description matches
+    - close misspellings of the title still match when pg_trgm is installed
+    - results are paginated with an opaque cursor: pass next_cursor back as cursor to get the next page
+"""
 
 class GetSearchResultView(APIView):
     permission_classes = [IsAuthenticated]
 
+    @conditional_get(listing_etag)
     def get(self, request):
         query = request.GET.get('query')
-        try:
 
-            # Define the subquery
-            subquery = Submission.objects.filter(
-                problem=OuterRef('pk'),   # links Problem to Submission
-                user=request.user,        # filters submissions by logged-in user
-                status="Passed"           # filters submissions where status is "passed"
-            )
-        
-            problems = Problem.objects.annotate(
-                user_submission_passed = Exists(subquery)
-            ).order_by('-created_at').filter(
-                Q(title__icontains=query)
-            )
+        try:
+            try:
+                page = problem_page(search_problems(query).only(*Problem.LISTING_FIELDS), request, SEARCH_PAGINATOR)
+            except ValueError as e:
+                return Response({"error": str(e)}, status=400)
 
-            serializer = GetAllProblemSerializer(problems, many=True)
+            return problem_page_response("Search result fetched successfully", page)
 
-            return Response(
-                {
-                    "message" : "Search result fetched successfully",
-                    "success" : True,
-                    "data" : serializer.data
-                },
-                status=status.HTTP_200_OK
-            )
         except Exception as e:
             return Response(
                 {
@@ -329,15 +323,11 @@ class GetSearchResultView(APIView):
 
 class GetAllLanguages(APIView):
     def get(self, request):
-        languages = Language.objects.all()
-
-        serializer = GetAllLanguagesSerializer(languages, many=True)
-
         return Response(
             {
                 "message" : "Languages fetched successfully",
                 "success" : True,
-                "data" : serializer.data
+                "data" : all_languages()
             },
             status=status.HTTP_200_OK
         )
\ No newline at end of file
@@ -0,0 +1,83 @@
+import hmac
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status
+from rest_framework.permissions import AllowAny
+from core.models import Submission, SubmissionTestCase
+from core.utils.judge0 import JUDGE0_CALLBACK_SECRET, decode_callback
+from core.utils.judging import ingest_harness_result, ingest_results
+
+
+"""
+    Receives Judge0 callbacks.
+
+    When JUDGE0_CALLBACK_URL and JUDGE0_CALLBACK_SECRET are set, submit_batch registers
+    callback_url on every submission and Judge0 sends a PUT here with the finished submission.
+    We match it to SubmissionTestCase.token (or Submission.judge_token for compile once harness runs),
+    store the verdict and refresh the Submission status,
+    so the judgeworker only has to run a slow fallback sweep for callbacks that got lost.
+
+    Judge0 can not send our auth cookies, so the request is authenticated with the shared secret
+    that was put in the callback URL's query string.
+    Unknown tokens are acknowledged with 200 so Judge0 does not keep retrying them.
+    That includes a callback that beats the write of its token: dispatch stamps updated_at with the token,
+    so the judge worker polls that testcase once CALLBACK_GRACE_PERIOD has passed since dispatch.
+"""
+
+class Judge0CallbackView(APIView):
+
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    def put(self, request):
+        secret = request.query_params.get('secret', '')
+
+        if not JUDGE0_CALLBACK_SECRET or not hmac.compare_digest(secret, JUDGE0_CALLBACK_SECRET):
+            return Response(
+                {
+                    "message" : "Invalid callback secret",
+                    "success" : False
+                },
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        token = request.data.get('token')
+        if not token or not request.data.get('status'):
+            return Response(
+                {
+                    "message" : "Invalid callback payload",
+                    "success" : False
+                },
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        testcase = SubmissionTestCase.objects.filter(token=token).only('id', 'submission_id').first()
+
+        if testcase is None:
+            harness_submission_id = Submission.objects.filter(judge_token=token).values_list('id', flat=True).first()
+
+            if harness_submission_id is None:
+                return Response(
+                    {
+                        "message" : "Unknown token",
+                        "success" : True
+                    },
+                    status=status.HTTP_200_OK
+                )
+
+            ingest_harness_result(harness_submission_id, decode_callback(request.data))
+        else:
+            # locks the submission, so callbacks for its other testcases see each other's verdicts
+            ingest_results(testcase.submission_id, [decode_callback(request.data)])
+
+        return Response(
+            {
+                "message" : "Callback processed",
+                "success" : True
+            },
+            status=status.HTTP_200_OK
+        )
+
+    def post(self, request):
+        return self.put(request)
+
@@ -1,12 +1,19 @@
+from django.db import transaction
+from django.http import Http404, HttpResponse
 from django.shortcuts import get_object_or_404
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
-from core.utils.judge0 import poll_batch_results, submit_batch
+from core.utils.executor import get_executor
+from core.utils.fastJson import ORJSONRenderer
 from core.utils.roleRequired import RoleRequired
 from core.serializers.problem import GetProblemSerializer, PatchProblemSerializer
-from core.models import Language, Problem
+from core.models import Problem
+from core.utils.referenceCache import get_language
+from core.utils.conditionalGet import conditional_get, problem_etag, problem_last_modified, problem_row
+from core.utils.renderedCache import problem_pages
+from core.utils.testcaseStore import problem_digests, prune_blobs
 
 
 """
@@ -62,19 +69,39 @@ class ProblemView(APIView):
         return super().get_permissions()
     
    
+    # a client that has this version of the problem gets a 304 after one (id, updated_at) lookup, see core/utils/conditionalGet.py
+    @conditional_get(problem_etag, problem_last_modified)
     def get(self, request, slug):
-        
-        obj = get_object_or_404(Problem, slug=slug)
-            
-        return Response(
-            {
-                "message" : "problem fetched successfully",
-                "success" : True,
-                "data" : GetProblemSerializer(instance=obj).data
-            },
-            status=status.HTTP_200_OK
+
+        row = problem_row(request, slug)
+        if row is None:
+            raise Http404("No Problem matches the given query.")
+
+        # the page is the same for every user: JSON clients get the body rendered once per version of the problem
+        # (core/utils/renderedCache.py), the browsable API renders it as usual
+        if request.accepted_renderer.format != 'json':
+            return Response(self.problem_page(slug), status=status.HTTP_200_OK)
+
+        problem_id, updated_at = row
+        body = problem_pages.get(problem_id, updated_at, lambda: ORJSONRenderer().render(self.problem_page(slug)))
+
+        return HttpResponse(body, content_type='application/json', status=status.HTTP_200_OK)
+
+
+    def problem_page(self, slug):
+
+        # reference solutions are never sent to clients, don't read them either
+        obj = get_object_or_404(
+            Problem.objects.defer('reference_solutions', 'search_vector').select_related('user').prefetch_related('tags'),
+            slug=slug
         )
 
+        return {
+            "message" : "problem fetched successfully",
+            "success" : True,
+            "data" : GetProblemSerializer(instance=obj).data
+        }
+
     
 
     def patch(self, request, slug):
@@ -115,13 +142,10 @@ class ProblemView(APIView):
         try:
             # Only proceed with Judge0 validation if reference_solutions and testcases are provided
             if reference_solutions is not None and testcases is not None:
+                executor = get_executor()
                 for language, solution_code in reference_solutions.items():
-                    try:
-                        languageId = Language.objects.get(
-                            name=language.capitalize(),
-                            isActive=True
-                        ).langId
-                    except Language.DoesNotExist:
+                    languageObj = get_language(language)
+                    if languageObj is None:
                         return Response(
                             {
                                 "message": f"Language {language} is not supported",
@@ -129,6 +153,7 @@ class ProblemView(APIView):
                             },
                             status=status.HTTP_400_BAD_REQUEST
                         )
+                    languageId = languageObj.langId
 
                     submission = [
                         {
@@ -140,8 +165,8 @@ class ProblemView(APIView):
                         for tc in testcases
                     ]
 
-                    tokens = submit_batch(submission)
-                    results = poll_batch_results(tokens)
+                    tokens = executor.submit_batch(submission, callback=False)
+                    results = executor.poll_batch_results(tokens)
 
                     for index, res in enumerate(results):
                         if res['status']['id'] != 3:
@@ -178,9 +203,12 @@ class ProblemView(APIView):
 
     def delete(self, request, slug):
         
-        instance = get_object_or_404(Problem, slug=slug)
+        instance = get_object_or_404(Problem.objects.only('id'), slug=slug)
 
-        instance.delete()
+        with transaction.atomic():
+            digests = problem_digests(instance.id)
+            instance.delete()
+            prune_blobs(digests)
 
         return Response(
             {
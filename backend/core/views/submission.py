@@ -2,10 +2,14 @@ from rest_framework.views import APIView
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from core.models import Problem, Language, Submission, SubmissionTestCase
+from core.models import Submission, SubmissionTestCase
 from django.shortcuts import get_object_or_404
-from core.serializers.submission import SubmitProblemSerializer
-from core.utils.judge0 import submit_batch, poll_batch_results
+from core.serializers.submission import SubmitProblemSerializer, SubmissionTestCaseResultSerializer
+from core.utils.judging import dispatch_harness, dispatch_testcases, next_wave
+from core.utils.harness import harness_supported
+from core.utils.testcaseStore import load_testcases
+from core.utils.referenceCache import get_language, submission_problem
+from django.http import Http404
 
 
 """
@@ -13,7 +17,7 @@ from core.utils.judge0 import submit_batch, poll_batch_results
     2. check if request data is valid through serializer
     3. Get language id from db
     4. Create submission and submissiontestcase rows for each testcase stored in problem object in JSON format
-    5. create batch of submissions to judge0
+    5. create batch of submissions to judge0 (only the first wave for fail fast submissions)
     6. send batch to judge0
     7. will get tokens from judge0
     8. will update submissiontestcase objects
@@ -25,7 +29,9 @@ class SubmitProblemView(APIView):
     permission_classes = [IsAuthenticated]
     
     def post(self, request):
-        problem = get_object_or_404(Problem, slug=request.data.get('problem'))
+        problem = submission_problem(request.data.get('problem'))
+        if problem is None:
+            raise Http404("No Problem matches the given query.")
 
         try:
             serializer = SubmitProblemSerializer(data=request.data)
@@ -41,13 +47,9 @@ class SubmitProblemView(APIView):
                 )
         
 
-            # 1. Get Language id from db
-            try:
-                language = Language.objects.get(
-                    name = serializer.validated_data.get('language').capitalize(),
-                    isActive = True
-                )
-            except Language.DoesNotExist:
+            # 1. Get Language (reference data cache, see core/utils/referenceCache.py)
+            language = get_language(serializer.validated_data.get('language'))
+            if language is None:
                 return Response(
                     {
                         "message" : "Language not found",
@@ -58,55 +60,43 @@ class SubmitProblemView(APIView):
 
             source_code = serializer.validated_data.get('source_code')
 
+            # fail fast comes from the request when given, otherwise from the problem
+            fail_fast = serializer.validated_data.get('fail_fast', problem.fail_fast)
+
+            # hidden testcases come from the testcase store, not the Problem row
+            problem_testcases = load_testcases(problem.id)
+
             # 2 create submission
             submission = Submission.objects.create(
                 user = request.user,
                 problem=problem,
                 language=language,
                 source_code=source_code,
-                status=Submission.Status.PENDING
+                status=Submission.Status.PENDING,
+                fail_fast=fail_fast,
+                total_count=len(problem_testcases)
             )
         
             # 3. Create SubmissionTestCase rows
-            testcases = []
-            batch = []
-        
-            for tc in problem.testcases:
-                stc = SubmissionTestCase(
+            testcases = [
+                SubmissionTestCase(
                     submission=submission,
                     input_data=tc["input"],
                     expected_output=tc["expected"],
                     status=SubmissionTestCase.Status.IN_QUEUE
                 )
-                testcases.append(stc)
-
-                batch.append(
-                    {
-                        "language_id": language.langId,
-                        "source_code": source_code,
-                        "stdin": tc["input"],
-                        "expected_output": tc["expected"],
-                    }
-                )
+                for tc in problem_testcases
+            ]
             SubmissionTestCase.objects.bulk_create(testcases)
 
-            print(testcases)
-            # print(batch)
-
-            # 4. Send batch to Judge0
+            # 4. Send batch to Judge0, fail fast submissions only send their first wave,
+            #    the judge worker sends the following ones as verdicts come in
+            #    compiled languages can be judged by one compile once harness instead (JUDGE0_COMPILE_ONCE)
             try : 
-                tokens = submit_batch(batch) # returns ["tok1", "tok2", ...]
-                print(tokens)
-
-                """
-                    can use zip() to map tokens to testcases and update them
-                    The zip() function takes multiple iterables (like lists, tuples, etc.) and pairs up the elements from each iterable based on their position (index).
-                """
-                
-                for idx, testcase in enumerate(testcases):
-                    testcase.token = tokens[idx]
-
-                SubmissionTestCase.objects.bulk_update(testcases, ["token"])
+                if harness_supported(language.name, len(testcases)):
+                    dispatch_harness(submission, testcases)
+                else:
+                    dispatch_testcases(submission, next_wave(submission, testcases))
 
             except Exception as e:
                 return Response(
@@ -139,6 +129,13 @@ class SubmitProblemView(APIView):
             )
 
 
+"""
+    Returns the current state of a submission straight from the database.
+    Judge0 is never contacted here, the judgeworker management command polls Judge0 in the background
+    and keeps SubmissionTestCase rows and Submission.status up to date.
+    Clients should call this endpoint again while status is "Pending".
+"""
+
 class SubmitProblemStatusView(APIView):
 
     permission_classes = [IsAuthenticated]
@@ -147,10 +144,9 @@ class SubmitProblemStatusView(APIView):
         
         submission = get_object_or_404(Submission, id=id, user=request.user)
 
-        # Get all tokens for this submission
-        tokens = list(submission.testcases.values_list("token", flat=True))
+        testcases = list(submission.testcases.order_by('id'))
 
-        if not tokens:
+        if not testcases:
             return Response(
                 {
                     "message" : "no test cases found",
@@ -159,63 +155,13 @@ class SubmitProblemStatusView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        try:
-            # Poll Judge0
-            results = poll_batch_results(tokens=tokens)
-            # print(results)
-
-            # Update SubmissionTestCase objects
-            testcase_mp = {tc.token:tc for tc in submission.testcases.all()}
-            # print(testcase_mp)
-
-            for r in results:
-                tc = testcase_mp[r['token']]
-                tc.stdout = r.get("stdout")
-                tc.stderr = r.get("stderr")
-                tc.memory = r.get("memory")
-                tc.time = r.get("time")
-                tc.status = r['status']['description']
-                tc.compile_output = r.get('compile_output')
-                tc.save()
-                
-            statuses = [tc.status for tc in submission.testcases.all()]
-
-            if all(s == "Accepted" for s in statuses):
-                submission.status = Submission.Status.PASSED
-            elif any(s in ["Runtime Error", "Wrong Answer", "Compilation Error",  "Time Limit Exceeded"] for s in statuses):
-                submission.status = Submission.Status.FAILED
-            else:
-                submission.status = Submission.Status.PENDING
-
-            submission.save()
-
-            return Response(
-                {
-                    "message" : "Updated data fetched",
-                    "success" : True,
-                    "submission_id": submission.id,
-                    "status": submission.status,
-                    "testcases": [
-                        {
-                            "id": tc.id,
-                            "input": tc.input_data,
-                            "expected": tc.expected_output,
-                            "stdout": tc.stdout,
-                            "stderr": tc.stderr,
-                            "status": tc.status,
-                        }
-                        for tc in submission.testcases.all()
-                    ]
-                },
-                status=status.HTTP_200_OK
-            )
-
-        except Exception as e:
-            return Response(
-                {
-                    "message" : "Failed to get updated data",
-                    "success" : False,
-                    "error" : str(e)
-                },
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
\ No newline at end of file
+        return Response(
+            {
+                "message" : "Updated data fetched",
+                "success" : True,
+                "submission_id": submission.id,
+                "status": submission.status,
+                "testcases": SubmissionTestCaseResultSerializer(testcases, many=True).data
+            },
+            status=status.HTTP_200_OK
+        )
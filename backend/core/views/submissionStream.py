@@ -0,0 +1,81 @@
+import json
+import time
+import asyncio
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views import View
+from rest_framework import exceptions
+from account.authentication import cookieJWTAuthentication
+from core.models import Submission, SubmissionTestCase
+from core.serializers.submission import SubmissionTestCaseResultSerializer
+
+
+STREAM_POLL_INTERVAL = 0.5  # seconds between database checks
+STREAM_HEARTBEAT_INTERVAL = 15  # seconds, keeps proxies from closing an idle stream
+STREAM_MAX_DURATION = 300  # seconds, the client can reconnect if judging takes longer
+
+
+"""
+    Server-Sent Events stream of the verdicts of one submission.
+
+    This is a plain async Django view (DRF views are sync only), so when the project is served
+    through levelupcode/asgi.py an open stream costs an idle coroutine instead of a worker thread.
+
+    Events:
+        testcase - a SubmissionTestCase changed, data is the same shape as SubmitProblemStatusView testcases
+        status   - the submission finished, data is {"submission_id", "status"}, the stream closes after it
+
+    The judgeworker / Judge0 callbacks write the verdicts, this view only watches the database.
+    Authentication uses the same access cookie as the rest of the API, EventSource sends it with withCredentials.
+"""
+
+class SubmissionStreamView(View):
+
+    async def get(self, request, id):
+        try:
+            auth = await sync_to_async(cookieJWTAuthentication().authenticate)(request)
+        except exceptions.AuthenticationFailed as e:
+            return JsonResponse({"message": "Authentication failed", "success": False, "error": e.detail}, status=401)
+
+        if auth is None:
+            return JsonResponse({"message": "Authentication credentials were not provided.", "success": False}, status=401)
+
+        user, _ = auth
+        submission = await Submission.objects.filter(id=id, user_id=user.id).afirst()
+
+        if submission is None:
+            return JsonResponse({"message": "Submission not found", "success": False}, status=404)
+
+        response = StreamingHttpResponse(self.events(submission.id), content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'  # stop nginx from buffering the stream
+        return response
+
+
+    def event(self, name, data):
+        return f"event: {name}\ndata: {json.dumps(data)}\n\n"
+
+
+    async def events(self, submission_id):
+        sent = {}  # testcase id -> last status sent
+        started_at = last_sent_at = time.monotonic()
+
+        while time.monotonic() - started_at < STREAM_MAX_DURATION:
+            # read the status first, verdicts are always saved before the status that summarises them
+            submission = await Submission.objects.only('id', 'status').aget(id=submission_id)
+
+            async for tc in SubmissionTestCase.objects.filter(submission_id=submission_id).order_by('id'):
+                if sent.get(tc.id) != tc.status:
+                    sent[tc.id] = tc.status
+                    last_sent_at = time.monotonic()
+                    yield self.event('testcase', SubmissionTestCaseResultSerializer(tc).data)
+
+            if submission.status != Submission.Status.PENDING:
+                yield self.event('status', {"submission_id": submission.id, "status": submission.status})
+                return
+
+            if time.monotonic() - last_sent_at > STREAM_HEARTBEAT_INTERVAL:
+                last_sent_at = time.monotonic()
+                yield ": keep-alive\n\n"
+
+            await asyncio.sleep(STREAM_POLL_INTERVAL)
@@ -0,0 +1,32 @@
+#!/bin/sh
+# backend/entrypoint.sh
+# Container roles:
+#   web    (default) - uvicorn, plus the judge worker (manage.py judgeworker) in the background,
+#                      which polls Judge0 for every verdict. RUN_JUDGE_WORKER=False when it runs as its own service.
+#   worker           - only the judge worker, for a separate service / container of the same image
+#   anything else    - run as a command (python manage.py migrate ...)
+set -e
+
+judge_worker() {
+    # the worker survives failed sweeps itself, restart it if the process dies
+    while true; do
+        python manage.py judgeworker || true
+        echo "Judge worker exited, restarting in 5s" >&2
+        sleep 5
+    done
+}
+
+case "${1:-web}" in
+    web)
+        if [ "${RUN_JUDGE_WORKER:-True}" = "True" ]; then
+            judge_worker &
+        fi
+        exec uvicorn levelupcode.asgi:application --host 0.0.0.0 --port "${PORT:-10000}"
+        ;;
+    worker)
+        exec python manage.py judgeworker
+        ;;
+    *)
+        exec "$@"
+        ;;
+esac
@@ -62,6 +62,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
 
     'rest_framework',
     'account',
@@ -170,6 +171,28 @@ JWT_SECRET_KEY = config('JWT_SECRET_KEY')
 JWT_ALGORITHM = config('JWT_ALGORITHM', default='HS256')
 JWT_ACCESS_TOKEN_LIFETIME = timedelta(minutes=5)  # short lived access-token
 JWT_REFRESH_TOKEN_LIFETIME = timedelta(days=7)  # long lived refresh-token
+AUTH_USER_CACHE_TTL = config('AUTH_USER_CACHE_TTL', default=60, cast=int)  # seconds a lazily loaded request.user is cached
+
+
+# Cache Settings
+# Django's cache framework, Redis when REDIS_URL is set, locmem otherwise (a single process only, see below)
+REDIS_URL = config('REDIS_URL', default='')
+
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.redis.RedisCache' if REDIS_URL else 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default=REDIS_URL or 'levelupcode'),
+    }
+}
+
+# web server processes (uvicorn reads the same variable), more than one refuses to start on locmem
+WEB_CONCURRENCY = config('WEB_CONCURRENCY', default=1, cast=int)
+
+# shared tier of core/utils/referenceCache.py and how long its entries live there (seconds)
+REFERENCE_CACHE_ALIAS = config('REFERENCE_CACHE_ALIAS', default='default')
+REFERENCE_CACHE_TIMEOUT = config('REFERENCE_CACHE_TIMEOUT', default=3600, cast=int)
+# seconds a process keeps a version it read before asking the shared tier again
+REFERENCE_CACHE_VERSION_TTL = config('REFERENCE_CACHE_VERSION_TTL', default=1.0, cast=float)
 
 
 # COOKIE Settings
@@ -184,5 +207,14 @@ REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'account.authentication.cookieJWTAuthentication',  # Custom cookie-based JWT authentication
         'rest_framework_simplejwt.authentication.JWTAuthentication', # Fallback to header-based JWT authentication
-    )
+    ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'core.utils.fastJson.ORJSONRenderer',  # orjson when installed, same output as the stock JSONRenderer
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'core.utils.fastJson.ORJSONParser',  # orjson when installed, stock JSONParser otherwise
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
 }
\ No newline at end of file
@@ -12,8 +12,14 @@ const getAllTags = async function () {
     return response
 }
 
-const getTagProblems = async function (slug) {
-    const response = await axiosInstance.get(`core/problem/tags/${slug}/`)
+// params: { tags: "array,graph", difficulty: "easy,medium", status: "solved" | "unsolved", limit, cursor }
+const getFilteredProblems = async function (params = {}) {
+    const response = await axiosInstance.get("core/problem/problemset/filter/", { params });
+    return response;
+}
+
+const getTagProblems = async function (slug, params = {}) {
+    const response = await axiosInstance.get(`core/problem/tags/${slug}/`, { params })
     return response
 }
 
@@ -22,13 +28,14 @@ const getProblemBySlug = async function (slug) {
     return response
 }
 
-const getSearchProblems = async function (query){
-    const response = await axiosInstance.get(`core/problem/problemset/search/?query=${query}`)
+const getSearchProblems = async function (query, params = {}){
+    const response = await axiosInstance.get("core/problem/problemset/search/", { params: { query, ...params } })
     return response
 }
 
-const getProblemSubmissionsByUser = async function (slug) {
-    const response = await axiosInstance.get(`core/problem/${slug}/submissions/`)
+// params: { limit, cursor }, pages come back newest first with next_cursor / has_more
+const getProblemSubmissionsByUser = async function (slug, params = {}) {
+    const response = await axiosInstance.get(`core/problem/${slug}/submissions/`, { params })
     return response
 }
 
@@ -54,15 +61,37 @@ const submitProblemStatus = async function (data){
     return response
 }
 
+// Server-Sent Events stream of verdicts, onTestcase is called for every testcase update.
+// Resolves with the final submission status, rejects if the stream can not be used.
+const streamSubmissionStatus = function (id, onTestcase) {
+    return new Promise((resolve, reject) => {
+        const source = new EventSource(
+            `${import.meta.env.VITE_API_URL}core/problem/submit/${id}/stream/`,
+            { withCredentials: true }
+        )
+        source.addEventListener("testcase", (event) => onTestcase(JSON.parse(event.data)))
+        source.addEventListener("status", (event) => {
+            source.close()
+            resolve(JSON.parse(event.data).status)
+        })
+        source.onerror = () => {
+            source.close()
+            reject(new Error("Submission stream closed"))
+        }
+    })
+}
+
 export {
     getProblems,
     getAllTags,
     getTagProblems,
+    getFilteredProblems,
     getProblemBySlug,
     getProblemSubmissionsByUser,
     submitProblem,
     getAllLanguages,
     submitProblemStatus,
+    streamSubmissionStatus,
     getSubmissionDetail,
     getSearchProblems
 };
@@ -1,7 +1,7 @@
 import { CheckCircle2, Star, ChevronDown, Search, Hash, ArrowRight } from "lucide-react";
 import { useState, useRef } from "react";
 import useProblemStore from "../store/useProblemStore";
-import { getProblems, getTagProblems, getSearchProblems } from "../api/problemApi";
+import { getProblems, getTagProblems, getSearchProblems, getFilteredProblems } from "../api/problemApi";
 import { useNavigate } from "react-router-dom";
 import toast from "react-hot-toast";
 import { debounce } from "lodash";
@@ -10,8 +10,7 @@ export default function ProblemTable() {
   const {
     problems,
     hasMore,
-    nextCursorDate,
-    nextCursorId,
+    nextCursor,
     addProblems,
     setProblems,
     setNextCursor,
@@ -23,9 +22,22 @@ export default function ProblemTable() {
   } = useProblemStore();
 
   const [expanded, setExpanded] = useState(false);
+  const [filters, setFilters] = useState({ tags: null, difficulty: null, status: null });
   const tagsContainerRef = useRef(null);
   const navigate = useNavigate();
 
+  // fetches a page of the list currently shown (problemset, a tag or a search), "Load More" continues it
+  const fetchPageRef = useRef((params) => getProblems(params));
+
+  // Show the first page of a new list
+  const showFirstPage = async (fetchPage) => {
+    fetchPageRef.current = fetchPage;
+    const res = await fetchPage({ limit: 10 });
+    setProblems(res.data.data);
+    setNextCursor(res.data.next_cursor);
+    setHasMore(res.data.has_more);
+  };
+
   // Navigate to problem
   const handleNavigate = (slug) => {
     navigate("/problems/" + slug);
@@ -33,11 +45,13 @@ export default function ProblemTable() {
 
   // Fetch problems by tag
   const handleTagProblems = async (slug) => {
+    if (filters.difficulty || filters.status) {
+      return applyFilters({ ...filters, tags: slug });
+    }
     try {
       setProblemsLoading(true);
-      const res = await getTagProblems(slug);
-      setProblems(res.data.data);
-      setHasMore(false);
+      setFilters({ ...filters, tags: slug });
+      await showFirstPage((params) => getTagProblems(slug, params));
     } catch (error) {
       console.log("Error fetching tag problems:", error);
       toast.error("Failed to load problems for tag");
@@ -46,21 +60,43 @@ export default function ProblemTable() {
     }
   };
 
+  // Fetch problems by difficulty / status (and the selected tag), clicking an active filter again clears it
+  const toggleFilter = (key, value) => {
+    applyFilters({ ...filters, [key]: filters[key] === value ? null : value });
+  };
+
+  const applyFilters = async (next) => {
+    const active = Object.fromEntries(Object.entries(next).filter(([, value]) => value));
+    try {
+      setProblemsLoading(true);
+      setFilters(next);
+      await showFirstPage(
+        Object.keys(active).length
+          ? (params) => getFilteredProblems({ ...active, ...params })
+          : (params) => getProblems(params)
+      );
+    } catch (error) {
+      console.log("Error fetching filtered problems:", error);
+      toast.error(error.response?.data?.error || "Failed to filter problems");
+    } finally {
+      setProblemsLoading(false);
+    }
+  };
+
   // Load more problems
   const loadMoreProblems = async () => {
     try {
       setProblemsLoading(true);
       const scrollY = window.scrollY;
 
-      const response = await getProblems({
+      const response = await fetchPageRef.current({
         limit: 10,
-        cursor_date: nextCursorDate,
-        cursor_id: nextCursorId,
+        cursor: nextCursor,
       });
 
       if (response.data.success) {
         addProblems(response.data.data);
-        setNextCursor(response.data.next_cursor_date, response.data.next_cursor_id);
+        setNextCursor(response.data.next_cursor);
         setHasMore(response.data.has_more);
         
         setTimeout(() => {
@@ -82,9 +118,7 @@ export default function ProblemTable() {
     if (!query) return;
     try {
       setProblemsLoading(true);
-      const res = await getSearchProblems(query);
-      setProblems(res.data.data);
-      setHasMore(false);
+      await showFirstPage((params) => getSearchProblems(query, params));
     } catch (error) {
       console.log("Error fetching search problems:", error);
       toast.error("Failed to search problems");
@@ -130,6 +164,29 @@ export default function ProblemTable() {
             </div>
         </div>
 
+        {/* DIFFICULTY / STATUS FILTER */}
+        <div className="flex flex-wrap gap-2">
+            {[
+                ["difficulty", "easy", "Easy"],
+                ["difficulty", "medium", "Medium"],
+                ["difficulty", "hard", "Hard"],
+                ["status", "solved", "Solved"],
+                ["status", "unsolved", "Unsolved"],
+            ].map(([key, value, label]) => (
+                <button
+                    key={value}
+                    onClick={() => toggleFilter(key, value)}
+                    className={`px-3 py-1.5 rounded-full text-xs font-bold border transition-all duration-200 ${
+                        filters[key] === value
+                            ? "border-violet-300 bg-violet-50 text-violet-600"
+                            : "border-base-200 bg-base-100 text-base-content/60 hover:border-violet-300 hover:text-violet-600"
+                    }`}
+                >
+                    {label}
+                </button>
+            ))}
+        </div>
+
         {/* TAGS FILTER */}
         <div className="relative">
              <div
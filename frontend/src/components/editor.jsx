@@ -1,6 +1,6 @@
 import React, { useState, useEffect } from "react";
 import Editor from "@monaco-editor/react";
-import { submitProblem, submitProblemStatus } from "../api/problemApi";
+import { submitProblem, submitProblemStatus, streamSubmissionStatus } from "../api/problemApi";
 import { toast } from "react-hot-toast";
 import useProblemStore from "../store/useProblemStore";
 import { useParams } from "react-router-dom";
@@ -25,7 +25,28 @@ function CodeEditor({ problem }) {
                 language: selectedLanguage,
                 source_code: code
             });
-            const res = await submitProblemStatus(response.data.submission_id);
+            const submissionId = response.data.submission_id;
+
+            // Show verdicts as they arrive, testcases are streamed in id order
+            const results = [];
+            try {
+                await streamSubmissionStatus(submissionId, (tc) => {
+                    const idx = results.findIndex((r) => r.id === tc.id);
+                    if (idx === -1) results.push(tc);
+                    else results[idx] = tc;
+                    setTestResults([...results]);
+                    setActiveTest((prev) => prev ?? 0);
+                });
+            } catch (streamError) {
+                console.error("Falling back to polling:", streamError);
+            }
+
+            // Judging happens in the background, keep asking until the verdict is in
+            let res = await submitProblemStatus(submissionId);
+            while (res.data.status === "Pending") {
+                await new Promise((resolve) => setTimeout(resolve, 1000));
+                res = await submitProblemStatus(submissionId);
+            }
 
             if (res.data.testcases) {
                 setTestResults(res.data.testcases);
@@ -13,6 +13,7 @@ function ProblemDetail() {
     const [problem, setProblem] = useState(null);
     const [activeTab, setActiveTab] = useState("description");
     const [submissions, setSubmissions] = useState([]);
+    const [submissionsCursor, setSubmissionsCursor] = useState(null);
     const { setLanguageList } = useProblemStore();
 
     // Fetch available languages
@@ -28,11 +29,24 @@ function ProblemDetail() {
         fetchLanguages();
     }, []);
 
-    // Extracted so it can be reused
+    // Extracted so it can be reused, loads the newest page again
     const fetchSubmissions = async () => {
         try {
             const res = await getProblemSubmissionsByUser(slug);
             setSubmissions(res.data.data || []);
+            setSubmissionsCursor(res.data.next_cursor || null);
+        } catch (err) {
+            toast.error("Failed to load submissions");
+        }
+    };
+
+    // Appends the next (older) page of submissions
+    const loadMoreSubmissions = async () => {
+        if (!submissionsCursor) return;
+        try {
+            const res = await getProblemSubmissionsByUser(slug, { cursor: submissionsCursor });
+            setSubmissions(prev => [...prev, ...(res.data.data || [])]);
+            setSubmissionsCursor(res.data.next_cursor || null);
         } catch (err) {
             toast.error("Failed to load submissions");
         }
@@ -158,7 +172,7 @@ function ProblemDetail() {
                     </div>
                 )}
 
-                {activeTab === "submissions" && <Outlet context={{ submissions, refetch: fetchSubmissions }} />}
+                {activeTab === "submissions" && <Outlet context={{ submissions, refetch: fetchSubmissions, hasMore: !!submissionsCursor, loadMore: loadMoreSubmissions }} />}
 
                 {activeTab === "editorial" && (
                     problem.editorial ? (
@@ -23,7 +23,7 @@ function ProblemList() {
                 const response = await getProblems({ limit: 5 });
                 if (isMounted && response.data.success) {
                     setProblems(response.data.data);
-                    setNextCursor(response.data.next_cursor_date, response.data.next_cursor_id);
+                    setNextCursor(response.data.next_cursor);
                     setHasMore(response.data.has_more);
                 }
             } catch (err) {
@@ -1,11 +1,18 @@
-import React from "react";
+import React, { useState } from "react";
 import { useNavigate, useOutletContext, useParams } from "react-router-dom";
 import { Cpu, Clock, Calendar, FileCode, ChevronRight } from 'lucide-react';
 
 function SubmissionList() {
     const navigate = useNavigate();
     const { slug } = useParams();
-    const { submissions } = useOutletContext();
+    const { submissions, hasMore, loadMore } = useOutletContext();
+    const [loadingMore, setLoadingMore] = useState(false);
+
+    const handleLoadMore = async () => {
+        setLoadingMore(true);
+        await loadMore();
+        setLoadingMore(false);
+    };
 
     const handleSubmissionClick = (submissionId) => {
         navigate(`/problems/${slug}/submissions/${submissionId}`);
@@ -133,6 +140,19 @@ function SubmissionList() {
                     </tbody>
                 </table>
             </div>
+
+            {/* Older submissions */}
+            {hasMore && (
+                <div className="flex justify-center py-4">
+                    <button
+                        onClick={handleLoadMore}
+                        disabled={loadingMore}
+                        className="px-4 py-2 text-sm font-mono text-indigo-500 hover:text-indigo-700 disabled:opacity-50 transition"
+                    >
+                        {loadingMore ? "Loading..." : "Load more"}
+                    </button>
+                </div>
+            )}
         </div>
     );
 }
@@ -6,8 +6,7 @@ const useProblemStore = create((set) => ({
   tags: [],
   hasMore: true,
   loading: false,
-  nextCursorDate: null,
-  nextCursorId: null,
+  nextCursor: null,
   tagLoading: false,
   problemsLoading: false,
   languageList: [],
@@ -32,9 +31,9 @@ const useProblemStore = create((set) => ({
     set({ hasMore: val });
   },
 
-  // Set next cursor
-  setNextCursor: function (date, id) {
-    set({ nextCursorDate: date, nextCursorId: id });
+  // Set next cursor (opaque, sent back as-is to fetch the next page)
+  setNextCursor: function (cursor) {
+    set({ nextCursor: cursor });
   },
 
   // Set tags
@@ -64,8 +63,7 @@ const useProblemStore = create((set) => ({
       tags: [],
       hasMore: true,
       loading: false,
-      nextCursorDate: null,
-      nextCursorId: null,
+      nextCursor: null,
     });
   },
 }));